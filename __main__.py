@@ -0,0 +1,12 @@
+"""Allow ``python -m hobbypicker …`` (or ``python <repo> …``) to run the CLI."""
+
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from cli import main  # noqa: E402
+
+sys.exit(main())
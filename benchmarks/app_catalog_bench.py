@@ -0,0 +1,116 @@
+"""Offline Steam app catalog on a synthetic app-list dump.
+
+Writes a ``GetAppList``-shaped dump of ``--apps`` generated names (with
+trademark signs, editions, soundtracks and DLC like the real list) plus a
+few well-known titles, imports it with :class:`AppCatalog` and times exact,
+fuzzy and missing lookups, including sequels missing from the dump that must
+not resolve to the previous game. The fuzzy path is compared with a linear
+``difflib.get_close_matches`` over every name, the obvious index-free
+alternative.
+
+    python -m benchmarks.app_catalog_bench --apps 200000
+"""
+
+import argparse
+import difflib
+import json
+import os
+import random
+import tempfile
+import time
+
+from infrastructure.app_catalog import AppCatalog, normalize_name
+
+WORDS = (
+    "dark shadow star iron lost last dead ancient crystal dragon galaxy zombie "
+    "neon cyber blood night city island space kingdom legend hero tactics "
+    "racing farm simulator quest chronicles rise fall war tale sword magic "
+    "souls hunter knight empire frontier tower dungeon ocean storm echo"
+).split()
+SUFFIXES = ("", "", "", "™", " 2", " II", ": Remastered", " - Soundtrack", " - Deluxe Edition", " DLC")
+KNOWN = {
+    570: "Dota 2",
+    620: "Portal 2",
+    730: "Counter-Strike 2",
+    292030: "The Witcher® 3: Wild Hunt",
+    374320: "DARK SOULS™ III",
+    1091500: "Cyberpunk 2077",
+    1245620: "ELDEN RING",
+    1145360: "Hades",
+    8930: "Sid Meier's Civilization® V",
+}
+# (consulta, appid esperado, tipo)
+QUERIES = [
+    ("Portal 2", 620, "exact"),
+    ("the witcher 3 wild hunt", 292030, "exact"),
+    ("Elden Ring", 1245620, "exact"),
+    ("Dark Souls 3", 374320, "exact"),
+    ("Cyberpunk2077 ", 1091500, "exact"),
+    ("Counter Strike II", 730, "exact"),
+    ("Witcher 3 Wild Hunt", 292030, "fuzzy"),
+    ("Elden Rng", 1245620, "fuzzy"),
+    ("Totally Unknown Homebrew Thing", None, "miss"),
+    # Secuelas posteriores al volcado: nunca la entrega anterior
+    ("Hades II", None, "miss"),
+    ("Portal 3", None, "miss"),
+    ("Sid Meier's Civilization VI", None, "miss"),
+]
+
+
+def build_dump(path: str, apps: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    entries = [{"appid": appid, "name": name} for appid, name in KNOWN.items()]
+    appid = 2_000_000
+    while len(entries) < apps:
+        appid += rng.randint(1, 20)
+        words = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 4)))
+        entries.append({"appid": appid, "name": words + rng.choice(SUFFIXES)})
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"applist": {"apps": entries}}, fh, ensure_ascii=False)
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump = os.path.join(tmp, "applist.json")
+        build_dump(dump, args.apps)
+        catalog = AppCatalog(os.path.join(tmp, "bench.appcatalog"))
+        start = time.perf_counter()
+        stored = catalog.import_dump(dump)
+        print(
+            f"import     {time.perf_counter() - start:8.2f} s    {stored} apps "
+            f"({os.path.getsize(dump) / 2**20:.1f} MiB dump, fts5={catalog.has_fts})"
+        )
+
+        norms = {}
+        for appid, norm in catalog.conn.execute("SELECT appid, norm FROM apps ORDER BY appid"):
+            norms.setdefault(norm, appid)
+        for query, expected, kind in QUERIES:
+            elapsed, appid = timed(lambda: catalog.lookup(query), args.repeat)
+            assert appid == expected, f"{query!r}: {appid} != {expected}"
+            line = f"{kind:<6} {elapsed * 1e6:10.0f} us  {query!r} -> {appid}"
+            if kind != "exact":
+                linear, match = timed(
+                    lambda: difflib.get_close_matches(normalize_name(query), norms, 1, 0.8), 1
+                )
+                # El recorrido lineal sí confunde secuelas: sólo se compara el acierto
+                if kind == "fuzzy":
+                    assert (norms[match[0]] if match else None) == expected
+                line += f"   (linear scan {linear * 1e3:.0f} ms)"
+            print(line)
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cold-start check for the CLI.
+
+Seeds a temporary profile with :func:`benchmarks.load_test.seed_database`,
+runs ``cli.py`` against it in fresh interpreters (``--profile`` plus
+``HOBBYPICKER_PROFILES_DIR``, so the repository database is never read or
+created), reports the median wall time and exits with status 1 when it goes
+over the budget or when Tk/requests get imported.
+
+    python -m benchmarks.cli_startup --runs 15 --budget-ms 100
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load_test import seed_database
+from data.activity_dao import ActivityDAO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN_MODULES = ("tkinter", "_tkinter", "requests")
+PROFILE = "cli_startup"
+
+
+def time_command(cmd: list[str], runs: int, env: dict | None = None) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True, env=env)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def forbidden_imports(cmd: list[str], env: dict | None = None) -> list[str]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *cmd[1:]],
+        cwd=ROOT, check=True, capture_output=True, text=True, env=env,
+    )
+    found = set()
+    for line in proc.stderr.splitlines():
+        name = line.rsplit("|", 1)[-1].strip()
+        if name.split(".")[0] in FORBIDDEN_MODULES:
+            found.add(name)
+    return sorted(found)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--hobbies", type=int, default=20)
+    parser.add_argument("--subitems", type=int, default=10)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("command", nargs="*", default=["suggest", "--json"])
+    args = parser.parse_args(argv)
+
+    cmd = [sys.executable, os.path.join(ROOT, "cli.py"), *args.command, "--profile", PROFILE]
+    interpreter_ms = time_command([sys.executable, "-c", "pass"], args.runs)
+    with tempfile.TemporaryDirectory() as tmp:
+        dao = ActivityDAO(os.path.join(tmp, f"{PROFILE}.db"))
+        seed_database(dao, args.hobbies, args.subitems, args.games)
+        dao.conn.close()
+        env = dict(os.environ, HOBBYPICKER_PROFILES_DIR=tmp)
+        cli_ms = time_command(cmd, args.runs, env)
+        leaked = forbidden_imports(cmd, env)
+    print(f"interpreter: {interpreter_ms:.1f} ms")
+    print(f"cli {' '.join(args.command)}: {cli_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if leaked:
+        print("forbidden imports: " + ", ".join(leaked))
+    return 1 if cli_ms > args.budget_ms or leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Epic CatalogCache scanning: sequential vs. pre-filtered vs. process pool.
+
+Generates ``--files`` catalog JSON files of roughly ``--kb`` KiB each in a
+temporary directory; ``--nameless`` of them have no name key (the
+pre-filter skips them without decoding) and a few are corrupt. Every
+variant must return the same names. The pool only pays off with several
+free cores.
+
+    python -m benchmarks.epic_catalog_bench --files 4000 --kb 24 --workers 2 4
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from infrastructure.epic_catalog import list_catalog_files, names_from_files, scan_catalog_names
+
+
+def write_catalog(directory: Path, files: int, kb: int, nameless: float) -> None:
+    rng = random.Random(7)
+    # Como las entradas reales: muchos objetos pequeños anidados (~80 bytes cada uno)
+    attributes = kb * 1024 // 80
+    for n in range(files):
+        entry = {
+            "id": f"{n:032x}",
+            "namespace": "bench",
+            "customAttributes": {
+                f"attr{i}": {"type": "STRING", "value": f"value {i} for {n}"}
+                for i in range(attributes)
+            },
+            "keyImages": [{"type": "Thumbnail", "url": f"https://cdn.example/{n}.png"}] * 8,
+        }
+        if rng.random() >= nameless:
+            entry["title" if n % 3 else "displayName"] = f"Catalog Game {n}"
+        text = json.dumps(entry) if n % 500 else "{broken"
+        (directory / f"{n:032x}.json").write_text(text, encoding="utf-8")
+
+
+def old_scan(directory: Path) -> list[str]:
+    names = []
+    for cache in sorted(directory.glob("*.json")):
+        try:
+            data = json.loads(cache.read_text(encoding="utf-8", errors="ignore"))
+            name = data.get("displayName") or data.get("DisplayName") or data.get("title")
+        except Exception:
+            continue
+        if name:
+            names.append(name)
+    return names
+
+
+def timed(label: str, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"{label:<26} {time.perf_counter() - start:7.3f}s  {len(result)} names")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=4000)
+    parser.add_argument("--kb", type=int, default=24)
+    parser.add_argument("--nameless", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_catalog(directory, args.files, args.kb, args.nameless)
+        print(f"{args.files} files, {sum(f.stat().st_size for f in directory.iterdir()) / 2**20:.0f} MiB,"
+              f" {os.cpu_count()} CPUs")
+        expected = sorted(timed("sequential (old)", lambda: old_scan(directory)))
+        files = list_catalog_files([directory])
+        assert sorted(timed("pre-filtered, 1 process", lambda: names_from_files(files))) == expected
+        for workers in args.workers:
+            result = timed(
+                f"process pool, {workers} workers",
+                lambda: list(scan_catalog_names([directory], workers=workers, threshold=0)),
+            )
+            assert sorted(result) == expected, f"{workers} workers: different names"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Pipelined Epic library paging against a local stub library service.
+
+The stub serves ``--pages`` pages of ``--per-page`` records chained by
+``nextCursor``, with a fixed latency per request. The old flow (fetch every
+page, then insert) is compared with :func:`iter_library_pages` feeding
+batched inserts while the next page downloads. A second run makes one page
+fail until it is resumed, checking that resuming from
+:attr:`LibraryPageError.cursor` imports every title exactly once.
+
+    python -m benchmarks.epic_pagination_bench --pages 40 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data.activity_dao import ActivityDAO
+from domain import use_cases
+from infrastructure import http_client
+from infrastructure.epic_store import LibraryPageError, fetch_library_page, iter_library_pages
+
+BATCH = 200
+
+
+class StubLibrary(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages: int, per_page: int, latency: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.pages = pages
+        self.per_page = per_page
+        self.latency = latency
+        self.fail_page: int | None = None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server: StubLibrary = self.server
+        time.sleep(server.latency)
+        if self.headers.get("Authorization") != "Bearer bench-token":
+            return self._send(401, {})
+        cursor = parse_qs(urlparse(self.path).query).get("cursor", ["page-0"])[0]
+        page = int(cursor.split("-")[1])
+        if page == server.fail_page:
+            return self._send(400, {"errorCode": "bench.failure"})
+        first = page * server.per_page
+        records = [{"title": f"Epic {i}"} for i in range(first, first + server.per_page)]
+        meta = {"nextCursor": f"page-{page + 1}"} if page + 1 < server.pages else {}
+        self._send(200, {"records": records, "responseMetadata": meta})
+
+    def _send(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serial_import(fetch, dao, hobby_id, work) -> None:
+    titles, cursor = [], None
+    while True:
+        page, cursor = fetch("bench-token", cursor)
+        work()
+        titles.extend(page)
+        if not cursor:
+            break
+    for first in range(0, len(titles), BATCH):
+        use_cases.add_subitems_to_hobby(hobby_id, titles[first:first + BATCH], dao=dao)
+
+
+def pipelined_import(fetch, dao, hobby_id, work, cursor=None) -> None:
+    batch: list[str] = []
+    try:
+        for titles, _ in iter_library_pages(
+            "bench-token", cursor, fetch_page=fetch, retries=1, backoff=0.01
+        ):
+            work()
+            batch.extend(titles)
+            if len(batch) >= BATCH:
+                use_cases.add_subitems_to_hobby(hobby_id, batch, dao=dao)
+                batch = []
+    finally:
+        # Lo ya recibido se guarda aunque falle una página: se reanuda tras ello
+        if batch:
+            use_cases.add_subitems_to_hobby(hobby_id, batch, dao=dao)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument(
+        "--work", type=float, default=0.03, help="simulated processing per page (s)"
+    )
+    args = parser.parse_args()
+
+    server = StubLibrary(args.pages, args.per_page, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_client.default_client()
+    url = f"http://127.0.0.1:{server.server_port}/library/api/public/items"
+    fetch = partial(fetch_library_page, url=url)
+    work = partial(time.sleep, args.work)
+    total = args.pages * args.per_page
+    expected = {f"Epic {i}" for i in range(total)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, run in (("serial", serial_import), ("pipelined", pipelined_import)):
+            dao = ActivityDAO(os.path.join(tmp, f"{label}.db"))
+            hobby_id = dao.insert_activity("Epic")
+            start = time.perf_counter()
+            run(fetch, dao, hobby_id, work)
+            elapsed = time.perf_counter() - start
+            stored = {s[2] for s in dao.get_subitems_by_activity(hobby_id)}
+            assert stored == expected, f"{label}: {len(stored)} of {total} titles"
+            print(f"{label:<10} {elapsed:6.2f}s  {total / elapsed:8.0f} titles/s")
+            dao.conn.close()
+
+        # Reanudación: la página del medio falla hasta que se "arregla"
+        dao = ActivityDAO(os.path.join(tmp, "resume.db"))
+        hobby_id = dao.insert_activity("Epic")
+        server.fail_page = args.pages // 2
+        try:
+            pipelined_import(fetch, dao, hobby_id, work)
+            raise AssertionError("the failing page did not raise")
+        except LibraryPageError as exc:
+            resume_at = exc.cursor
+        kept = len(dao.get_subitems_by_activity(hobby_id))
+        server.fail_page = None
+        pipelined_import(fetch, dao, hobby_id, work, cursor=resume_at)
+        names = [s[2] for s in dao.get_subitems_by_activity(hobby_id)]
+        assert len(names) == len(set(names)) == total, "resume lost or duplicated titles"
+        print(f"resume     failed at {resume_at}, {kept} titles kept, {len(names)} after resuming")
+        dao.conn.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
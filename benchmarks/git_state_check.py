@@ -0,0 +1,111 @@
+"""``infrastructure.git_state`` checked against ``git`` itself.
+
+Builds a bare ``origin`` and clones in a temporary directory (see
+:mod:`benchmarks.update_check`) and, at each step, compares
+:func:`~infrastructure.git_state.read_git_state` with ``git rev-parse HEAD``,
+``git symbolic-ref HEAD``, ``git rev-parse @{u}`` and ``git rev-parse
+--show-toplevel``. The steps cover refs packed by ``clone``, loose refs
+written by ``fetch`` over packed ones, ``git pack-refs --all``, a detached
+HEAD, branches tracking a local branch or with a slash in the name, and
+``git worktree add`` checkouts (``.git`` file plus ``commondir``). Exits with
+an ``AssertionError`` on the first mismatch and reports how long each side
+took.
+
+    python -m benchmarks.git_state_check
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.update_check import GIT_ENV, commit, git, make_repos
+from infrastructure import git_state
+
+
+def _git_or_empty(cwd: Path, *args: str) -> str:
+    proc = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+    return proc.stdout.strip() if proc.returncode == 0 else ""
+
+
+def git_view(cwd: Path) -> dict:
+    """What ``read_git_state`` should return, according to ``git``."""
+    symbolic = _git_or_empty(cwd, "symbolic-ref", "-q", "HEAD")
+    return {
+        "work_tree": git(cwd, "rev-parse", "--show-toplevel"),
+        "branch": symbolic.removeprefix("refs/heads/") or None,
+        "upstream": _git_or_empty(cwd, "rev-parse", "--abbrev-ref", "@{u}"),
+        "head": git(cwd, "rev-parse", "HEAD"),
+        "remote_head": _git_or_empty(cwd, "rev-parse", "-q", "--verify", "refs/remotes/origin/main")
+        or None,
+    }
+
+
+def check(label: str, cwd: Path) -> None:
+    start = time.perf_counter()
+    expected = git_view(cwd)
+    # Además del nombre del upstream, el SHA al que apunta su ref completa
+    upstream_ref = _git_or_empty(cwd, "rev-parse", "--symbolic-full-name", "@{u}")
+    upstream_sha = _git_or_empty(cwd, "rev-parse", "@{u}")
+    git_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    state = git_state.read_git_state(cwd)
+    parsed_us = (time.perf_counter() - start) * 1e6
+    assert state == expected, f"{label}: {state} != {expected}"
+    if upstream_ref:
+        git_dir = git_state.find_git_dir(cwd)[1]
+        resolved = git_state.resolve_ref(git_dir, upstream_ref)
+        assert resolved == upstream_sha, f"{label}: {upstream_ref} {resolved} != {upstream_sha}"
+    print(f"{label:<30} ok   git {git_ms:6.1f} ms   git_state {parsed_us:6.0f} us")
+
+
+def main() -> None:
+    os.environ.update(GIT_ENV)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp).resolve()
+        _, app, dev = make_repos(tmp)
+        # clone deja las referencias remotas en packed-refs
+        assert (app / ".git" / "packed-refs").is_file()
+        check("clone (packed remote refs)", app)
+
+        commit(dev, "main.pyw", "v2\n")
+        git(dev, "push", "-q", "origin", "main")
+        git(app, "fetch", "-q", "origin")
+        # Ahora hay una ref suelta más nueva que la empaquetada
+        assert (app / ".git" / "refs" / "remotes" / "origin" / "main").is_file()
+        check("fetch (loose over packed)", app)
+
+        git(app, "pull", "-q", "--ff-only")
+        git(app, "pack-refs", "--all")
+        assert not (app / ".git" / "refs" / "heads" / "main").exists()
+        check("pack-refs --all", app)
+
+        git(app, "checkout", "-q", "--detach", "HEAD~1")
+        check("detached HEAD", app)
+
+        git(app, "checkout", "-q", "-b", "feature/x", "--track", "origin/main")
+        check("slash branch tracking origin", app)
+        git(app, "checkout", "-q", "-b", "local-track", "--track", "main")
+        check("tracking a local branch", app)
+        git(app, "checkout", "-q", "-b", "no-upstream")
+        check("branch without upstream", app)
+        git(app, "checkout", "-q", "main")
+
+        worktree = tmp / "wt"
+        git(app, "worktree", "add", "-q", "-b", "topic", str(worktree), "origin/main")
+        assert (worktree / ".git").is_file()
+        check("worktree add (tracking)", worktree)
+        commit(worktree, "notes.txt", "topic\n")
+        check("worktree after commit", worktree)
+        (worktree / "sub").mkdir()
+        check("worktree subdirectory", worktree / "sub")
+        detached = tmp / "wt-detached"
+        git(app, "worktree", "add", "-q", "--detach", str(detached), "main")
+        check("worktree detached", detached)
+        # Los worktrees comparten refs y config con el checkout principal
+        check("main checkout with worktrees", app)
+
+
+if __name__ == "__main__":
+    main()
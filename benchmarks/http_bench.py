@@ -0,0 +1,85 @@
+"""Concurrency benchmark for the local HTTP suggestion service.
+
+Starts the service on an ephemeral port against a temporary database and
+hammers ``/suggest`` with keep-alive clients at several concurrency levels.
+
+    python -m benchmarks.http_bench --requests 2000 --clients 1 4 16
+"""
+
+import argparse
+import http.client
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.load_test import percentile, seed_database
+from data.activity_dao import ActivityDAO
+from presentation.http_service import SuggestionService, make_server
+
+
+def _client(port: int, path: str, count: int, latencies: list[float]) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for _ in range(count):
+        t0 = time.perf_counter()
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def run_level(port: int, path: str, clients: int, total: int) -> dict:
+    per_client = max(total // clients, 1)
+    results: list[list[float]] = [[] for _ in range(clients)]
+    threads = [
+        threading.Thread(target=_client, args=(port, path, per_client, results[i]))
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(x for r in results for x in r)
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "ms": {p: percentile(latencies, p) * 1000 for p in (50, 90, 99)},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--path", default="/suggest?k=5")
+    parser.add_argument("--items", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "http_bench.db")
+        dao = ActivityDAO(db_path)
+        seed_database(dao, 10, args.items // 20, args.items // 2)
+        dao.conn.close()
+        service = SuggestionService(db_path)
+        httpd = make_server(port=0, service=service)
+        port = httpd.server_address[1]
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        try:
+            for clients in args.clients:
+                r = run_level(port, args.path, clients, args.requests)
+                pcts = "  ".join(f"p{p}={v:.2f}ms" for p, v in r["ms"].items())
+                print(f"{r['clients']:>3} clients  {r['requests']:>6} req  "
+                      f"{r['rps']:>8.0f} req/s  {pcts}")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
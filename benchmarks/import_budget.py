@@ -0,0 +1,98 @@
+"""Import-time regression check.
+
+Parses ``python -X importtime`` for the GUI and CLI entry modules, prints the
+most expensive imports and exits with status 1 when a module goes over its
+budget, pulls in a heavy module eagerly, or when importing the use cases
+opens the database.
+
+    python -m benchmarks.import_budget [--budget-ms 100] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> modules that must stay lazy when importing it
+TARGETS = {
+    "presentation.app": ("requests", "xml.etree", "http.server", "webbrowser"),
+    "cli": ("tkinter", "requests"),
+    "domain.use_cases": ("tkinter", "requests"),
+}
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """Return ``(name, depth, self_us, cumulative_us)`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def subtree(rows: list[tuple[str, int, int, int]], module: str) -> list:
+    """Rows imported on behalf of *module* (importtime prints children first)."""
+    end = next(i for i, row in enumerate(rows) if row[0] == module and row[1] == 0)
+    start = end
+    while start > 0 and rows[start - 1][1] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def measure(module: str) -> list[tuple[str, int, int, int]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module, lazy in TARGETS.items():
+        totals = []
+        for _ in range(args.runs):
+            rows = measure(module)
+            # cumulative time of the target itself (excludes site/.pth imports)
+            totals.append(subtree(rows, module)[-1][3] / 1000)
+        total_ms = statistics.median(totals)
+        over = total_ms > args.budget_ms
+        eager = sorted({
+            name for name, *_ in rows
+            if any(name == m or name.startswith(m + ".") for m in lazy)
+        })
+        print(f"{module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)"
+              f"{'  OVER BUDGET' if over else ''}")
+        own = subtree(rows, module)
+        for name, _, self_us, _ in sorted(own, key=lambda r: -r[2])[:args.top]:
+            print(f"    {self_us / 1000:7.1f} ms  {name}")
+        if eager:
+            print("    eagerly imported: " + ", ".join(eager))
+        failed |= over or bool(eager)
+
+    probe = subprocess.run(
+        [sys.executable, "-c",
+         "import domain.use_cases as u; "
+         "raise SystemExit(getattr(u, '_dao', True) is not None)"],
+        cwd=ROOT,
+    )
+    if probe.returncode:
+        print("domain.use_cases opens the database at import time")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
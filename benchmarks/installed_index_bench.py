@@ -0,0 +1,112 @@
+"""Rescan cost of the persisted installed-games index.
+
+Creates ``--steam`` Steam app manifests and ``--epic`` Epic ``.item`` files
+in a temporary directory, then times the old full parse against a cold
+:class:`InstalledIndex` scan, a warm rescan with nothing changed and a
+rescan after touching ``--changed`` manifests and deleting a few. Every
+variant must report the same games.
+
+    python -m benchmarks.installed_index_bench --steam 3000 --epic 500
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from infrastructure.installed_index import (
+    EPIC_PATTERN,
+    STEAM_PATTERN,
+    InstalledIndex,
+    parse_epic_manifest,
+    parse_steam_manifest,
+)
+
+# Relleno para que cada manifiesto tenga un tamaño parecido a los reales
+_PADDING = "\n".join(f'\t\t"{i}"\t\t"{"x" * 40}"' for i in range(40))
+
+
+def write_steam(path: Path, appid: int, version: int = 0) -> None:
+    path.write_text(
+        f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"Steam Game {appid}"\n'
+        f'\t"buildid"\t\t"{version}"\n\t"InstalledDepots"\n\t{{\n{_PADDING}\n\t}}\n}}\n',
+        encoding="utf-8",
+    )
+
+
+def write_epic(path: Path, n: int) -> None:
+    data = {"DisplayName": f"Epic Game {n}", "AppName": f"app{n}", "Padding": _PADDING}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def full_parse(steam_dir: Path, epic_dir: Path) -> tuple[set, set]:
+    steam = {
+        parsed
+        for manifest in steam_dir.glob(STEAM_PATTERN)
+        if (parsed := parse_steam_manifest(manifest.read_text(encoding="utf-8", errors="ignore")))
+    }
+    epic = {
+        parsed
+        for manifest in epic_dir.glob(EPIC_PATTERN)
+        if (parsed := parse_epic_manifest(manifest.read_text(encoding="utf-8", errors="ignore")))
+    }
+    return steam, epic
+
+
+def indexed(index: InstalledIndex, steam_dir: Path, epic_dir: Path) -> tuple[set, set]:
+    return set(index.scan("steam", [steam_dir])), set(index.scan("epic", [epic_dir]))
+
+
+def timed(label: str, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"{label:<28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steam", type=int, default=3000)
+    parser.add_argument("--epic", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        steam_dir, epic_dir = Path(tmp, "steamapps"), Path(tmp, "Manifests")
+        steam_dir.mkdir()
+        epic_dir.mkdir()
+        for appid in range(args.steam):
+            write_steam(steam_dir / f"appmanifest_{appid}.acf", appid)
+        for n in range(args.epic):
+            write_epic(epic_dir / f"{n:032x}.item", n)
+        (epic_dir / "broken.item").write_text("{not json", encoding="utf-8")
+
+        index = InstalledIndex(os.path.join(tmp, "index.installed"))
+        expected = timed("full parse (old)", lambda: full_parse(steam_dir, epic_dir))
+        assert timed("index, cold", lambda: indexed(index, steam_dir, epic_dir)) == expected
+        assert timed("index, nothing changed", lambda: indexed(index, steam_dir, epic_dir)) == expected
+
+        # Cambia el nombre de algunos juegos, borra otros y añade uno
+        for appid in range(args.changed):
+            path = steam_dir / f"appmanifest_{appid}.acf"
+            path.write_text(
+                path.read_text(encoding="utf-8").replace("Steam Game", "Renamed"),
+                encoding="utf-8",
+            )
+        for appid in range(args.changed, args.changed + 3):
+            (steam_dir / f"appmanifest_{appid}.acf").unlink()
+        write_epic(epic_dir / "new.item", args.epic)
+        expected = full_parse(steam_dir, epic_dir)
+        result = timed(f"index, {args.changed + 4} files changed", lambda: indexed(index, steam_dir, epic_dir))
+        assert result == expected, "incremental rescan diverged from a full parse"
+        index.close()
+        # Persistido: una instancia nueva no relee nada
+        reopened = InstalledIndex(os.path.join(tmp, "index.installed"))
+        assert timed("index, reopened", lambda: indexed(reopened, steam_dir, epic_dir)) == expected
+        reopened.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Headless suggest → accept load test against a throwaway database.
+
+Usage::
+
+    python -m benchmarks.load_test --cycles 5000 --hobbies 50 --subitems 20
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from data.activity_dao import ActivityDAO
+from domain.suggestion_controller import SuggestionController
+from presentation.utils import i18n
+
+
+def seed_database(dao: ActivityDAO, hobbies: int, subitems: int, games: int) -> None:
+    """Fill *dao* with synthetic hobbies, subitems and Steam games."""
+    for h in range(hobbies):
+        hobby_id = dao.insert_activity(f"Hobby {h}")
+        for s in range(subitems):
+            dao.insert_subitem(hobby_id, f"Item {h}.{s}")
+    if games:
+        steam_id = dao.insert_activity(i18n.LANG_TEXT["en"]["steam_hobby_name"])
+        for g in range(games):
+            dao.insert_subitem(steam_id, f"Game {g}")
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(cycles: int, hobbies: int, subitems: int, games: int, games_only: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        dao = ActivityDAO(os.path.join(tmp, "load_test.db"))
+        seed_database(dao, hobbies, subitems, games)
+        controller = SuggestionController(
+            is_game_label=lambda label: i18n.is_steam_game_label(label)
+            or i18n.is_epic_game_label(label),
+            dao=dao,
+        )
+        controller.set_toggles(include_games=True, games_only=games_only)
+        controller.rebuild()
+
+        suggest_times: list[float] = []
+        accept_times: list[float] = []
+        start = time.perf_counter()
+        for _ in range(cycles):
+            t0 = time.perf_counter()
+            controller.suggest()
+            t1 = time.perf_counter()
+            controller.accept()
+            t2 = time.perf_counter()
+            suggest_times.append(t1 - t0)
+            accept_times.append(t2 - t1)
+        elapsed = time.perf_counter() - start
+        dao.conn.close()
+
+    cycle_times = sorted(s + a for s, a in zip(suggest_times, accept_times))
+    suggest_times.sort()
+    accept_times.sort()
+    return {
+        "cycles": cycles,
+        "items": hobbies * subitems + games,
+        "elapsed_s": elapsed,
+        "cycles_per_s": cycles / elapsed if elapsed else 0.0,
+        "suggest_ms": {p: percentile(suggest_times, p) * 1000 for p in (50, 90, 99)},
+        "accept_ms": {p: percentile(accept_times, p) * 1000 for p in (50, 90, 99)},
+        "cycle_ms": {p: percentile(cycle_times, p) * 1000 for p in (50, 90, 99)},
+        "cycle_mean_ms": statistics.fmean(cycle_times) * 1000 if cycle_times else 0.0,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=5000)
+    parser.add_argument("--hobbies", type=int, default=20)
+    parser.add_argument("--subitems", type=int, default=10)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--games-only", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run(args.cycles, args.hobbies, args.subitems, args.games, args.games_only)
+    print(f"{result['cycles']} cycles over {result['items']} items "
+          f"in {result['elapsed_s']:.2f}s → {result['cycles_per_s']:.0f} cycles/s")
+    for key in ("suggest_ms", "accept_ms", "cycle_ms"):
+        pcts = "  ".join(f"p{p}={v:.3f}" for p, v in result[key].items())
+        print(f"{key:<11} {pcts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""File-backed vs in-memory DAO: accept/rebuild cycles and backup cost.
+
+Each cycle increments one subitem and reads the full candidate set, which is
+what an accept in the GUI does.
+
+    python -m benchmarks.memory_dao_bench --cycles 2000 --backup-interval 1
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.load_test import percentile, seed_database
+from data.activity_dao import ActivityDAO
+from data.memory_dao import InMemoryActivityDAO
+from domain import use_cases
+
+
+def run_cycles(dao: ActivityDAO, cycles: int, rng: random.Random) -> list[float]:
+    subitem_ids = [row[0] for row in dao.get_all_subitems()]
+    times = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        dao.increment_subitem_accepted_count(rng.choice(subitem_ids))
+        use_cases.collect_candidates(dao=dao)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hobbies", type=int, default=50)
+    parser.add_argument("--subitems", type=int, default=10)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--backup-interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = os.path.join(tmp, "seed.db")
+        dao = ActivityDAO(seed_path)
+        seed_database(dao, args.hobbies, args.subitems, args.games)
+        dao.conn.close()
+
+        results = {}
+        for mode in ("file", "memory"):
+            path = os.path.join(tmp, f"{mode}.db")
+            shutil.copyfile(seed_path, path)
+            start = time.perf_counter()
+            if mode == "file":
+                dao = ActivityDAO(path)
+            else:
+                dao = InMemoryActivityDAO(path, backup_interval=args.backup_interval)
+            opened = time.perf_counter() - start
+            times = run_cycles(dao, args.cycles, random.Random(42))
+            start = time.perf_counter()
+            if mode == "memory":
+                dao.close()
+                backups = dao.backups
+            else:
+                dao.conn.close()
+                backups = 0
+            closed = time.perf_counter() - start
+            results[mode] = (opened, sorted(times), closed, backups)
+
+        # La copia final debe reflejar todas las escrituras en memoria
+        check = ActivityDAO(os.path.join(tmp, "memory.db"))
+        persisted = check.get_count_summary()[3]
+        check.conn.close()
+
+    print(f"{args.cycles} accept cycles, {args.hobbies} hobbies x {args.subitems} "
+          f"subitems + {args.games} games")
+    for mode, (opened, times, closed, backups) in results.items():
+        total = sum(times)
+        pcts = "  ".join(f"p{p}={percentile(times, p) * 1000:.3f}ms" for p in (50, 99))
+        print(f"{mode:<7} open={opened * 1000:.1f}ms  {args.cycles / total:.0f} cycles/s  "
+              f"{pcts}  close={closed * 1000:.1f}ms  backups={backups}")
+    print(f"accepts persisted by the in-memory DAO: {persisted}/{args.cycles}")
+
+
+if __name__ == "__main__":
+    main()
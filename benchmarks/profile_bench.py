@@ -0,0 +1,74 @@
+"""Profile LRU benchmark: hundreds of profile databases, skewed access.
+
+    python -m benchmarks.profile_bench --profiles 300 --capacity 32 --requests 20000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.load_test import percentile, seed_database
+from data.activity_dao import ActivityDAO
+from domain.profiles import ProfileCache
+from infrastructure.metrics import Metrics
+from presentation.utils import i18n
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=300)
+    parser.add_argument("--capacity", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        def path_for(name: str) -> str:
+            return os.path.join(tmp, f"{name}.db")
+
+        names = [f"p{i}" for i in range(args.profiles)]
+        for name in names:
+            dao = ActivityDAO(path_for(name))
+            seed_database(dao, 5, 10, 20)
+            dao.conn.close()
+
+        weights = [1 / (rank + 1) ** args.skew for rank in range(len(names))]
+        metrics = Metrics()
+        cache = ProfileCache(
+            args.capacity, i18n.is_steam_game_label, metrics=metrics, path_for=path_for
+        )
+        hit_times: list[float] = []
+        miss_times: list[float] = []
+        start = time.perf_counter()
+        for name in rng.choices(names, weights=weights, k=args.requests):
+            misses = metrics.counter("profiles.misses")
+            t0 = time.perf_counter()
+            entry = cache.get(name)
+            entry.refresh()
+            entry.controller.sample(1)
+            elapsed = time.perf_counter() - t0
+            if metrics.counter("profiles.misses") > misses:
+                miss_times.append(elapsed)
+            else:
+                hit_times.append(elapsed)
+        total = time.perf_counter() - start
+        stats = cache.stats()
+        cache.close()
+
+    hit_times.sort()
+    miss_times.sort()
+    print(f"{args.requests} requests over {args.profiles} profiles, "
+          f"capacity {args.capacity}: {args.requests / total:.0f} req/s")
+    print(f"hits={stats['hits']} misses={stats['misses']} "
+          f"evictions={stats['evictions']} "
+          f"hit rate={stats['hits'] / args.requests:.1%}")
+    for label, times in (("hit", hit_times), ("miss", miss_times)):
+        pcts = "  ".join(f"p{p}={percentile(times, p) * 1000:.3f}ms" for p in (50, 99))
+        print(f"{label:<5} {pcts}")
+
+
+if __name__ == "__main__":
+    main()
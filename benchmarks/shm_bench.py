@@ -0,0 +1,107 @@
+"""Throughput of the shared-memory multi-process suggestion mode.
+
+``sample`` mode measures raw sampling from the shared buffer in N processes;
+``http`` mode runs :class:`SharedMemoryServer` with N workers and drives it
+with client processes. Scaling needs as many free cores as workers.
+
+    python -m benchmarks.shm_bench --workers 1 2 4 --seconds 3
+    python -m benchmarks.shm_bench --mode http --workers 1 2 4
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.load_test import seed_database
+from data.activity_dao import ActivityDAO
+from domain import use_cases
+from domain.packed_candidates import pack_candidates
+from infrastructure.shared_candidates import SharedCandidatePublisher, SharedCandidateReader
+from presentation.http_service import SharedMemoryServer
+from presentation.utils import i18n
+
+
+def _sampler(control_name: str, seconds: float, results) -> None:
+    reader = SharedCandidateReader(control_name)
+    candidates = reader.current()
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        candidates.sample(100)
+        done += 100
+    results.put(done)
+    reader.close()
+
+
+def _http_client(port: int, seconds: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        conn.request("GET", "/suggest?k=5")
+        conn.getresponse().read()
+        done += 1
+    conn.close()
+    results.put(done)
+
+
+def _run_processes(target, args, count: int, seconds: float) -> float:
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=target, args=(*args, seconds, results))
+        for _ in range(count)
+    ]
+    for proc in procs:
+        proc.start()
+    total = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    return total / seconds
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("sample", "http"), default="sample")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--items", type=int, default=10000)
+    args = parser.parse_args(argv)
+    print(f"cpus: {os.cpu_count()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "shm_bench.db")
+        dao = ActivityDAO(db_path)
+        seed_database(dao, 50, args.items // 100, args.items // 2)
+
+        if args.mode == "sample":
+            publisher = SharedCandidatePublisher()
+            publisher.publish(pack_candidates(
+                use_cases.collect_candidates(dao), i18n.is_steam_game_label
+            ))
+            try:
+                for workers in args.workers:
+                    rate = _run_processes(
+                        _sampler, (publisher.control_name,), workers, args.seconds
+                    )
+                    print(f"{workers:>3} workers  {rate:>12,.0f} samples/s")
+            finally:
+                publisher.close()
+        else:
+            for workers in args.workers:
+                server = SharedMemoryServer(port=0, workers=workers, db_path=db_path)
+                server.start()
+                try:
+                    rate = _run_processes(
+                        _http_client, (server.port,), workers * 2, args.seconds
+                    )
+                    print(f"{workers:>3} workers  {rate:>12,.0f} req/s")
+                finally:
+                    server.stop()
+        dao.conn.close()
+
+
+if __name__ == "__main__":
+    main()
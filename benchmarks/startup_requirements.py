@@ -0,0 +1,49 @@
+"""Compare the old always-pip startup with the fingerprint fast path.
+
+Loads ``main.pyw`` as a module and times ``install_requirements(force=True)``
+(what every launch used to do) against the warm path that only hashes
+``requirements.txt`` and checks installed versions. Exits with status 1 if
+the warm path still spawns pip or is not faster.
+
+    python -m benchmarks.startup_requirements --runs 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from importlib.machinery import SourceFileLoader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _time(func, runs: int) -> tuple[float, list]:
+    results = []
+    start = time.perf_counter()
+    for _ in range(runs):
+        results.append(func())
+    return (time.perf_counter() - start) / runs * 1000, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    launcher = SourceFileLoader("hobbypicker_main", os.path.join(ROOT, "main.pyw")).load_module()
+    with tempfile.TemporaryDirectory() as tmp:
+        launcher.FINGERPRINT_PATH = os.path.join(tmp, "fingerprint.json")
+        cold_ms, _ = _time(lambda: launcher.install_requirements(force=True), args.runs)
+        warm_ms, ran_pip = _time(launcher.install_requirements, args.runs)
+
+    print(f"always pip : {cold_ms:9.1f} ms per launch")
+    print(f"fingerprint: {warm_ms:9.1f} ms per launch (pip spawned: {any(ran_pip)})")
+    if any(ran_pip):
+        print("warm path still runs pip: requirements are not installed in this interpreter")
+        return 1
+    return 0 if warm_ms < cold_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
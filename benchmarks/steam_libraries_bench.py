@@ -0,0 +1,121 @@
+"""Steam library discovery against temporary directories.
+
+Builds a fake Steam install whose ``libraryfolders.vdf`` lists a second
+library and a missing one, next to empty candidate roots and ``--dead``
+roots whose probe hangs for ``--hang`` seconds (a disconnected network
+drive). The old sequential probe is compared with
+:class:`SteamLibraryDiscovery`, then the persisted result is reused, and
+touching the vdf or passing ``refresh=True`` probes again (skipping the dead
+roots whose first probe is still hanging).
+
+    python -m benchmarks.steam_libraries_bench --dead 3 --hang 2
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from infrastructure.lookup_cache import LookupCache
+from infrastructure.steam_libraries import VDF_NAME, SteamLibraryDiscovery
+
+
+class CountingProbe:
+    """``os.path.isdir`` that hangs under ``dead*`` roots and counts calls."""
+
+    def __init__(self, hang: float):
+        self.hang = hang
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, path: Path) -> bool:
+        with self._lock:
+            self.calls += 1
+        if path.parent.name.startswith("dead"):
+            time.sleep(self.hang)
+            return False
+        return os.path.isdir(path)
+
+
+def sequential_discovery(roots: list[Path], exists) -> list[Path]:
+    """The previous in-app discovery: one blocking probe after another."""
+    paths: list[Path] = []
+    for root in roots:
+        steamapps = root / "steamapps"
+        if exists(steamapps):
+            paths.append(steamapps)
+            vdf = steamapps / VDF_NAME
+            if vdf.exists():
+                text = vdf.read_text(encoding="utf-8", errors="ignore")
+                for folder in re.findall(r'"path"\s*"([^"]+)"', text):
+                    candidate = Path(folder) / "steamapps"
+                    if exists(candidate):
+                        paths.append(candidate)
+    unique: list[Path] = []
+    for path in paths:
+        if path.resolve() not in unique:
+            unique.append(path.resolve())
+    return unique
+
+
+def build_tree(tmp: Path, empty: int, dead: int) -> list[Path]:
+    main, extra = tmp / "Steam", tmp / "SteamLibrary"
+    (main / "steamapps").mkdir(parents=True)
+    (extra / "steamapps").mkdir(parents=True)
+    (main / "steamapps" / VDF_NAME).write_text(
+        '"libraryfolders"\n{\n'
+        f'\t"0"\n\t{{\n\t\t"path"\t\t"{main}"\n\t}}\n'
+        f'\t"1"\n\t{{\n\t\t"path"\t\t"{extra}"\n\t}}\n'
+        f'\t"2"\n\t{{\n\t\t"path"\t\t"{tmp / "unplugged"}"\n\t}}\n}}\n'
+    )
+    roots = [tmp / f"dead{i}" for i in range(dead)]
+    roots += [main] + [tmp / f"empty{i}" for i in range(empty)]
+    return roots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--empty", type=int, default=20, help="candidate roots without Steam")
+    parser.add_argument("--dead", type=int, default=3, help="roots whose probe hangs")
+    parser.add_argument("--hang", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        roots = build_tree(tmp, args.empty, args.dead)
+        expected = [(tmp / "Steam/steamapps").resolve(), (tmp / "SteamLibrary/steamapps").resolve()]
+        store = LookupCache(str(tmp / "bench.lookups"))
+        probe = CountingProbe(args.hang)
+
+        def run(label: str, fn) -> list[Path]:
+            probe.calls = 0
+            start = time.perf_counter()
+            found = fn()
+            elapsed = time.perf_counter() - start
+            assert sorted(found) == sorted(expected), f"{label}: {found}"
+            print(f"{label:<12} {elapsed * 1000:9.1f} ms  {probe.calls:3d} probes")
+            return found
+
+        run("sequential", lambda: sequential_discovery(roots, probe))
+        discovery = SteamLibraryDiscovery(store, lambda: roots, args.timeout, probe)
+        run("concurrent", discovery.libraries)
+        # Otra instancia (otra sesión): se valida por mtime sin sondear
+        reused = SteamLibraryDiscovery(store, lambda: roots, args.timeout, probe)
+        run("persisted", reused.libraries)
+        assert probe.calls == 0, "persisted result still probed"
+        vdf = tmp / "Steam/steamapps" / VDF_NAME
+        stat = vdf.stat()
+        os.utime(vdf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        run("vdf changed", reused.libraries)
+        assert probe.calls > 0, "changed vdf did not trigger a probe"
+        run("persisted", reused.libraries)
+        run("refresh", lambda: reused.libraries(refresh=True))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Concurrent Steam app-type resolution against a local stub store.
+
+Starts a threaded ``http.server`` that imitates ``/api/appdetails`` with a
+fixed latency, answers some requests with 429 + ``Retry-After`` and marks
+every tenth appid as DLC. Runs the serial baseline and
+:func:`resolve_app_types` with several pool sizes, checks that every result
+is right and that the request rate stayed under the token bucket's limit.
+
+    python -m benchmarks.steam_resolver_bench --apps 200 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from infrastructure.rate_limit import TokenBucket
+from infrastructure.steam_store import TransientError, fetch_app_type, resolve_app_types
+
+
+def expected_type(appid: int) -> str:
+    return "dlc" if appid % 10 == 0 else "game"
+
+
+class StubStore(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float, throttle: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.throttle = throttle
+        self.lock = threading.Lock()
+        self.times: list[float] = []
+        self.throttled = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como la tienda real
+    disable_nagle_algorithm = True  # cabeceras y cuerpo van en dos escrituras
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server: StubStore = self.server
+        with server.lock:
+            server.times.append(time.monotonic())
+        time.sleep(server.latency)
+        if random.random() < server.throttle:
+            with server.lock:
+                server.throttled += 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0.05")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        appid = int(parse_qs(urlparse(self.path).query)["appids"][0])
+        body = json.dumps(
+            {str(appid): {"success": True, "data": {"type": expected_type(appid)}}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def max_rate(times: list[float], window: float = 1.0) -> int:
+    """Largest number of requests seen in any *window*-second interval."""
+    times = sorted(times)
+    best, start = 0, 0
+    for end, t in enumerate(times):
+        while t - times[start] > window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def serial(appids, fetch) -> dict:
+    results = {}
+    for appid in appids:
+        try:
+            results[appid] = fetch(appid)
+        except TransientError:
+            results[appid] = None
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--throttle", type=float, default=0.05, help="share of 429 answers")
+    parser.add_argument("--rate", type=float, default=50.0, help="token bucket rate (req/s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    server = StubStore(args.latency, args.throttle)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetch = partial(fetch_app_type, url=f"http://127.0.0.1:{server.server_port}/api/appdetails")
+    appids = list(range(1, args.apps + 1))
+    expected = {appid: expected_type(appid) for appid in appids}
+
+    server.throttle, start = 0.0, time.perf_counter()
+    baseline = serial(appids, fetch)
+    elapsed = time.perf_counter() - start
+    assert baseline == expected, "serial baseline returned wrong types"
+    print(f"serial           {elapsed:7.2f}s  {args.apps / elapsed:7.1f} apps/s")
+    server.throttle = args.throttle
+
+    for workers in args.workers:
+        server.times.clear()
+        server.throttled = 0
+        calls = []
+        start = time.perf_counter()
+        results = resolve_app_types(
+            appids,
+            fetch=fetch,
+            workers=workers,
+            limiter=TokenBucket(args.rate, capacity=workers),
+            retries=5,
+            backoff=0.05,
+            progress=lambda done, total: calls.append(done),
+        )
+        elapsed = time.perf_counter() - start
+        assert results == expected, f"workers={workers}: wrong types"
+        assert calls == list(range(1, args.apps + 1)), "progress not monotonic"
+        peak = max_rate(server.times)
+        # El cubo permite una ráfaga inicial de `capacity` además del ritmo
+        assert peak <= args.rate + workers + 1, f"rate limit exceeded: {peak}/s"
+        print(
+            f"workers={workers:<3}      {elapsed:7.2f}s  {args.apps / elapsed:7.1f} apps/s"
+            f"  peak {peak} req/s  429s retried {server.throttled}"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Peak memory of the streaming Steam library parser on a large fixture.
+
+Writes a profile games XML with ``--games`` entries (the same layout as
+``steamcommunity.com/profiles/<id>/games?xml=1``), then compares the old
+path (whole body + ``ET.fromstring``) with :func:`parse_owned_games` fed in
+64 KiB chunks, and finally streams it from a local HTTP server through
+:func:`stream_owned_games`. Checks that all paths yield the same games and
+that the streaming peak does not grow with the library.
+
+    python -m benchmarks.steam_xml_stream_bench --games 200000
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from infrastructure import http_client
+from infrastructure.steam_store import XML_CHUNK_SIZE, parse_owned_games, stream_owned_games
+
+
+def write_fixture(path: str, games: int) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        fh.write("<gamesList><steamID64>76561190000000000</steamID64>")
+        fh.write("<steamID><![CDATA[bench]]></steamID><games>\n")
+        for appid in range(10, 10 + games):
+            fh.write(
+                f"<game><appID>{appid}</appID><name><![CDATA[Game {appid} & Co]]></name>"
+                f"<logo><![CDATA[https://cdn.example/{appid}/logo.jpg]]></logo>"
+                f"<storeLink><![CDATA[https://store.example/app/{appid}]]></storeLink>"
+                "<hoursOnRecord>1.5</hoursOnRecord></game>\n"
+            )
+        fh.write("</games></gamesList>\n")
+
+
+def dom_parse(path: str) -> list[tuple[int, str]]:
+    with open(path, "rb") as fh:
+        root = ET.fromstring(fh.read())
+    return [
+        (int(g.findtext("appID")), g.findtext("name"))
+        for g in root.findall("./games/game")
+    ]
+
+
+def file_chunks(path: str):
+    with open(path, "rb") as fh:
+        while chunk := fh.read(XML_CHUNK_SIZE):
+            yield chunk
+
+
+def measure(label: str, run) -> object:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed:7.2f}s  peak {peak / 2**20:8.1f} MiB")
+    return result, peak
+
+
+def serve_file(path: str) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/xml")
+            self.send_header("Content-Length", str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, "rb") as fh:
+                while chunk := fh.read(XML_CHUNK_SIZE):
+                    self.wfile.write(chunk)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.xml")
+        write_fixture(path, args.games)
+        print(f"fixture: {args.games} games, {os.path.getsize(path) / 2**20:.1f} MiB")
+
+        expected, dom_peak = measure("fromstring (old)", lambda: dom_parse(path))
+        # Se cuenta sin guardar: lo que importa es el pico del propio parser
+        count = lambda games: sum(1 for _ in games)  # noqa: E731
+        streamed, stream_peak = measure(
+            "XMLPullParser (file)", lambda: count(parse_owned_games(file_chunks(path)))
+        )
+        assert streamed == len(expected), f"{streamed} != {len(expected)}"
+        assert list(parse_owned_games(file_chunks(path))) == expected, "different games"
+
+        server = serve_file(path)
+        http_client.default_client()  # que importar requests no cuente como latencia
+        url = f"http://127.0.0.1:{server.server_port}/profiles/{{steam_id}}/games"
+        first = {}
+
+        def over_http():
+            start, n = time.perf_counter(), 0
+            for _ in stream_owned_games("bench", url=url):
+                if not n:
+                    first["s"] = time.perf_counter() - start
+                n += 1
+            return n
+
+        served, http_peak = measure("XMLPullParser (http)", over_http)
+        server.shutdown()
+        assert served == len(expected)
+        print(f"first game after {first['s'] * 1000:.1f} ms over http")
+        # El pico en streaming no depende del tamaño de la biblioteca
+        assert stream_peak < 4 * 2**20, "streaming peak grew with the library"
+        assert http_peak < 8 * 2**20, "http streaming peak grew with the library"
+        print(f"peak reduced {dom_peak / stream_peak:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Launcher update check against a local bare repository.
+
+Builds a bare ``origin`` and two clones in a temporary directory: ``app`` is
+the checkout the launcher manages and ``dev`` pushes new commits to
+``origin/main``. Checks that :func:`launcher.check_for_update` reports
+``UP_TO_DATE``, ``UPDATE_AVAILABLE`` after a push, ``DIRTY`` with a modified
+tracked file and ``NOT_TRACKING`` on another branch or a detached HEAD, and
+that :func:`launcher.apply_update` fast-forwards to the pushed commit. Exits
+with an ``AssertionError`` on the first mismatch.
+
+    python -m benchmarks.update_check
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+import launcher
+
+# Repos aislados: sin configuración global ni del sistema y con autor fijo
+GIT_ENV = {
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_AUTHOR_NAME": "bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.invalid",
+    "GIT_COMMITTER_NAME": "bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.invalid",
+}
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit(repo: Path, name: str, text: str) -> str:
+    (repo / name).write_text(text, encoding="utf-8")
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", f"edit {name}")
+    return git(repo, "rev-parse", "HEAD")
+
+
+def make_repos(tmp: Path) -> tuple[Path, Path, Path]:
+    """``(origin, app, dev)``: a bare repo with one commit on main and two clones."""
+    origin, app, dev = tmp / "origin.git", tmp / "app", tmp / "dev"
+    git(tmp, "init", "-q", "--bare", str(origin))
+    git(origin, "symbolic-ref", "HEAD", "refs/heads/main")
+    git(tmp, "clone", "-q", str(origin), str(dev))
+    git(dev, "symbolic-ref", "HEAD", "refs/heads/main")
+    commit(dev, "main.pyw", "v1\n")
+    git(dev, "push", "-q", "-u", "origin", "main")
+    git(tmp, "clone", "-q", str(origin), str(app))
+    return origin, app, dev
+
+
+def expect(label: str, root: str, expected: str, fetch: bool = True) -> None:
+    start = time.perf_counter()
+    result = launcher.check_for_update(root, fetch=fetch)
+    elapsed = time.perf_counter() - start
+    assert result == expected, f"{label}: {result} != {expected}"
+    print(f"{label:<22} {result:<14} {elapsed * 1000:7.1f} ms")
+
+
+def main() -> None:
+    os.environ.update(GIT_ENV)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp).resolve()
+        _, app, dev = make_repos(tmp)
+        (app / "sub").mkdir()
+        root = launcher.find_repo_root(str(app / "sub"))
+        assert root == str(app), f"repo root {root} != {app}"
+
+        expect("fresh clone", root, launcher.UP_TO_DATE)
+        pushed = commit(dev, "main.pyw", "v2\n")
+        git(dev, "push", "-q", "origin", "main")
+        expect("after push", root, launcher.UPDATE_AVAILABLE)
+
+        launcher.apply_update(root)
+        head = git(app, "rev-parse", "HEAD")
+        assert head == pushed, f"apply_update left HEAD at {head}, expected {pushed}"
+        assert git(app, "rev-list", "--count", "HEAD") == "2", "apply_update did not fast-forward"
+        expect("after apply_update", root, launcher.UP_TO_DATE, fetch=False)
+
+        (app / "main.pyw").write_text("local edit\n", encoding="utf-8")
+        expect("modified tracked file", root, launcher.DIRTY)
+        git(app, "checkout", "-q", "--", "main.pyw")
+        # Los ficheros sin seguimiento no cuentan como cambios locales
+        (app / "notes.txt").write_text("untracked\n", encoding="utf-8")
+        expect("untracked file", root, launcher.UP_TO_DATE)
+
+        git(app, "checkout", "-q", "-b", "feature")
+        expect("other branch", root, launcher.NOT_TRACKING)
+        git(app, "checkout", "-q", "--detach", "main")
+        expect("detached HEAD", root, launcher.NOT_TRACKING)
+        git(app, "checkout", "-q", "main")
+        git(app, "branch", "-q", "--unset-upstream")
+        expect("main without upstream", root, launcher.NOT_TRACKING)
+
+
+if __name__ == "__main__":
+    main()
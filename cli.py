@@ -0,0 +1,287 @@
+"""Command-line interface for scripted suggestions.
+
+Only the domain and data layers are imported so the CLI starts fast enough
+for shell aliases and status-bar widgets: no Tk window, no pip install and no
+git checks.
+
+    python cli.py suggest [-k N] [--json] [--games/--no-games] [--games-only]
+    python cli.py accept s12
+    python cli.py list [--filter TEXT]
+    python cli.py stats
+    python cli.py maintenance [--analyze] [--vacuum PAGES] [--optimize] [--prune-tombstones]
+    python cli.py serve [--host 127.0.0.1] [--port 8765] [--workers N]
+    python cli.py catalog [--import APPLIST.json] [--lookup NAME]
+
+Every command accepts ``--profile NAME`` to work on a separate library.
+"""
+
+import argparse
+import os
+import sys
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hobbypicker", description="HobbyPicker CLI")
+    profile = argparse.ArgumentParser(add_help=False)
+    profile.add_argument(
+        "--profile", default=None, help="profile name (separate database)"
+    )
+    common = argparse.ArgumentParser(add_help=False, parents=[profile])
+    common.add_argument("--json", action="store_true", help="machine readable output")
+    common.add_argument(
+        "--games",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="include games (mirrors the 'Incluir juegos' switch)",
+    )
+    common.add_argument(
+        "--games-only", action="store_true", help="only suggest games"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    suggest = sub.add_parser("suggest", parents=[common], help="suggest activities")
+    suggest.add_argument("-k", type=int, default=1, help="number of suggestions")
+
+    accept = sub.add_parser("accept", parents=[common], help="accept an activity")
+    accept.add_argument("key", help="item key as printed by suggest/list (s12, h3)")
+
+    listing = sub.add_parser("list", parents=[common], help="list probabilities")
+    listing.add_argument("--filter", default="", help="case-insensitive text filter")
+
+    sub.add_parser("stats", parents=[common], help="show database statistics")
+
+    maintenance = sub.add_parser(
+        "maintenance", parents=[profile],
+        help="database page statistics and housekeeping",
+    )
+    maintenance.add_argument("--json", action="store_true", help="machine readable output")
+    maintenance.add_argument("--analyze", action="store_true", help="run ANALYZE")
+    maintenance.add_argument(
+        "--vacuum", type=int, metavar="PAGES", default=0,
+        help="reclaim up to PAGES free pages (enables incremental vacuum first)",
+    )
+    maintenance.add_argument("--optimize", action="store_true", help="run PRAGMA optimize")
+    maintenance.add_argument(
+        "--prune-tombstones", action="store_true",
+        help="delete change-tracking tombstones older than the kept history",
+    )
+
+    serve = sub.add_parser(
+        "serve", parents=[profile], help="run the local HTTP suggestion service"
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument(
+        "--workers", type=int, default=1,
+        help="worker processes sharing the candidate arrays via shared memory",
+    )
+    serve.add_argument(
+        "--max-profiles", type=int, default=32, help="profiles kept open at once"
+    )
+    catalog = sub.add_parser(
+        "catalog", help="offline Steam app catalog used to resolve appids"
+    )
+    catalog.add_argument("--json", action="store_true", help="machine readable output")
+    catalog.add_argument(
+        "--import", dest="dump", metavar="FILE",
+        help="replace the catalog with a Steam GetAppList JSON dump",
+    )
+    catalog.add_argument("--lookup", metavar="NAME", help="resolve a game name to its appid")
+    return parser
+
+
+def _make_dao(args):
+    from data.activity_dao import ActivityDAO, profile_db_path
+
+    return ActivityDAO(profile_db_path(args.profile))
+
+
+def _is_game_label(label: str) -> bool:
+    from presentation.utils import i18n  # plain string tables, no Tk
+
+    return i18n.is_steam_game_label(label) or i18n.is_epic_game_label(label)
+
+
+def _open_candidates(args, dao=None):
+    """Map the on-disk candidate snapshot, rebuilding it only when stale.
+
+    The DAO is opened lazily, so a warm ``suggest`` never opens the database.
+    """
+    from data.activity_dao import profile_db_path
+    from infrastructure import candidate_snapshot
+
+    def rows():
+        from domain import use_cases
+
+        return use_cases.collect_candidates(dao=dao or _make_dao(args))
+
+    return candidate_snapshot.load_or_build(
+        profile_db_path(args.profile), rows, _is_game_label
+    )
+
+
+def _make_controller(args):
+    from domain.suggestion_controller import SuggestionController
+
+    controller = SuggestionController(is_game_label=_is_game_label, dao=_make_dao(args))
+    controller.set_toggles(include_games=args.games, games_only=args.games_only)
+    with _open_candidates(args, controller.dao) as snapshot:
+        controller.load_packed(snapshot.packed)
+    return controller
+
+
+def _item_dict(item, probability: float | None = None) -> dict:
+    from domain.suggestion_controller import item_key
+
+    item_id, label, is_sub = item
+    data = {"key": item_key(item_id, is_sub), "id": item_id, "label": label,
+            "is_subitem": is_sub}
+    if probability is not None:
+        data["probability"] = probability
+    return data
+
+
+def _emit(args, payload, lines: list[str]) -> None:
+    if args.json:
+        import json
+
+        print(json.dumps(payload, ensure_ascii=False))
+    else:
+        print("\n".join(lines))
+
+
+def cmd_suggest(args) -> int:
+    from domain.suggestion_controller import partition_name
+
+    # Muestrea directamente sobre el snapshot mapeado, sin construir listas
+    with _open_candidates(args) as snapshot:
+        picked = snapshot.packed.sample(
+            max(args.k, 1),
+            # --games-only implica --games, igual que en set_toggles
+            partition_name(args.games or args.games_only, args.games_only),
+        )
+    if not picked:
+        print("no activities available", file=sys.stderr)
+        return 1
+    rows = [_item_dict(item) for item in picked]
+    _emit(args, rows if args.k > 1 else rows[0],
+          [f"{r['key']}\t{r['label']}" for r in rows])
+    return 0
+
+
+def cmd_accept(args) -> int:
+    from domain.suggestion_controller import parse_item_key
+
+    try:
+        item_id, is_sub = parse_item_key(args.key)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    controller = _make_controller(args)
+    if controller.select(item_id, is_sub) is None:
+        print(f"unknown item: {args.key}", file=sys.stderr)
+        return 1
+    accepted = controller.accept()
+    _open_candidates(args, controller.dao).close()  # deja el snapshot al día
+    row = _item_dict(accepted)
+    _emit(args, row, [f"{row['key']}\t{row['label']}"])
+    return 0
+
+
+def cmd_list(args) -> int:
+    controller = _make_controller(args)
+    needle = args.filter.lower()
+    rows = [
+        _item_dict(item, prob)
+        for item, prob in controller.probabilities()
+        if not needle or needle in item[1].lower()
+    ]
+    _emit(args, rows,
+          [f"{r['key']}\t{r['probability'] * 100:.1f}%\t{r['label']}" for r in rows])
+    return 0
+
+
+def cmd_stats(args) -> int:
+    from domain import use_cases
+
+    controller = _make_controller(args)
+    stats = use_cases.get_count_summary(dao=controller.dao)
+    stats["candidates"] = len(controller.activity_lists["all"][0])
+    stats["games"] = len(controller.activity_lists["games"][0])
+    _emit(args, stats, [f"{key}: {value}" for key, value in stats.items()])
+    return 0
+
+
+def cmd_maintenance(args) -> int:
+    from data import maintenance
+    from infrastructure.lookup_cache import LOOKUP_SUFFIX, LookupCache
+
+    dao = _make_dao(args)
+    conn = dao.conn
+    result = {}
+    if args.analyze:
+        maintenance.analyze(conn)
+    if args.vacuum:
+        result["enabled_incremental"] = maintenance.enable_incremental_vacuum(conn)
+        result["reclaimed_pages"] = maintenance.incremental_vacuum(conn, args.vacuum)
+    if args.optimize:
+        maintenance.optimize(conn)
+    if args.prune_tombstones:
+        result["pruned_tombstones"] = maintenance.prune_tombstones(conn)
+    (result["tombstones"],) = conn.execute("SELECT COUNT(*) FROM tombstones").fetchone()
+    result.update(maintenance.database_stats(conn))
+    # Sólo se informa de la caché de consultas si ya existe; no se crea aquí
+    if os.path.exists(dao.db_path + LOOKUP_SUFFIX):
+        lookups = LookupCache(dao.db_path + LOOKUP_SUFFIX)
+        result["lookup_cache_entries"] = lookups.stats()["entries"]
+        lookups.close()
+    _emit(args, result, [f"{key}: {value}" for key, value in result.items()])
+    return 0
+
+
+def cmd_catalog(args) -> int:
+    from infrastructure.app_catalog import default_catalog
+
+    # Compartido por todos los perfiles, como el de la interfaz
+    catalog = default_catalog()
+    result = {}
+    if args.dump:
+        result["imported"] = catalog.import_dump(args.dump)
+    if args.lookup:
+        result["lookup"] = args.lookup
+        result["appid"] = catalog.lookup(args.lookup)
+    result["apps"] = catalog.size
+    result["fts5"] = catalog.has_fts
+    _emit(args, result, [f"{key}: {value}" for key, value in result.items()])
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from presentation.http_service import serve
+
+    serve(args.host, args.port, args.workers, args.profile, args.max_profiles)
+    return 0
+
+
+COMMANDS = {
+    "suggest": cmd_suggest,
+    "accept": cmd_accept,
+    "list": cmd_list,
+    "stats": cmd_stats,
+    "maintenance": cmd_maintenance,
+    "serve": cmd_serve,
+    "catalog": cmd_catalog,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return COMMANDS[args.command](args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
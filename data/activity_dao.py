@@ -1,6 +1,7 @@
 import sqlite3
 import random
 import os
+import re
 
 DB_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "hobbypicker.db"))
 DB_PATH = os.path.abspath(
@@ -11,13 +12,44 @@ DB_PATH = os.path.abspath(
 # Si la variable de entorno `HOBBYPICKER_DEBUG` está presente se imprime la ruta
 if os.environ.get("HOBBYPICKER_DEBUG"):
     print("🧭 Base de datos en uso:", DB_PATH)
+
+# Cada perfil adicional tiene su propia base de datos en esta carpeta;
+# `HOBBYPICKER_PROFILES_DIR` la cambia (p. ej. benchmarks sobre una copia temporal)
+PROFILES_DIR = os.path.abspath(
+    os.environ.get("HOBBYPICKER_PROFILES_DIR")
+    or os.path.join(os.path.dirname(__file__), "..", "profiles")
+)
+DEFAULT_PROFILE = "default"
+_PROFILE_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def profile_db_path(profile: str | None) -> str:
+    """Database file for *profile*; the default profile keeps ``DB_PATH``."""
+    if not profile or profile == DEFAULT_PROFILE:
+        return DB_PATH
+    if not _PROFILE_NAME.match(profile):
+        raise ValueError(f"invalid profile name: {profile!r}")
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    return os.path.join(PROFILES_DIR, f"{profile}.db")
+
+
 class ActivityDAO:
-    def __init__(self):
-        self.conn = sqlite3.connect(DB_PATH)
+    # True en data.memory_dao.InMemoryActivityDAO: los datos vivos están en RAM
+    in_memory = False
+
+    def __init__(self, db_path: str | None = None, check_same_thread: bool = True):
+        self.db_path = db_path or DB_PATH
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
         self._create_tables()
 
     def _create_tables(self):
         c = self.conn.cursor()
+        # Sólo en bases nuevas: en una existente la orden no migra nada pero
+        # sí incrementa el contador de cambios del fichero, y con él la huella
+        # de la instantánea de candidatos. Las existentes las migra
+        # data.maintenance con un VACUUM en segundo plano
+        if c.execute("PRAGMA page_count").fetchone()[0] == 0:
+            c.execute("PRAGMA auto_vacuum = INCREMENTAL")
         c.execute("""CREATE TABLE IF NOT EXISTS activities (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         name TEXT UNIQUE,
@@ -37,8 +69,65 @@ class ActivityDAO:
             )
         except sqlite3.OperationalError:
             pass
+        self._create_change_tracking(c)
         self.conn.commit()
 
+    def _create_change_tracking(self, c):
+        """Row versions and tombstones so readers can refresh only what changed.
+
+        Every insert/update stamps the row with the next value of a single
+        ``sync_clock``; deletes leave a tombstone with that value. Triggers do
+        the work, so writers outside this class (CLI, other windows) are
+        tracked too.
+        """
+        for table in ("activities", "subitems"):
+            try:
+                c.execute(f"ALTER TABLE {table} ADD COLUMN row_version INTEGER DEFAULT 0")
+            except sqlite3.OperationalError:
+                pass
+            c.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_row_version ON {table}(row_version)"
+            )
+        c.execute("""CREATE TABLE IF NOT EXISTS sync_clock (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        version INTEGER NOT NULL
+                    )""")
+        c.execute("INSERT OR IGNORE INTO sync_clock (id, version) VALUES (1, 0)")
+        # Versión del último tombstone borrado por data.maintenance.prune_tombstones
+        try:
+            c.execute("ALTER TABLE sync_clock ADD COLUMN pruned INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+        c.execute("""CREATE TABLE IF NOT EXISTS tombstones (
+                        kind TEXT NOT NULL,
+                        item_id INTEGER NOT NULL,
+                        activity_id INTEGER,
+                        row_version INTEGER NOT NULL
+                    )""")
+        c.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tombstones_row_version ON tombstones(row_version)"
+        )
+        tick = "UPDATE sync_clock SET version = version + 1;"
+        now = "(SELECT version FROM sync_clock WHERE id = 1)"
+        for table, columns in (
+            ("activities", "name, done, accepted_count"),
+            ("subitems", "activity_id, name, accepted_count"),
+        ):
+            stamp = f"UPDATE {table} SET row_version = {now} WHERE id = NEW.id;"
+            # Sólo columnas de datos: el propio sello no vuelve a disparar nada
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_stamp_insert
+                          AFTER INSERT ON {table} BEGIN {tick} {stamp} END""")
+            c.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_stamp_update
+                          AFTER UPDATE OF {columns} ON {table} BEGIN {tick} {stamp} END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS activities_tombstone
+                      AFTER DELETE ON activities BEGIN {tick}
+                          INSERT INTO tombstones VALUES ('activity', OLD.id, OLD.id, {now});
+                      END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS subitems_tombstone
+                      AFTER DELETE ON subitems BEGIN {tick}
+                          INSERT INTO tombstones VALUES ('subitem', OLD.id, OLD.activity_id, {now});
+                      END""")
+
     def get_all_activities(self):
         return self.conn.execute("SELECT id, name FROM activities").fetchall()
 
@@ -48,6 +137,11 @@ class ActivityDAO:
             (activity_id,),
         ).fetchall()
 
+    def get_all_subitems(self):
+        return self.conn.execute(
+            "SELECT id, activity_id, name, accepted_count FROM subitems ORDER BY id"
+        ).fetchall()
+
     def get_random_with_subitems(self):
         c = self.conn.cursor()
         c.execute("""SELECT a.id, a.name FROM activities a
@@ -95,6 +189,15 @@ class ActivityDAO:
         self.conn.execute("INSERT INTO subitems (activity_id, name) VALUES (?, ?)", (activity_id, name))
         self.conn.commit()
 
+    def insert_subitems(self, activity_id, names):
+        """Insert many subitems in one transaction; returns how many."""
+        with self.conn:
+            cur = self.conn.executemany(
+                "INSERT INTO subitems (activity_id, name) VALUES (?, ?)",
+                ((activity_id, name) for name in names),
+            )
+        return cur.rowcount
+
     def delete_subitem(self, subitem_id):
         self.conn.execute("DELETE FROM subitems WHERE id = ?", (subitem_id,))
         self.conn.commit()
@@ -107,6 +210,56 @@ class ActivityDAO:
     def get_all_with_counts(self):
         return self.conn.execute("SELECT id, name, accepted_count FROM activities").fetchall()
 
+    def get_data_version(self) -> int:
+        """Counter that changes when *another* connection commits to the DB."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_sync_version(self) -> int:
+        """Latest row version stamped by the change-tracking triggers."""
+        return self.conn.execute("SELECT version FROM sync_clock WHERE id = 1").fetchone()[0]
+
+    def get_tombstone_horizon(self) -> int:
+        """Newest pruned tombstone version; readers synced before it must reload."""
+        return self.conn.execute("SELECT pruned FROM sync_clock WHERE id = 1").fetchone()[0]
+
+    def get_changed_activity_ids(self, since: int) -> set[int]:
+        """Hobbies whose own row, subitems or deletions are newer than *since*."""
+        rows = self.conn.execute(
+            """SELECT id FROM activities WHERE row_version > ?
+               UNION SELECT activity_id FROM subitems WHERE row_version > ?
+               UNION SELECT activity_id FROM tombstones WHERE row_version > ?""",
+            (since, since, since),
+        ).fetchall()
+        return {row[0] for row in rows if row[0] is not None}
+
+    def get_activities_by_ids(self, activity_ids):
+        """``(id, name, accepted_count)`` rows plus their subitems for *activity_ids*."""
+        activities, subitems = [], []
+        ids = list(activity_ids)
+        # Por tandas para no superar el límite de parámetros de SQLite
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            activities += self.conn.execute(
+                f"SELECT id, name, accepted_count FROM activities WHERE id IN ({marks})",
+                chunk,
+            ).fetchall()
+            subitems += self.conn.execute(
+                "SELECT id, activity_id, name, accepted_count FROM subitems "
+                f"WHERE activity_id IN ({marks}) ORDER BY id",
+                chunk,
+            ).fetchall()
+        return activities, subitems
+
+    def get_count_summary(self):
+        return self.conn.execute(
+            """SELECT
+                   (SELECT COUNT(*) FROM activities),
+                   (SELECT COUNT(*) FROM subitems),
+                   (SELECT COALESCE(SUM(accepted_count), 0) FROM activities),
+                   (SELECT COALESCE(SUM(accepted_count), 0) FROM subitems)"""
+        ).fetchone()
+
     def update_subitem(self, subitem_id, new_name):
         self.conn.execute("UPDATE subitems SET name = ? WHERE id = ?", (new_name, subitem_id))
         self.conn.commit()
@@ -0,0 +1,169 @@
+"""SQLite housekeeping: statistics, ANALYZE/optimize and incremental vacuum.
+
+Anything that writes goes through :class:`MaintenanceWorker`, which owns a
+separate connection on a background thread, so the Tk loop never waits on
+it. Vacuum work is done in bounded steps of *step_pages* pages, keeping the
+write lock short enough not to stall other connections.
+"""
+
+import queue
+import sqlite3
+import threading
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+# A partir de cuántas filas importadas merece la pena un ANALYZE
+LARGE_IMPORT_ROWS = 50
+VACUUM_STEP_PAGES = 64
+# Versiones de historia que conservan los tombstones; un lector más atrasado
+# recarga todo (ver CandidateIndex.refresh)
+TOMBSTONE_KEEP_VERSIONS = 10000
+
+
+def _pragma(conn: sqlite3.Connection, name: str) -> int:
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def database_stats(conn: sqlite3.Connection) -> dict:
+    """Page counts, free pages and the share of the file they waste."""
+    page_size = _pragma(conn, "page_size")
+    page_count = _pragma(conn, "page_count")
+    freelist = _pragma(conn, "freelist_count")
+    return {
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "fragmentation": round(freelist / page_count, 4) if page_count else 0.0,
+        "size_bytes": page_size * page_count,
+        "auto_vacuum": AUTO_VACUUM_MODES.get(_pragma(conn, "auto_vacuum"), "unknown"),
+    }
+
+
+def analyze(conn: sqlite3.Connection) -> None:
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def optimize(conn: sqlite3.Connection) -> None:
+    """``PRAGMA optimize``; run it on a connection that has been querying."""
+    conn.execute("PRAGMA optimize")
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Switch an existing database to ``auto_vacuum=INCREMENTAL``.
+
+    The mode only takes effect after a full ``VACUUM``, which rewrites the
+    file once. Returns ``False`` if it was already enabled.
+    """
+    if _pragma(conn, "auto_vacuum") == 2:
+        return False
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+
+def prune_tombstones(conn: sqlite3.Connection, keep_versions: int = TOMBSTONE_KEEP_VERSIONS) -> int:
+    """Delete tombstones older than the last *keep_versions* row versions.
+
+    ``sync_clock.pruned`` records the newest version removed, so a reader
+    synced before it knows it missed deletions. Returns the rows deleted.
+    """
+    (version,) = conn.execute("SELECT version FROM sync_clock WHERE id = 1").fetchone()
+    (newest,) = conn.execute(
+        "SELECT MAX(row_version) FROM tombstones WHERE row_version <= ?",
+        (version - keep_versions,),
+    ).fetchone()
+    if newest is None:
+        return 0
+    removed = conn.execute("DELETE FROM tombstones WHERE row_version <= ?", (newest,)).rowcount
+    conn.execute("UPDATE sync_clock SET pruned = MAX(pruned, ?) WHERE id = 1", (newest,))
+    conn.commit()
+    return removed
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int = VACUUM_STEP_PAGES) -> int:
+    """Release up to *pages* free pages; returns how many were reclaimed."""
+    before = _pragma(conn, "freelist_count")
+    if not before:
+        return 0
+    # Cada paso del statement libera una página y execute() sólo da uno;
+    # executescript lo ejecuta hasta el final
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+    return before - _pragma(conn, "freelist_count")
+
+
+class MaintenanceWorker:
+    """Runs maintenance tasks on its own connection and thread.
+
+    Requests can be queued before :meth:`start`; :meth:`stop` drains the
+    queue and closes the connection. Busy/locked errors skip the task (it is
+    retried on the next request) instead of surfacing to the UI. Started
+    with a *dao* that has ``run(task)`` (the in-memory DAO), tasks go
+    through that DAO's connection instead of opening the file, which there
+    is only a backup.
+    """
+
+    def __init__(self, db_path: str, step_pages: int = VACUUM_STEP_PAGES):
+        self.db_path = db_path
+        self.step_pages = step_pages
+        self.last_stats: dict | None = None
+        self.reclaimed_pages = 0
+        self.pruned_tombstones = 0
+        self._tasks: queue.Queue = queue.Queue()
+        self._dao = None
+        self._thread = threading.Thread(
+            target=self._run, name="hobbypicker-maintenance", daemon=True
+        )
+
+    def start(self, dao=None) -> None:
+        self._dao = dao
+        self._thread.start()
+
+    def request_analyze(self) -> None:
+        self._tasks.put(analyze)
+
+    def after_import(self, rows: int) -> None:
+        """Refresh planner statistics after a large import."""
+        if rows >= LARGE_IMPORT_ROWS:
+            self.request_analyze()
+
+    def request_vacuum_step(self) -> None:
+        """One bounded vacuum step (enabling incremental mode the first time)."""
+        self._tasks.put(self._vacuum_step)
+
+    def request_prune_tombstones(self) -> None:
+        self._tasks.put(self._prune_tombstones)
+
+    def _prune_tombstones(self, conn: sqlite3.Connection) -> None:
+        self.pruned_tombstones += prune_tombstones(conn)
+
+    def _vacuum_step(self, conn: sqlite3.Connection) -> None:
+        if not enable_incremental_vacuum(conn):
+            self.reclaimed_pages += incremental_vacuum(conn, self.step_pages)
+
+    def stop(self, timeout: float | None = None) -> None:
+        if self._thread.is_alive():
+            self._tasks.put(None)
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        if self._dao is not None:
+            self._drain(self._dao.run)
+            return
+        # Espera poco a los bloqueos: si la BD está ocupada se salta la tarea
+        conn = sqlite3.connect(self.db_path, timeout=1.0)
+        try:
+            self._drain(lambda task: task(conn))
+        finally:
+            conn.close()
+
+    def _drain(self, run) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            try:
+                run(task)
+                self.last_stats = run(database_stats)
+            except sqlite3.Error:
+                run(lambda conn: conn.rollback())
@@ -0,0 +1,112 @@
+import atexit
+import functools
+import sqlite3
+import threading
+import time
+
+from data.activity_dao import ActivityDAO, DB_PATH
+
+
+class InMemoryActivityDAO(ActivityDAO):
+    """:class:`ActivityDAO` that serves every query from a ``:memory:`` copy.
+
+    The database file is loaded with the sqlite3 backup API at start-up and
+    written back with :meth:`sqlite3.Connection.backup` every
+    *backup_interval* seconds (only when something changed) and at exit.
+    *backup_interval* is the durability window: a crash loses at most that
+    many seconds of writes. ``None`` or ``0`` disables the timer, leaving
+    :meth:`flush` and the exit hook.
+
+    Intended for kiosk/demo setups with a single writer: the periodic backup
+    overwrites whatever other processes wrote to the file in the meantime.
+    Every DAO method, the backup and :meth:`run` hold one re-entrant lock, so
+    a backup never copies a write that is half done and other threads
+    (start-up loader, maintenance) can share the connection.
+    """
+
+    in_memory = True
+
+    def __init__(self, db_path: str | None = None, backup_interval: float | None = 5.0):
+        self.db_path = db_path or DB_PATH
+        self.backup_interval = backup_interval
+        # El hilo de copia usa la misma conexión; el lock serializa copias y escrituras
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.RLock()
+        disk = sqlite3.connect(self.db_path)
+        try:
+            disk.backup(self.conn)
+        finally:
+            disk.close()
+        self._create_tables()
+        self._saved_changes = self.conn.total_changes
+        self.last_backup: float | None = None
+        self.backups = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if backup_interval:
+            self._thread = threading.Thread(
+                target=self._run, name="hobbypicker-backup", daemon=True
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def dirty(self) -> bool:
+        return self.conn.total_changes != self._saved_changes
+
+    def flush(self) -> bool:
+        """Copy the in-memory database to disk if it changed; returns ``True`` if copied."""
+        with self._lock:
+            # Nunca se copia una transacción a medias
+            if not self.dirty or self.conn.in_transaction:
+                return False
+            changes = self.conn.total_changes
+            start = time.perf_counter()
+            disk = sqlite3.connect(self.db_path)
+            try:
+                self.conn.backup(disk)
+            finally:
+                disk.close()
+            self._saved_changes = changes
+            self.last_backup = time.perf_counter() - start
+            self.backups += 1
+            return True
+
+    def run(self, task):
+        """Return ``task(conn)`` run under the DAO lock."""
+        with self._lock:
+            return task(self.conn)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.backup_interval):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # p. ej. el fichero está bloqueado: se reintenta en el siguiente ciclo
+                pass
+
+    def close(self) -> None:
+        """Stop the timer, write pending changes and close the connection."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.conn.close()
+        atexit.unregister(self.close)
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+# Todas las consultas públicas del DAO pasan por el lock de la copia
+for _name, _method in vars(ActivityDAO).items():
+    if not _name.startswith("_") and callable(_method):
+        setattr(InMemoryActivityDAO, _name, _locked(_method))
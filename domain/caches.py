@@ -0,0 +1,125 @@
+"""Dependency-tracked cache domains with lazy rebuilds.
+
+Each domain has a builder and may depend on other domains. Mutations only
+*invalidate* (the domain and, transitively, everything depending on it);
+the work happens on the next :meth:`CacheRegistry.get`. Mutation use cases
+declare what they invalidate with :func:`invalidates`, so the UI no longer
+has to rescan everything after every change.
+"""
+
+import threading
+from functools import wraps
+from typing import Any, Callable, Iterable
+
+from infrastructure.metrics import Metrics, metrics as default_metrics
+
+# Dominios usados por la aplicación
+DB_CANDIDATES = "db_candidates"      # listas ponderadas leídas de SQLite
+STEAM_INSTALLED = "steam_installed"  # juegos de Steam instalados en disco
+EPIC_INSTALLED = "epic_installed"    # juegos de Epic instalados en disco
+PROBABILITIES = "probabilities"      # tabla de probabilidades en pantalla
+
+
+class CacheRegistry:
+    """Named cache domains; thread-safe, builders run under the registry lock."""
+
+    def __init__(self, metrics: Metrics | None = None):
+        self.metrics = metrics or default_metrics
+        self._lock = threading.RLock()
+        self._builders: dict[str, Callable[[], Any]] = {}
+        self._dependencies: dict[str, tuple[str, ...]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._values: dict[str, Any] = {}
+        self._stale: set[str] = set()
+        # Cambia con cada invalidación o reconstrucción (ver put)
+        self._epochs: dict[str, int] = {}
+
+    def register(
+        self, name: str, build: Callable[[], Any], depends_on: Iterable[str] = ()
+    ) -> None:
+        """Declare (or replace) domain *name*; it starts stale."""
+        with self._lock:
+            self._builders[name] = build
+            self._dependencies[name] = tuple(depends_on)
+            for dependency in self._dependencies[name]:
+                self._dependents.setdefault(dependency, set()).add(name)
+            self._values.pop(name, None)
+            self._stale.add(name)
+
+    def _closure(self, names: Iterable[str]) -> set[str]:
+        pending, seen = list(names), set()
+        while pending:
+            name = pending.pop()
+            if name not in seen:
+                seen.add(name)
+                pending.extend(self._dependents.get(name, ()))
+        return seen
+
+    def invalidate(self, *names: str) -> None:
+        """Mark *names* and every domain depending on them as stale."""
+        with self._lock:
+            for name in self._closure(names):
+                self._stale.add(name)
+                self._epochs[name] = self._epochs.get(name, 0) + 1
+                self.metrics.incr(f"cache.{name}.invalidations")
+
+    def get(self, name: str) -> Any:
+        """Return the value of *name*, rebuilding it (dependencies first) if stale."""
+        with self._lock:
+            if name not in self._builders:
+                raise KeyError(f"unknown cache domain: {name!r}")
+            for dependency in self._dependencies[name]:
+                self.get(dependency)
+            if name in self._stale:
+                value = self._builders[name]()
+                self._accept(name, value)
+                self.metrics.incr(f"cache.{name}.rebuilds")
+            return self._values[name]
+
+    def _accept(self, name: str, value: Any) -> None:
+        self._values[name] = value
+        self._epochs[name] = self._epochs.get(name, 0) + 1
+        self._stale.discard(name)
+        # Un valor nuevo deja obsoleto todo lo que se construyó a partir del viejo
+        self.invalidate(*self._dependents.get(name, ()))
+
+    def put(self, name: str, value: Any, epoch: int | None = None) -> bool:
+        """Install a value built elsewhere (e.g. on a worker thread).
+
+        With *epoch* (from :meth:`epoch` when the work started) the value is
+        refused if the domain was invalidated or rebuilt in the meantime.
+        Dependents become stale whenever the value is accepted.
+        """
+        with self._lock:
+            if epoch is not None and self._epochs.get(name, 0) != epoch:
+                return False
+            self._accept(name, value)
+            return True
+
+    def epoch(self, name: str) -> int:
+        with self._lock:
+            return self._epochs.get(name, 0)
+
+    def is_stale(self, name: str) -> bool:
+        with self._lock:
+            return name in self._stale or name not in self._values
+
+
+def invalidates(*names: str, registry: CacheRegistry | None = None):
+    """Decorator for mutations: invalidate *names* after a successful call."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            (registry or caches).invalidate(*names)
+            return result
+
+        wrapper.invalidates = names
+        return wrapper
+
+    return decorator
+
+
+# Registro compartido por toda la aplicación
+caches = CacheRegistry()
@@ -0,0 +1,95 @@
+"""Incremental view of the candidate set for long-running readers.
+
+:class:`DataVersionWatcher` is the cheap "did anyone else commit?" check
+(``PRAGMA data_version``, one statement, no table reads). When it fires,
+:class:`CandidateIndex` re-reads only the hobbies touched since its last
+sync, using the row versions and tombstones maintained by the DAO
+triggers, and re-derives the weighted lists in memory.
+"""
+
+from data.activity_dao import ActivityDAO
+from domain import use_cases
+
+Row = tuple[int, str, bool, int]
+
+
+class DataVersionWatcher:
+    """Detects commits made by *other* connections to the DAO's database."""
+
+    def __init__(self, dao: ActivityDAO):
+        self.dao = dao
+        self.version = dao.get_data_version()
+
+    def changed(self) -> bool:
+        version = self.dao.get_data_version()
+        if version == self.version:
+            return False
+        self.version = version
+        return True
+
+
+class CandidateIndex:
+    """Candidate rows grouped by hobby, kept in sync by row version."""
+
+    def __init__(self):
+        self.version: int | None = None
+        self._rows: dict[int, list[Row]] = {}
+        self._order: list[int] | None = None
+
+    def refresh(self, dao: ActivityDAO) -> set[int] | None:
+        """Apply changes since the last sync.
+
+        Returns the ids of the hobbies that were re-read, or ``None`` when a
+        full load was needed (first call, the clock went backwards because
+        the database file was replaced, or tombstones this index had not
+        seen yet were pruned).
+        """
+        # La versión se lee antes que las filas: lo que cambie entretanto se
+        # vuelve a aplicar en la próxima sincronización (es idempotente)
+        version = dao.get_sync_version()
+        if self.version is None or version < self.version:
+            self._load_all(dao)
+            self.version = version
+            return None
+        if version == self.version:
+            return set()
+        if self.version < dao.get_tombstone_horizon():
+            # Se podaron borrados que esta copia aún no había aplicado
+            self._load_all(dao)
+            self.version = version
+            return None
+        changed = dao.get_changed_activity_ids(self.version)
+        activities, subitems = dao.get_activities_by_ids(changed)
+        by_activity: dict[int, list] = {}
+        for sub in subitems:
+            by_activity.setdefault(sub[1], []).append(sub)
+        for hobby_id in changed:
+            self._rows.pop(hobby_id, None)
+        for hobby_id, name, count in activities:
+            self._rows[hobby_id] = use_cases.hobby_candidates(
+                hobby_id, name, count, by_activity.get(hobby_id)
+            )
+        self._order = None
+        self.version = version
+        return changed
+
+    def _load_all(self, dao: ActivityDAO) -> None:
+        by_activity: dict[int, list] = {}
+        for sub in dao.get_all_subitems():
+            by_activity.setdefault(sub[1], []).append(sub)
+        self._rows = {
+            hobby_id: use_cases.hobby_candidates(
+                hobby_id, name, count, by_activity.get(hobby_id)
+            )
+            for hobby_id, name, count in dao.get_all_with_counts()
+        }
+        self._order = None
+
+    def rows(self) -> list[Row]:
+        """All candidate rows, in the order ``collect_candidates`` returns them."""
+        if self._order is None:
+            self._order = sorted(self._rows)
+        return [row for hobby_id in self._order for row in self._rows[hobby_id]]
+
+    def weighted_items(self) -> tuple[list[tuple[int, str, bool]], list[int]]:
+        return use_cases.weigh_candidates(self.rows())
@@ -0,0 +1,193 @@
+"""Packed binary form of the candidate set.
+
+The weighted lists are flattened into one contiguous buffer (header, id,
+count and flag arrays, label offsets, per-partition index and cumulative
+weight arrays and a UTF-8 label blob). A :class:`PackedCandidates` view reads
+it through typed ``memoryview`` casts, so sampling from shared memory or an
+``mmap`` never creates per-item Python objects; only the picked items are
+materialised.
+
+All integers use the native byte order of the machine that wrote the buffer.
+"""
+
+import random
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterable
+
+MAGIC = b"HPCS"
+FORMAT_VERSION = 1
+PARTITIONS = ("all", "no_games", "games")
+
+FLAG_SUBITEM = 1
+FLAG_GAME = 2
+
+# magic, format, reserved, generation, count, max_count, labels_size,
+# partition sizes (3) and partition total weights (3)
+_HEADER = struct.Struct("=4sHHQIII3I3Q")
+
+Item = tuple[int, str, bool]
+
+
+def _pad(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def pack_candidates(
+    rows: Iterable[tuple[int, str, bool, int]],
+    is_game_label: Callable[[str], bool] | None = None,
+    generation: int = 0,
+) -> bytes:
+    """Serialise ``(item_id, label, is_subitem, count)`` rows into a buffer.
+
+    Weights follow :func:`domain.use_cases.build_weighted_items`:
+    ``max(count) + 1 - count`` for every partition.
+    """
+    rows = list(rows)
+    is_game_label = is_game_label or (lambda label: False)
+    ids = array("q")
+    counts = array("I")
+    flags = bytearray()
+    offsets = array("I", [0])
+    labels = bytearray()
+    for item_id, label, is_sub, count in rows:
+        encoded = label.encode("utf-8")
+        ids.append(item_id)
+        counts.append(count)
+        flag = FLAG_SUBITEM if is_sub else 0
+        if is_sub and is_game_label(label):
+            flag |= FLAG_GAME
+        flags.append(flag)
+        labels += encoded
+        offsets.append(len(labels))
+
+    max_count = max(counts) + 1 if counts else 0
+    partitions: list[tuple[array, array]] = []
+    for name in PARTITIONS:
+        index = array("I")
+        cum = array("Q")
+        total = 0
+        for i, flag in enumerate(flags):
+            if name == "games" and not flag & FLAG_GAME:
+                continue
+            if name == "no_games" and flag & FLAG_GAME:
+                continue
+            total += max_count - counts[i]
+            index.append(i)
+            cum.append(total)
+        partitions.append((index, cum))
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        0,
+        generation,
+        len(ids),
+        max_count,
+        len(labels),
+        *(len(index) for index, _ in partitions),
+        *(cum[-1] if cum else 0 for _, cum in partitions),
+    )
+    chunks = [header, ids.tobytes(), counts.tobytes(), bytes(flags), offsets.tobytes()]
+    for index, cum in partitions:
+        chunks.extend((index.tobytes(), cum.tobytes()))
+    chunks.append(bytes(labels))
+    out = bytearray()
+    for chunk in chunks:
+        out += chunk
+        out += b"\0" * (_pad(len(out)) - len(out))
+    return bytes(out)
+
+
+class PackedCandidates:
+    """Zero-copy reader over a buffer produced by :func:`pack_candidates`.
+
+    Call :meth:`release` before closing the underlying ``mmap`` or shared
+    memory segment.
+    """
+
+    def __init__(self, buffer):
+        self._mv = memoryview(buffer).cast("B")
+        (
+            magic, fmt, _, self.generation, count, self.max_count, labels_size,
+            *rest,
+        ) = _HEADER.unpack_from(self._mv, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError("not a packed candidate buffer")
+        sizes, totals = rest[:3], rest[3:]
+        self.count = count
+        self.totals = dict(zip(PARTITIONS, totals))
+        self.sizes = dict(zip(PARTITIONS, sizes))
+
+        pos = _pad(_HEADER.size)
+        self._views: list[memoryview] = []
+
+        def take(nbytes: int, fmt: str) -> memoryview:
+            nonlocal pos
+            view = self._mv[pos:pos + nbytes]
+            self._views.append(view)
+            if fmt != "B":
+                view = view.cast(fmt)
+                self._views.append(view)
+            pos = _pad(pos + nbytes)
+            return view
+
+        self.ids = take(count * 8, "q")
+        self.counts = take(count * 4, "I")
+        self.flags = take(count, "B")
+        self.offsets = take((count + 1) * 4, "I")
+        self.index: dict[str, memoryview] = {}
+        self.cum: dict[str, memoryview] = {}
+        for name, size in zip(PARTITIONS, sizes):
+            self.index[name] = take(size * 4, "I")
+            self.cum[name] = take(size * 8, "Q")
+        self.labels = take(labels_size, "B")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def label(self, i: int) -> str:
+        return bytes(self.labels[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def item(self, i: int) -> Item:
+        return self.ids[i], self.label(i), bool(self.flags[i] & FLAG_SUBITEM)
+
+    def weight(self, i: int) -> int:
+        return self.max_count - self.counts[i]
+
+    def sample(
+        self, k: int = 1, partition: str = "all", rng: random.Random | None = None
+    ) -> list[Item]:
+        """Draw *k* weighted items with replacement from *partition*."""
+        total = self.totals[partition]
+        if not total:
+            return []
+        rng = rng or random
+        cum = self.cum[partition]
+        index = self.index[partition]
+        return [
+            self.item(index[bisect_right(cum, rng.randrange(total))])
+            for _ in range(k)
+        ]
+
+    def probabilities(self, partition: str = "all") -> list[tuple[Item, float]]:
+        total = self.totals[partition]
+        if not total:
+            return []
+        return [
+            (self.item(i), self.weight(i) / total) for i in self.index[partition]
+        ]
+
+    def find(self, item_id: int, is_subitem: bool) -> int | None:
+        """Position of an item, scanning the id array (no index is stored)."""
+        for i in range(self.count):
+            if self.ids[i] == item_id and bool(self.flags[i] & FLAG_SUBITEM) == is_subitem:
+                return i
+        return None
+
+    def release(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mv.release()
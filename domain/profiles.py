@@ -0,0 +1,114 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from data.activity_dao import DEFAULT_PROFILE, ActivityDAO, profile_db_path
+from domain.change_tracking import CandidateIndex
+from domain.suggestion_controller import SuggestionController
+from infrastructure.metrics import Metrics, metrics as default_metrics
+
+
+class UnknownProfileError(LookupError):
+    """A non-default profile whose database does not exist."""
+
+
+class ProfileEntry:
+    """An open profile: its DAO plus the warm in-memory candidate lists."""
+
+    def __init__(self, name: str, dao: ActivityDAO, controller: SuggestionController):
+        self.name = name
+        self.dao = dao
+        self.controller = controller
+        self.data_version: int | None = None
+        self.index = CandidateIndex()
+
+    def refresh(self) -> bool:
+        """Re-read the changed hobbies if another connection committed."""
+        version = self.dao.get_data_version()
+        if version == self.data_version:
+            return False
+        self.index.refresh(self.dao)
+        self.controller.load(*self.index.weighted_items())
+        self.data_version = version
+        return True
+
+    def close(self) -> None:
+        self.dao.conn.close()
+
+
+class ProfileCache:
+    """Bounded LRU of open profile databases.
+
+    Cold profiles are evicted (and their connections closed) once more than
+    *capacity* are open. Hits, misses and evictions are counted in *metrics*
+    under ``profiles.*``. Only the default profile's database is created on
+    demand; other profiles must already exist unless ``get(create=True)``.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 32,
+        is_game_label: Callable[[str], bool] | None = None,
+        metrics: Metrics | None = None,
+        path_for: Callable[[str], str] = profile_db_path,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.is_game_label = is_game_label
+        self.metrics = metrics or default_metrics
+        self.path_for = path_for
+        self._entries: OrderedDict[str, ProfileEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, profile: str | None = None, create: bool = False) -> ProfileEntry:
+        """Return the (refreshed) entry for *profile*, opening it if needed.
+
+        Raises :class:`UnknownProfileError` for a non-default profile without
+        a database unless *create*, so read requests never create files.
+        """
+        name = profile or DEFAULT_PROFILE
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                self.metrics.incr("profiles.hits")
+            else:
+                path = self.path_for(name)
+                if not (create or name == DEFAULT_PROFILE or os.path.exists(path)):
+                    raise UnknownProfileError(f"unknown profile: {name!r}")
+                self.metrics.incr("profiles.misses")
+                dao = ActivityDAO(path, check_same_thread=False)
+                controller = SuggestionController(
+                    is_game_label=self.is_game_label, dao=dao
+                )
+                entry = self._entries[name] = ProfileEntry(name, dao, controller)
+                while len(self._entries) > self.capacity:
+                    _, cold = self._entries.popitem(last=False)
+                    cold.close()
+                    self.metrics.incr("profiles.evictions")
+        return entry
+
+    def __contains__(self, profile: str) -> bool:
+        with self._lock:
+            return profile in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "open": len(self),
+            "capacity": self.capacity,
+            "hits": self.metrics.counter("profiles.hits"),
+            "misses": self.metrics.counter("profiles.misses"),
+            "evictions": self.metrics.counter("profiles.evictions"),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry.close()
+            self._entries.clear()
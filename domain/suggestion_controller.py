@@ -0,0 +1,239 @@
+import random
+from itertools import accumulate
+from typing import Callable
+
+from data.activity_dao import ActivityDAO
+from domain import use_cases
+from domain.packed_candidates import FLAG_GAME, PackedCandidates
+
+Item = tuple[int, str, bool]
+
+
+def item_key(item_id: int, is_subitem: bool) -> str:
+    """Stable textual id: ``s<id>`` for subitems and ``h<id>`` for hobbies."""
+    return f"{'s' if is_subitem else 'h'}{item_id}"
+
+
+def parse_item_key(key: str) -> tuple[int, bool]:
+    """Inverse of :func:`item_key`; raises ``ValueError`` on bad input."""
+    if len(key) < 2 or key[0] not in "sh":
+        raise ValueError(f"invalid item key: {key!r}")
+    return int(key[1:]), key[0] == "s"
+
+
+def partition_name(include_games: bool, games_only: bool) -> str:
+    """Map the two toggle switches to ``all``, ``no_games`` or ``games``."""
+    if not include_games:
+        return "no_games"
+    if games_only:
+        return "games"
+    return "all"
+
+
+def lists_from_packed(
+    packed: PackedCandidates,
+) -> tuple[list[Item], list[int], dict[str, bool]]:
+    """Materialise ``(items, weights, game_labels)`` from a packed buffer."""
+    items: list[Item] = []
+    weights: list[int] = []
+    game_labels: dict[str, bool] = {}
+    for i in range(len(packed)):
+        item = packed.item(i)
+        if item[2]:
+            game_labels[item[1]] = bool(packed.flags[i] & FLAG_GAME)
+        items.append(item)
+        weights.append(packed.weight(i))
+    return items, weights, game_labels
+
+
+class SuggestionController:
+    """Headless state machine behind the "¿Qué hago hoy?" tab.
+
+    Owns the cached weighted item lists, the state of the two game toggles and
+    the activity currently on screen, so suggest → accept cycles can be driven
+    without Tk (tests, CLI, load testing). The Tk layer only renders.
+    """
+
+    def __init__(
+        self,
+        is_game_label: Callable[[str], bool] | None = None,
+        dao: ActivityDAO | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.is_game_label = is_game_label or (lambda label: False)
+        self.dao = dao
+        self.rng = rng or random.Random()
+        self.include_games = True
+        self.games_only = False
+        self.activity_lists: dict[str, tuple[list[Item], list[int]]] = {
+            "all": ([], []),
+            "no_games": ([], []),
+            "games": ([], []),
+        }
+        self.current = {"id": None, "name": None, "is_subitem": False}
+        # (item_id, is_subitem) -> [(list_name, index)] for in-place updates
+        self._positions: dict[tuple[int, bool], list[tuple[str, int]]] = {}
+        self._game_labels: dict[str, bool] = {}
+        self._cum_weights: dict[str, list[int]] = {}
+
+    def is_game(self, item: Item) -> bool:
+        _, label, is_sub = item
+        if not is_sub:
+            return False
+        cached = self._game_labels.get(label)
+        if cached is None:
+            cached = self._game_labels[label] = bool(self.is_game_label(label))
+        return cached
+
+    def rebuild(self) -> None:
+        """Reload the weighted lists from the database.
+
+        The filtered lists share the weights of the full list (the maximum
+        count is computed before filtering), so a single query is enough.
+        """
+        self.load(*use_cases.build_weighted_items(dao=self.dao))
+
+    def load(
+        self,
+        items: list[Item],
+        weights: list[int],
+        game_labels: dict[str, bool] | None = None,
+    ) -> None:
+        """Install already-built weighted lists (e.g. computed off-thread).
+
+        *game_labels* pre-seeds the game classification, as stored in a
+        packed snapshot, so labels are not checked again.
+        """
+        if game_labels:
+            self._game_labels.update(game_labels)
+        games: tuple[list[Item], list[int]] = ([], [])
+        no_games: tuple[list[Item], list[int]] = ([], [])
+        positions: dict[tuple[int, bool], list[tuple[str, int]]] = {}
+        for index, (item, weight) in enumerate(zip(items, weights)):
+            name, target = (
+                ("games", games) if self.is_game(item) else ("no_games", no_games)
+            )
+            positions[(item[0], item[2])] = [
+                ("all", index), (name, len(target[0]))
+            ]
+            target[0].append(item)
+            target[1].append(weight)
+        self._positions = positions
+        self._cum_weights.clear()
+        self.activity_lists["all"] = (items, weights)
+        self.activity_lists["no_games"] = no_games
+        self.activity_lists["games"] = games
+
+    def load_packed(self, packed: PackedCandidates) -> None:
+        """Install the lists stored in a packed buffer (see ``candidate_snapshot``)."""
+        self.load(*lists_from_packed(packed))
+
+    def set_toggles(
+        self, include_games: bool | None = None, games_only: bool | None = None
+    ) -> tuple[bool, bool]:
+        """Update the toggles keeping them consistent, like the switches do."""
+        if include_games is not None:
+            self.include_games = include_games
+        if games_only is not None:
+            self.games_only = games_only
+        if self.games_only:
+            self.include_games = True
+        if not self.include_games:
+            self.games_only = False
+        return self.include_games, self.games_only
+
+    def partition(
+        self, include_games: bool | None = None, games_only: bool | None = None
+    ) -> str:
+        """Name of the list selected by the toggles (current ones by default)."""
+        return partition_name(
+            self.include_games if include_games is None else include_games,
+            self.games_only if games_only is None else games_only,
+        )
+
+    def current_items_weights(self) -> tuple[list[Item], list[int]]:
+        return self.activity_lists[self.partition()]
+
+    def sample(self, k: int = 1, partition: str | None = None) -> list[Item]:
+        """Draw *k* weighted items (with replacement) without changing state."""
+        name = partition or self.partition()
+        items, weights = self.activity_lists[name]
+        if not items:
+            return []
+        cum_weights = self._cum_weights.get(name)
+        if cum_weights is None:
+            cum_weights = self._cum_weights[name] = list(accumulate(weights))
+        return self.rng.choices(items, cum_weights=cum_weights, k=k)
+
+    def suggest(self) -> Item | None:
+        """Pick the next activity and remember it as the current one."""
+        picked = self.sample()
+        if not picked:
+            return None
+        item_id, label, is_sub = picked[0]
+        self.current["id"] = item_id
+        self.current["name"] = label
+        self.current["is_subitem"] = is_sub
+        return picked[0]
+
+    def select(self, item_id: int, is_subitem: bool) -> Item | None:
+        """Make a known item the current one, as if it had been suggested."""
+        positions = self._positions.get((item_id, is_subitem))
+        if not positions:
+            return None
+        item = self.activity_lists["all"][0][positions[0][1]]
+        self.current["id"], self.current["name"], self.current["is_subitem"] = item
+        return item
+
+    def accept(self) -> Item | None:
+        """Mark the current activity as done, update the weights and clear it.
+
+        Returns the accepted item, or ``None`` when nothing was suggested.
+        """
+        if not self.current["id"]:
+            return None
+        accepted = (
+            self.current["id"], self.current["name"], self.current["is_subitem"]
+        )
+        use_cases.mark_activity_as_done(accepted[0], accepted[2], dao=self.dao)
+        self.clear_current()
+        if not self._bump_weight((accepted[0], accepted[2])):
+            self.rebuild()
+        return accepted
+
+    def _bump_weight(self, key: tuple[int, bool]) -> bool:
+        """Apply one accepted count to the cached weights without a reload.
+
+        ``weight = max_count - count``: the accepted item loses one unit of
+        weight unless it already had the top count (weight 1), in which case
+        the maximum grows and every *other* item gains one unit instead.
+        """
+        positions = self._positions.get(key)
+        if not positions:
+            return False
+        self._cum_weights.clear()
+        _, all_index = positions[0]
+        all_weights = self.activity_lists["all"][1]
+        if all_weights[all_index] > 1:
+            for name, index in positions:
+                self.activity_lists[name][1][index] -= 1
+            return True
+        for name in ("all", "no_games", "games"):
+            weights = self.activity_lists[name][1]
+            for i in range(len(weights)):
+                weights[i] += 1
+        for name, index in positions:
+            self.activity_lists[name][1][index] -= 1
+        return True
+
+    def clear_current(self) -> None:
+        self.current["id"] = None
+        self.current["name"] = None
+        self.current["is_subitem"] = False
+
+    def probabilities(self, partition: str | None = None) -> list[tuple[Item, float]]:
+        items, weights = self.activity_lists[partition or self.partition()]
+        total_weight = sum(weights)
+        if not total_weight:
+            return []
+        return [(item, weight / total_weight) for item, weight in zip(items, weights)]
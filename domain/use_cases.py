@@ -1,31 +1,85 @@
+import os
 import random
 from typing import Callable, Tuple
 from data.activity_dao import ActivityDAO
+from domain.caches import DB_CANDIDATES, PROBABILITIES, invalidates
 
-dao = ActivityDAO()
+# La conexión se abre en el primer uso, no al importar el módulo
+_dao: ActivityDAO | None = None
 
 
-def _build_weighted_items(
-    filter_func: Callable[[Tuple[int, str, bool, int]], bool] | None = None,
-):
-    """Return hobby items alongside their selection weights.
+def get_dao() -> ActivityDAO:
+    """Return the shared DAO, opening the database on first use.
 
-    The optional *filter_func* receives tuples of
-    ``(item_id, label, is_subitem, accepted_count)`` and should return ``True``
-    to keep the item in the result.
+    With ``HOBBYPICKER_IN_MEMORY=<seconds>`` the database is served from RAM
+    and copied back to disk every that many seconds (``0``: only at exit).
     """
+    global _dao
+    if _dao is None:
+        window = os.environ.get("HOBBYPICKER_IN_MEMORY")
+        if window:
+            from data.memory_dao import InMemoryActivityDAO
+
+            _dao = InMemoryActivityDAO(backup_interval=float(window))
+        else:
+            _dao = ActivityDAO()
+    return _dao
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `use_cases.dao` sigue funcionando, pero de forma perezosa
+    if name == "dao":
+        return get_dao()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _resolve_dao(override: ActivityDAO | None) -> ActivityDAO:
+    return override if override is not None else get_dao()
+
+
+def collect_candidates(dao: ActivityDAO | None = None) -> list[Tuple[int, str, bool, int]]:
+    """Return every suggestible item as ``(item_id, label, is_subitem, count)``.
+
+    Hobbies with subitems contribute one entry per subitem; hobbies without
+    subitems contribute themselves.
+    """
+    dao = _resolve_dao(dao)
     activities = dao.get_all_with_counts()
     if not activities:
-        return [], []
+        return []
+
+    # Una sola consulta para todos los subelementos en lugar de una por hobby
+    subitems_by_activity: dict[int, list] = {}
+    for sub in dao.get_all_subitems():
+        subitems_by_activity.setdefault(sub[1], []).append(sub)
 
     temp_items: list[Tuple[int, str, bool, int]] = []
     for hobby_id, name, act_count in activities:
-        subitems = dao.get_subitems_by_activity(hobby_id)
-        if subitems:
-            for sub_id, _, sub_name, sub_count in subitems:
-                temp_items.append((sub_id, f"{name} + {sub_name}", True, sub_count))
-        else:
-            temp_items.append((hobby_id, name, False, act_count))
+        temp_items += hobby_candidates(
+            hobby_id, name, act_count, subitems_by_activity.get(hobby_id)
+        )
+    return temp_items
+
+
+def hobby_candidates(
+    hobby_id: int, name: str, count: int, subitems: list | None
+) -> list[Tuple[int, str, bool, int]]:
+    """Candidate rows contributed by one hobby (its subitems, or itself)."""
+    if subitems:
+        return [
+            (sub_id, f"{name} + {sub_name}", True, sub_count)
+            for sub_id, _, sub_name, sub_count in subitems
+        ]
+    return [(hobby_id, name, False, count)]
+
+
+def weigh_candidates(
+    temp_items: list[Tuple[int, str, bool, int]],
+    filter_func: Callable[[Tuple[int, str, bool, int]], bool] | None = None,
+):
+    """Turn candidate rows into ``(items, weights)``: ``max(count) + 1 - count``."""
+    if not temp_items:
+        return [], []
 
     max_count = max(item[3] for item in temp_items) + 1
     items: list[tuple[int, str, bool]] = []
@@ -39,8 +93,22 @@ def _build_weighted_items(
     return items, weights
 
 
+def _build_weighted_items(
+    filter_func: Callable[[Tuple[int, str, bool, int]], bool] | None = None,
+    dao: ActivityDAO | None = None,
+):
+    """Return hobby items alongside their selection weights.
+
+    The optional *filter_func* receives tuples of
+    ``(item_id, label, is_subitem, accepted_count)`` and should return ``True``
+    to keep the item in the result. *dao* defaults to the module-level DAO.
+    """
+    return weigh_candidates(collect_candidates(dao), filter_func)
+
+
 def build_weighted_items(
     filter_func: Callable[[Tuple[int, str, bool, int]], bool] | None = None,
+    dao: ActivityDAO | None = None,
 ):
     """Public wrapper to obtain weighted item lists.
 
@@ -48,7 +116,7 @@ def build_weighted_items(
     resulting `(items, weights)` tuples and reuse them without hitting the
     database repeatedly.
     """
-    return _build_weighted_items(filter_func)
+    return _build_weighted_items(filter_func, dao)
 
 
 def get_weighted_random_valid_activity(
@@ -59,36 +127,62 @@ def get_weighted_random_valid_activity(
         return None
     return random.choices(items, weights=weights, k=1)[0]
 
-def mark_activity_as_done(item_id, is_subitem):
+# SuggestionController.accept ajusta sus listas en el sitio: sólo cambian
+# las probabilidades mostradas, no hace falta releer los candidatos
+@invalidates(PROBABILITIES)
+def mark_activity_as_done(item_id, is_subitem, dao: ActivityDAO | None = None):
+    dao = _resolve_dao(dao)
     if is_subitem:
         dao.increment_subitem_accepted_count(item_id)
     else:
         dao.increment_accepted_count(item_id)
 
+@invalidates(DB_CANDIDATES)
 def create_hobby(name):
-    return dao.insert_activity(name)
+    return get_dao().insert_activity(name)
 
+@invalidates(DB_CANDIDATES)
 def add_subitem_to_hobby(hobby_id, item_name):
-    dao.insert_subitem(hobby_id, item_name)
+    get_dao().insert_subitem(hobby_id, item_name)
+
+@invalidates(DB_CANDIDATES)
+def add_subitems_to_hobby(hobby_id, item_names, dao: ActivityDAO | None = None) -> int:
+    """Bulk insert used by the library imports; one transaction per batch."""
+    return _resolve_dao(dao).insert_subitems(hobby_id, item_names)
 
 def get_all_hobbies():
-    return dao.get_all_activities()
+    return get_dao().get_all_activities()
 
 def get_subitems_for_hobby(hobby_id):
-    return dao.get_subitems_by_activity(hobby_id)
+    return get_dao().get_subitems_by_activity(hobby_id)
 
+@invalidates(DB_CANDIDATES)
 def delete_subitem(subitem_id):
-    dao.delete_subitem(subitem_id)
+    get_dao().delete_subitem(subitem_id)
 
+@invalidates(DB_CANDIDATES)
 def delete_hobby(hobby_id):
-    dao.delete_activity(hobby_id)
+    get_dao().delete_activity(hobby_id)
 
+@invalidates(DB_CANDIDATES)
 def update_subitem(subitem_id, new_name):
-    dao.update_subitem(subitem_id, new_name)
+    get_dao().update_subitem(subitem_id, new_name)
 
 
+@invalidates(DB_CANDIDATES)
 def reset_counts():
-    dao.reset_counts()
+    get_dao().reset_counts()
+
+
+def get_count_summary(dao: ActivityDAO | None = None) -> dict[str, int]:
+    hobbies, subitems, hobby_accepts, subitem_accepts = _resolve_dao(
+        dao
+    ).get_count_summary()
+    return {
+        "hobbies": hobbies,
+        "subitems": subitems,
+        "accepted": hobby_accepts + subitem_accepts,
+    }
 
 
 def get_activity_probabilities(
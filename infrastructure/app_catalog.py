@@ -0,0 +1,201 @@
+"""Offline Steam app catalog for name → appid resolution.
+
+A Steam app-list dump (``ISteamApps/GetAppList/v2`` or
+``IStoreService/GetAppList`` JSON, or a plain ``[{"appid", "name"}]`` list)
+is imported into ``<db>.appcatalog``. Each name is stored with a normalized
+form (casefolded, punctuation and symbols such as ™ removed, Roman numerals
+II–IX written as digits) under an index, so a lookup is an indexed equality
+match. Names that differ by more than that ("Witcher 3 Wild Hunt" vs
+"The Witcher® 3: Wild Hunt") go through an FTS5 index: the rows sharing the
+query's words are ranked and the closest by :class:`difflib.SequenceMatcher`
+is accepted above :data:`FUZZY_CUTOFF`, but only if it carries the same
+numbers. Otherwise "Hades II" would resolve to Hades whenever the sequel is
+newer than the dump; such names fall through to the community search.
+SQLite builds without FTS5 fall back to a prefix range on the normalized
+name.
+
+With a catalog imported, the community search is only needed for games
+newer than the dump.
+"""
+
+import difflib
+import json
+import re
+import sqlite3
+import threading
+from typing import IO, Any, Iterable, Iterator
+
+from infrastructure.metrics import metrics
+
+CATALOG_SUFFIX = ".appcatalog"
+FUZZY_CUTOFF = 0.8
+FUZZY_CANDIDATES = 50
+IMPORT_BATCH = 10000
+
+_WORD = re.compile(r"[^\W_]+")
+_NUMBER = re.compile(r"\d+")
+# "III" y "3" deben coincidir; I y X se quedan (Mega Man X no es Mega Man 10)
+_ROMAN = {"ii": "2", "iii": "3", "iv": "4", "v": "5", "vi": "6", "vii": "7", "viii": "8", "ix": "9"}
+
+
+def normalize_name(name: str) -> str:
+    return "".join(_ROMAN.get(word, word) for word in _WORD.findall(name.casefold()))
+
+
+def iter_dump_apps(data: Any) -> Iterator[tuple[int, str]]:
+    """``(appid, name)`` pairs from any of the supported dump layouts."""
+    if isinstance(data, dict):
+        data = (data.get("applist") or data.get("response") or {}).get("apps", [])
+    for app in data or []:
+        try:
+            appid, name = int(app["appid"]), app["name"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if isinstance(name, str) and name.strip():
+            yield appid, name.strip()
+
+
+class AppCatalog:
+    """Indexed ``apps(appid, name, norm)`` table; thread-safe behind a lock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS apps (
+                    appid INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    norm TEXT NOT NULL
+                )
+                """
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_apps_norm ON apps(norm)")
+            try:
+                self.conn.execute(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS apps_fts USING fts5(
+                        name, content='apps', content_rowid='appid',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                    """
+                )
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite compilado sin FTS5: se usa el prefijo del nombre normalizado
+                self.has_fts = False
+        (self.size,) = self.conn.execute("SELECT COUNT(*) FROM apps").fetchone()
+
+    def import_apps(self, apps: Iterable[tuple[int, str]]) -> int:
+        """Replace the catalog with *apps*; returns the number of rows stored."""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM apps")
+            batch: list[tuple[int, str, str]] = []
+            for appid, name in apps:
+                batch.append((appid, name, normalize_name(name)))
+                if len(batch) >= IMPORT_BATCH:
+                    self.conn.executemany("INSERT OR REPLACE INTO apps VALUES (?, ?, ?)", batch)
+                    batch = []
+            self.conn.executemany("INSERT OR REPLACE INTO apps VALUES (?, ?, ?)", batch)
+            if self.has_fts:
+                self.conn.execute("INSERT INTO apps_fts(apps_fts) VALUES ('rebuild')")
+            (self.size,) = self.conn.execute("SELECT COUNT(*) FROM apps").fetchone()
+        return self.size
+
+    def import_dump(self, source: str | IO) -> int:
+        """Import a JSON dump from a path or an open file."""
+        if isinstance(source, str):
+            with open(source, encoding="utf-8") as fh:
+                data = json.load(fh)
+        else:
+            data = json.load(source)
+        return self.import_apps(iter_dump_apps(data))
+
+    def lookup(self, name: str, fuzzy: bool = True) -> int | None:
+        """Appid for *name*: exact normalized match first, then the closest."""
+        norm = normalize_name(name)
+        if not norm or not self.size:
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MIN(appid) FROM apps WHERE norm = ?", (norm,)
+            ).fetchone()
+            if row[0] is not None:
+                metrics.incr("app_catalog.exact")
+                return row[0]
+            if not fuzzy:
+                return None
+            appid = self._closest(name, norm)
+        metrics.incr("app_catalog.fuzzy" if appid is not None else "app_catalog.miss")
+        return appid
+
+    def _closest(self, name: str, norm: str) -> int | None:
+        matcher = difflib.SequenceMatcher(b=norm, autojunk=False)
+        # Números de la entrega (los romanos ya van como dígitos en norm)
+        numbers = _NUMBER.findall(norm)
+        for candidates in self._candidates(name, norm):
+            # (similitud, -appid): a igual similitud gana el appid más antiguo
+            best: tuple[float, int] | None = None
+            for appid, other in candidates:
+                if _NUMBER.findall(other) != numbers:
+                    continue
+                matcher.set_seq1(other)
+                if matcher.real_quick_ratio() < FUZZY_CUTOFF or matcher.quick_ratio() < FUZZY_CUTOFF:
+                    continue
+                ratio = matcher.ratio()
+                if ratio >= FUZZY_CUTOFF and (best is None or (ratio, -appid) > best):
+                    best = (ratio, -appid)
+            if best is not None:
+                return -best[1]
+        return None
+
+    def _candidates(self, name: str, norm: str) -> Iterator[list[tuple[int, str]]]:
+        """Candidate ``(appid, norm)`` rows, narrowest query first."""
+        if not self.has_fts:
+            prefix = norm[:4]
+            yield self.conn.execute(
+                "SELECT appid, norm FROM apps WHERE norm >= ? AND norm < ? LIMIT ?",
+                (prefix, prefix + "\U0010ffff", FUZZY_CANDIDATES * 10),
+            ).fetchall()
+            return
+        words = _WORD.findall(name.casefold())
+        # Los números se comprueban aparte y en el índice pueden ir como "3"
+        # o como "III"; además "ii" o "2" coinciden con miles de filas
+        words = [w for w in words if not (w.isdigit() or w in _ROMAN)] or words
+        words = [f'"{word}"' for word in words]
+        if not words:
+            return
+        # Primero todas las palabras; si no basta, cualquiera de ellas
+        queries = [" ".join(words)]
+        if len(words) > 1:
+            queries.append(" OR ".join(words))
+        for query in queries:
+            yield self.conn.execute(
+                """
+                SELECT apps.appid, apps.norm FROM apps_fts
+                JOIN apps ON apps.appid = apps_fts.rowid
+                WHERE apps_fts MATCH ? ORDER BY rank LIMIT ?
+                """,
+                (query, FUZZY_CANDIDATES),
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+_default: AppCatalog | None = None
+_default_lock = threading.Lock()
+
+
+def default_catalog() -> AppCatalog:
+    """Process-wide catalog next to the application database."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from data.activity_dao import DB_PATH
+
+            _default = AppCatalog(DB_PATH + CATALOG_SUFFIX)
+        return _default
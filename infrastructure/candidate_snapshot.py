@@ -0,0 +1,156 @@
+"""Persisted snapshot of the packed candidate set, stored next to the DB.
+
+``<db>.candidates`` holds a small header describing the database state it was
+built from, followed by a :mod:`domain.packed_candidates` buffer. It is opened
+with ``mmap`` so a warm start can sample without querying SQLite and without
+creating per-item objects.
+
+``PRAGMA data_version`` is only meaningful within one connection, so the
+header records its persistent equivalents instead: size and mtime of the DB
+(and of its WAL, if any) plus the file change counter and schema cookie from
+the SQLite file header. Any mismatch, or a different ``SNAPSHOT_VERSION``,
+makes the snapshot stale.
+"""
+
+import mmap
+import os
+import struct
+from typing import Callable, Iterable
+
+from domain.packed_candidates import PackedCandidates, pack_candidates
+from infrastructure.metrics import metrics
+
+SNAPSHOT_SUFFIX = ".candidates"
+# Súbelo si cambia el formato empaquetado o la regla que marca los juegos
+SNAPSHOT_VERSION = 1
+_MAGIC = b"HPSS"
+
+# magic, version, reserved, db mtime_ns, db size, change counter,
+# schema cookie, wal mtime_ns, wal size (48 bytes, keeps the payload aligned)
+_SNAPSHOT = struct.Struct("=4sHHqqIIqq")
+# file change counter at offset 24 and schema cookie at offset 40
+_SQLITE_HEADER = struct.Struct(">24xI12xI")
+
+Fingerprint = tuple[int, int, int, int, int, int]
+
+
+def snapshot_path(db_path: str) -> str:
+    return db_path + SNAPSHOT_SUFFIX
+
+
+def db_fingerprint(db_path: str) -> Fingerprint | None:
+    """Identify the current state of *db_path*, or ``None`` if it is missing."""
+    try:
+        stat = os.stat(db_path)
+        with open(db_path, "rb") as fh:
+            header = fh.read(_SQLITE_HEADER.size)
+    except OSError:
+        return None
+    if len(header) < _SQLITE_HEADER.size:
+        return None
+    counter, cookie = _SQLITE_HEADER.unpack(header)
+    try:
+        wal = os.stat(db_path + "-wal")
+        wal_state = (wal.st_mtime_ns, wal.st_size)
+    except OSError:
+        wal_state = (0, 0)
+    return (stat.st_mtime_ns, stat.st_size, counter, cookie, *wal_state)
+
+
+class CandidateSnapshot:
+    """A :class:`PackedCandidates` view plus whatever keeps its buffer alive."""
+
+    def __init__(self, packed: PackedCandidates, mapping: mmap.mmap | None = None):
+        self.packed = packed
+        self._mapping = mapping
+
+    def close(self) -> None:
+        self.packed.release()
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self) -> "CandidateSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_snapshot(db_path: str) -> CandidateSnapshot | None:
+    """Map the snapshot of *db_path* if it is still fresh, else ``None``."""
+    fingerprint = db_fingerprint(db_path)
+    if fingerprint is None:
+        return None
+    try:
+        with open(snapshot_path(db_path), "rb") as fh:
+            mapping = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # no existe, o está vacío (mmap no admite longitud cero)
+        return None
+    try:
+        if len(mapping) >= _SNAPSHOT.size:
+            magic, version, _, *stored = _SNAPSHOT.unpack_from(mapping, 0)
+            if magic == _MAGIC and version == SNAPSHOT_VERSION and tuple(stored) == fingerprint:
+                view = memoryview(mapping)
+                try:
+                    packed = PackedCandidates(view[_SNAPSHOT.size:])
+                finally:
+                    view.release()
+                return CandidateSnapshot(packed, mapping)
+    except ValueError:
+        pass
+    mapping.close()
+    return None
+
+
+def write_snapshot(db_path: str, fingerprint: Fingerprint, payload: bytes) -> bool:
+    """Atomically replace the snapshot; returns ``False`` if it could not be written."""
+    path = snapshot_path(db_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(_SNAPSHOT.pack(_MAGIC, SNAPSHOT_VERSION, 0, *fingerprint))
+            fh.write(payload)
+        os.replace(tmp, path)
+    except OSError:
+        # p. ej. en Windows si otro proceso aún tiene el fichero mapeado
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_or_build(
+    db_path: str,
+    rows: Callable[[], Iterable[tuple[int, str, bool, int]]],
+    is_game_label: Callable[[str], bool] | None = None,
+) -> CandidateSnapshot:
+    """Return the fresh snapshot, rebuilding it from *rows* when stale.
+
+    *rows* is only called on a miss, so callers can defer opening the DAO.
+    Hits and misses are counted under ``snapshot.*``.
+    """
+    snapshot = load_snapshot(db_path)
+    if snapshot is not None:
+        metrics.incr("snapshot.hits")
+        return snapshot
+    metrics.incr("snapshot.misses")
+    # La huella se toma antes de leer: si la BD cambia entretanto, el
+    # snapshot queda marcado como antiguo en lugar de parecer vigente
+    fingerprint = db_fingerprint(db_path)
+    payload = pack_candidates(rows(), is_game_label)
+    if fingerprint is not None:
+        write_snapshot(db_path, fingerprint, payload)
+    return CandidateSnapshot(PackedCandidates(payload))
+
+
+def refresh_snapshot(
+    db_path: str,
+    rows: Callable[[], Iterable[tuple[int, str, bool, int]]],
+    is_game_label: Callable[[str], bool] | None = None,
+) -> None:
+    """Rewrite the snapshot after the DB changed (cheap no-op when fresh)."""
+    load_or_build(db_path, rows, is_game_label).close()
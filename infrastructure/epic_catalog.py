@@ -0,0 +1,79 @@
+"""Game names from the Epic launcher's CatalogCache, parsed in parallel.
+
+The cache can hold thousands of large JSON files and only one field of each
+matters. Files are listed up front and split into chunks that worker
+processes parse independently, sending back just the names. Before decoding,
+each file's bytes are checked for one of the name keys, so files that cannot
+contribute a name are never parsed. Small caches are read in-process, where
+starting a pool would cost more than it saves.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+CATALOG_PATTERN = "*.json"
+# Mismo orden de preferencia que la importación original
+NAME_KEYS = ("displayName", "DisplayName", "title")
+_NEEDLES = tuple(f'"{key}"'.encode() for key in NAME_KEYS)
+CHUNK_SIZE = 64
+# Por debajo de esto arrancar procesos cuesta más de lo que se ahorra
+PARALLEL_THRESHOLD = 256
+
+
+def names_from_files(paths: list[str]) -> list[str]:
+    """Display names found in *paths*; runs inside the worker processes."""
+    names: list[str] = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except OSError:
+            continue
+        if not any(needle in data for needle in _NEEDLES):
+            continue
+        try:
+            entry = json.loads(data.decode("utf-8", errors="ignore"))
+        except ValueError:
+            continue
+        if not isinstance(entry, dict):
+            continue
+        name = next((entry[key] for key in NAME_KEYS if entry.get(key)), None)
+        if isinstance(name, str):
+            names.append(name)
+    return names
+
+
+def list_catalog_files(directories: Iterable[Path]) -> list[str]:
+    files: list[str] = []
+    for directory in directories:
+        try:
+            files.extend(str(path) for path in Path(directory).glob(CATALOG_PATTERN))
+        except OSError:
+            continue
+    return files
+
+
+def scan_catalog_names(
+    directories: Iterable[Path],
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    threshold: int = PARALLEL_THRESHOLD,
+) -> Iterator[str]:
+    """Yield the display names in the catalog *directories*, in file order."""
+    files = list_catalog_files(directories)
+    workers = workers or os.cpu_count() or 1
+    if len(files) < threshold or workers < 2:
+        yield from names_from_files(files)
+        return
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+    # spawn también en Linux: se llama desde un hilo de la interfaz y hacer
+    # fork de un proceso con varios hilos puede heredar bloqueos tomados
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), mp_context=context) as pool:
+        for names in pool.map(names_from_files, chunks):
+            yield from names
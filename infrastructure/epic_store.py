@@ -0,0 +1,80 @@
+"""Epic Games library paging.
+
+:func:`iter_library_pages` walks the library service's ``nextCursor`` chain
+as a generator, always fetching the next page in the background while the
+caller handles the current one. A page that fails is retried from its own
+cursor; when retries run out, :class:`LibraryPageError` carries that cursor
+so a later import can resume there instead of starting over (everything
+before it has already been handed to the caller).
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from infrastructure import http_client
+
+LIBRARY_URL = "https://library-service.live.use1a.on.epicgames.com/library/api/public/items"
+
+Page = tuple[list[str], str | None]
+
+
+class LibraryPageError(Exception):
+    """A library page could not be fetched; resume from :attr:`cursor`."""
+
+    def __init__(self, cursor: str | None, cause: Exception):
+        super().__init__(f"library page at cursor {cursor!r} failed: {cause}")
+        self.cursor = cursor
+
+
+def fetch_library_page(
+    token: str, cursor: str | None = None, url: str = LIBRARY_URL, timeout: float = 5.0
+) -> Page:
+    """Titles on one library page and the cursor of the next (``None`` at the end)."""
+    params = {"includeMetadata": "true"}
+    if cursor:
+        params["cursor"] = cursor
+    resp = http_client.get(
+        url, params=params, headers={"Authorization": f"Bearer {token}"}, timeout=timeout
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    titles = [e["title"] for e in data.get("records", []) if e.get("title")]
+    return titles, data.get("responseMetadata", {}).get("nextCursor") or None
+
+
+def iter_library_pages(
+    token: str,
+    cursor: str | None = None,
+    fetch_page: Callable[[str, str | None], Page] = fetch_library_page,
+    retries: int = 2,
+    backoff: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Page]:
+    """Yield ``(titles, next_cursor)`` page by page, starting at *cursor*.
+
+    The request for page N+1 is in flight while the caller processes page
+    N. Raises :class:`LibraryPageError` once a page has failed *retries*
+    extra times.
+    """
+
+    def fetch(page_cursor: str | None) -> Page:
+        for attempt in range(retries + 1):
+            try:
+                return fetch_page(token, page_cursor)
+            except Exception as exc:
+                if attempt == retries:
+                    raise LibraryPageError(page_cursor, exc) from exc
+                sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+    # Un solo hilo basta: sólo hay una página por delante en vuelo
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        pending = pool.submit(fetch, cursor)
+        while pending is not None:
+            titles, next_cursor = pending.result()
+            pending = pool.submit(fetch, next_cursor) if next_cursor else None
+            yield titles, next_cursor
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
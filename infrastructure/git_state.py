@@ -0,0 +1,148 @@
+"""Read git repository state straight from ``.git`` without spawning ``git``.
+
+Covers what the launcher needs: current branch, its upstream, and the SHAs
+of ``HEAD`` and remote-tracking refs (loose refs and ``packed-refs``, plus
+``.git`` files used by worktrees). Only the dirty check still shells out,
+as a single ``git status --porcelain`` call.
+"""
+
+import re
+import subprocess
+from pathlib import Path
+
+_SECTION = re.compile(r'^\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+
+
+def find_git_dir(start: str | Path) -> tuple[Path, Path] | None:
+    """Return ``(work_tree, git_dir)`` for the repository containing *start*."""
+    current = Path(start).resolve()
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            text = dot_git.read_text(encoding="utf-8", errors="ignore").strip()
+            if text.startswith("gitdir:"):
+                git_dir = Path(text[len("gitdir:"):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = (directory / git_dir).resolve()
+                return directory, git_dir
+    return None
+
+
+def _common_dir(git_dir: Path) -> Path:
+    """Directory holding shared refs/config (differs from *git_dir* in worktrees)."""
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        path = Path(commondir.read_text(encoding="utf-8").strip())
+        return path if path.is_absolute() else (git_dir / path).resolve()
+    return git_dir
+
+
+def _packed_refs(common_dir: Path) -> dict[str, str]:
+    refs: dict[str, str] = {}
+    try:
+        lines = (common_dir / "packed-refs").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return refs
+    for line in lines:
+        if not line or line[0] in "#^":
+            continue
+        sha, _, name = line.partition(" ")
+        refs[name.strip()] = sha
+    return refs
+
+
+def resolve_ref(git_dir: Path, ref: str, _depth: int = 0) -> str | None:
+    """SHA for a full ref name (``HEAD``, ``refs/heads/main``…), or ``None``."""
+    if _depth > 5:
+        return None
+    common = _common_dir(git_dir)
+    for base in (git_dir, common) if ref == "HEAD" else (common, git_dir):
+        try:
+            text = (base / ref).read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+        if text.startswith("ref:"):
+            return resolve_ref(git_dir, text[4:].strip(), _depth + 1)
+        return text or None
+    return _packed_refs(common).get(ref)
+
+
+def read_head(git_dir: Path) -> tuple[str | None, str | None]:
+    """Return ``(branch, sha)``; *branch* is ``None`` on a detached HEAD."""
+    try:
+        text = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None, None
+    if text.startswith("ref:"):
+        ref = text[4:].strip()
+        branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        return branch, resolve_ref(git_dir, ref)
+    return None, text or None
+
+
+def read_config(git_dir: Path) -> dict[str, dict[str, str]]:
+    """Parse ``config`` into ``{"branch.main": {"remote": "origin", …}}``."""
+    sections: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    try:
+        lines = (_common_dir(git_dir) / "config").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return sections
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        match = _SECTION.match(line)
+        if match:
+            name = match.group(1).lower()
+            if match.group(2) is not None:
+                name += "." + match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+            current = sections.setdefault(name, {})
+            continue
+        if current is None:
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip() if sep else "true"
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            value = value[1:-1]
+        current[key.strip().lower()] = value
+    return sections
+
+
+def read_upstream(git_dir: Path, branch: str | None) -> str:
+    """Short upstream name (``origin/main``) of *branch*, or ``""``."""
+    if not branch:
+        return ""
+    section = read_config(git_dir).get(f"branch.{branch}", {})
+    remote, merge = section.get("remote"), section.get("merge")
+    if not remote or not merge:
+        return ""
+    short = merge[len("refs/heads/"):] if merge.startswith("refs/heads/") else merge
+    return short if remote == "." else f"{remote}/{short}"
+
+
+def read_git_state(repo_root: str | Path, remote_ref: str = "origin/main") -> dict | None:
+    """Branch, upstream and SHAs of ``HEAD`` and *remote_ref* for *repo_root*."""
+    found = find_git_dir(repo_root)
+    if found is None:
+        return None
+    work_tree, git_dir = found
+    branch, head = read_head(git_dir)
+    return {
+        "work_tree": str(work_tree),
+        "branch": branch,
+        "upstream": read_upstream(git_dir, branch),
+        "head": head,
+        "remote_head": resolve_ref(git_dir, f"refs/remotes/{remote_ref}"),
+    }
+
+
+def is_dirty(repo_root: str | Path) -> bool:
+    """Whether tracked files have staged or unstaged changes (one ``git`` call)."""
+    out = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=no"],
+        cwd=repo_root, capture_output=True, text=True, check=True,
+    ).stdout
+    return bool(out.strip())
@@ -0,0 +1,147 @@
+"""Shared HTTP client for the Steam and Epic calls.
+
+One ``requests.Session`` per process keeps TCP/TLS connections alive between
+calls; its pool is sized for the concurrent resolvers in
+:mod:`infrastructure.steam_store`. urllib3 only retries failed connections,
+with exponential backoff; 429 and 5xx answers are returned as they are and
+retried by the callers (the store resolvers take a token-bucket slot per
+attempt, the Epic library retries each page), so one lookup is never retried
+by two layers at once. ``conditional=True`` requests
+revalidate with ``If-None-Match``/``If-Modified-Since`` and reuse the body
+of the previous answer on ``304``. Latency, request and error counts are
+recorded per host in :mod:`infrastructure.metrics`.
+
+``requests`` is imported lazily: nothing here runs at application start.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from infrastructure.metrics import Metrics, metrics as default_metrics
+
+DEFAULT_TIMEOUT = 10.0
+# Conexiones por host; debe cubrir los hilos de steam_store.resolve_app_types
+POOL_MAXSIZE = 16
+POOL_HOSTS = 4
+RETRIES = 3
+BACKOFF = 0.5
+# Respuestas guardadas para revalidar con ETag / Last-Modified
+MAX_VALIDATED = 256
+
+
+class HttpClient:
+    """Pooled session with retries, conditional GETs and per-host metrics."""
+
+    def __init__(
+        self,
+        pool_maxsize: int = POOL_MAXSIZE,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        metrics: Metrics | None = None,
+    ):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.metrics = metrics or default_metrics
+        # Sin status_forcelist ni Retry-After: los códigos HTTP los reintentan
+        # los llamantes, que ya tienen su propio bucle
+        retry = Retry(
+            total=retries,
+            read=False,
+            status=0,
+            backoff_factor=backoff,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_HOSTS, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._validated: OrderedDict = OrderedDict()
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        conditional: bool = False,
+        stream: bool = False,
+    ):
+        """GET *url*; with *conditional*, an unchanged resource is not re-downloaded.
+
+        With *stream* the body is left on the socket for ``iter_content``
+        (close the response when done); it cannot be combined with
+        *conditional*, which has to keep the whole body.
+        """
+        import requests
+
+        if stream and conditional:
+            raise ValueError("a streamed response cannot be revalidated")
+        headers = dict(headers or {})
+        key = cached = None
+        if conditional:
+            key = requests.Request("GET", url, params=params).prepare().url
+            with self._lock:
+                cached = self._validated.get(key)
+            if cached is not None:
+                if cached.headers.get("ETag"):
+                    headers["If-None-Match"] = cached.headers["ETag"]
+                if cached.headers.get("Last-Modified"):
+                    headers["If-Modified-Since"] = cached.headers["Last-Modified"]
+
+        host = urlsplit(url).hostname or "unknown"
+        start = time.perf_counter()
+        try:
+            resp = self.session.get(
+                url, params=params, headers=headers, timeout=timeout, stream=stream
+            )
+        except requests.RequestException:
+            self.metrics.incr(f"http.{host}.errors")
+            raise
+        finally:
+            self.metrics.observe(f"http.{host}.latency_ms", (time.perf_counter() - start) * 1000)
+        self.metrics.incr(f"http.{host}.requests")
+
+        if conditional:
+            if resp.status_code == 304 and cached is not None:
+                self.metrics.incr(f"http.{host}.not_modified")
+                return cached
+            if resp.status_code == 200 and (
+                resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+            ):
+                resp.content  # se lee ya para poder reutilizarlo
+                with self._lock:
+                    self._validated[key] = resp
+                    self._validated.move_to_end(key)
+                    while len(self._validated) > MAX_VALIDATED:
+                        self._validated.popitem(last=False)
+        return resp
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default: HttpClient | None = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    """Process-wide client; created on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
+
+
+def get(url: str, **kwargs):
+    """:meth:`HttpClient.get` on the shared client."""
+    return default_client().get(url, **kwargs)
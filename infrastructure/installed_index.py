@@ -0,0 +1,211 @@
+"""Persisted index of installed games, built from launcher manifests.
+
+Steam keeps one ``appmanifest_<id>.acf`` per installed game and Epic one
+``*.item`` JSON per install. Parsing all of them on every rescan costs
+O(total bytes); this index stores, per manifest path, its mtime and size and
+the fields parsed from it in ``<db>.installed``. A rescan lists the
+directories, stats each manifest and only re-reads the ones that are new or
+changed, then drops the rows of manifests that disappeared.
+
+Rows are ``(name, ref)``; ``ref`` is ``None`` for a manifest that names a
+game but gives no way to launch it (an Epic ``.item`` without ``AppName``).
+Those still count for the library import, while the "installed" lookups
+skip them.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterable
+
+from infrastructure.metrics import metrics
+
+INSTALLED_SUFFIX = ".installed"
+STEAM_PATTERN = "appmanifest_*.acf"
+EPIC_PATTERN = "*.item"
+
+# (nombre visible, referencia para lanzarlo o None) o None si no sirve
+Parsed = tuple[str, str | None] | None
+# Sube cuando cambia lo que extrae un parser: obliga a releer lo descartado
+SCHEMA_VERSION = 1
+
+_STEAM_APPID = re.compile(r'"appid"\s*"(\d+)"')
+_STEAM_NAME = re.compile(r'"name"\s*"([^\"]+)"')
+
+
+def parse_steam_manifest(text: str) -> Parsed:
+    appid, name = _STEAM_APPID.search(text), _STEAM_NAME.search(text)
+    if appid and name:
+        return name.group(1), appid.group(1)
+    return None
+
+
+def parse_epic_manifest(text: str) -> Parsed:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    display, appname = data.get("DisplayName"), data.get("AppName")
+    if display and isinstance(display, str):
+        return display, appname or None
+    return None
+
+
+PARSERS: dict[str, tuple[str, Callable[[str], Parsed]]] = {
+    "steam": (STEAM_PATTERN, parse_steam_manifest),
+    "epic": (EPIC_PATTERN, parse_epic_manifest),
+}
+
+
+class InstalledIndex:
+    """Manifest rows per launcher; thread-safe behind a lock."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # launcher -> {path: (mtime_ns, size, name, ref)}, espejo de la tabla
+        self._known: dict[str, dict[str, tuple]] = {}
+        self.conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS manifests (
+                    path TEXT PRIMARY KEY,
+                    launcher TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    name TEXT,
+                    ref TEXT
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_manifests_launcher ON manifests(launcher)"
+            )
+            (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+            if version < SCHEMA_VERSION:
+                # Las filas sin nombre pueden tenerlo con los parsers actuales
+                self.conn.execute("DELETE FROM manifests WHERE name IS NULL")
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _rows(self, launcher: str) -> dict[str, tuple]:
+        known = self._known.get(launcher)
+        if known is None:
+            # La tabla se lee una vez por proceso; después basta la copia en memoria
+            known = self._known[launcher] = {
+                row[0]: row[1:]
+                for row in self.conn.execute(
+                    "SELECT path, mtime_ns, size, name, ref FROM manifests WHERE launcher = ?",
+                    (launcher,),
+                )
+            }
+        return known
+
+    def _check(self, launcher: str, path: str, stat: os.stat_result, changed: list) -> Parsed:
+        """Fields of *path*, re-parsing it only if its mtime or size moved."""
+        row = self._known[launcher].get(path)
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return (row[2], row[3]) if row[2] else None
+        try:
+            with open(path, encoding="utf-8", errors="ignore") as fh:
+                parsed = PARSERS[launcher][1](fh.read())
+        except OSError:
+            return None
+        # También se guardan los que no se pueden usar: así no se releen
+        name, ref = parsed or (None, None)
+        changed.append((path, launcher, stat.st_mtime_ns, stat.st_size, name, ref))
+        return parsed
+
+    def _apply(self, launcher: str, changed: list, removed: list) -> None:
+        if not (changed or removed):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?, ?)", changed
+            )
+            self.conn.executemany("DELETE FROM manifests WHERE path = ?", removed)
+        known = self._known[launcher]
+        for path, _, mtime_ns, size, name, ref in changed:
+            known[path] = (mtime_ns, size, name, ref)
+        for (path,) in removed:
+            known.pop(path, None)
+
+    def scan(self, launcher: str, directories: Iterable[Path]) -> list[tuple[str, str | None]]:
+        """Bring *launcher*'s rows up to date; returns its ``(name, ref)`` pairs."""
+        pattern = PARSERS[launcher][0]
+        with self._lock:
+            known = self._rows(launcher)
+            changed: list[tuple] = []
+            games: list[tuple[str, str]] = []
+            seen: set[str] = set()
+            for directory in directories:
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if not fnmatch.fnmatchcase(entry.name, pattern):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    seen.add(entry.path)
+                    parsed = self._check(launcher, entry.path, stat, changed)
+                    if parsed:
+                        games.append(parsed)
+            self._apply(launcher, changed, [(path,) for path in known if path not in seen])
+        metrics.incr(f"installed_index.{launcher}.parsed", len(changed))
+        metrics.incr(f"installed_index.{launcher}.reused", len(seen) - len(changed))
+        return games
+
+    def refresh_paths(self, launcher: str, paths: Iterable[str]) -> bool:
+        """Re-check only *paths* (e.g. from a watcher); ``True`` if any row changed."""
+        pattern = PARSERS[launcher][0]
+        with self._lock:
+            known = self._rows(launcher)
+            changed: list[tuple] = []
+            removed: list[tuple[str]] = []
+            for path in paths:
+                if not fnmatch.fnmatchcase(os.path.basename(path), pattern):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    if path in known:
+                        removed.append((path,))
+                    continue
+                self._check(launcher, path, stat, changed)
+            self._apply(launcher, changed, removed)
+        metrics.incr(f"installed_index.{launcher}.parsed", len(changed))
+        return bool(changed or removed)
+
+    def games(self, launcher: str) -> list[tuple[str, str | None]]:
+        """Current ``(name, ref)`` pairs without touching the filesystem."""
+        with self._lock:
+            return [(row[2], row[3]) for row in self._rows(launcher).values() if row[2]]
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+_default: InstalledIndex | None = None
+_default_lock = threading.Lock()
+
+
+def default_index() -> InstalledIndex:
+    """Process-wide index next to the application database."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from data.activity_dao import DB_PATH
+
+            _default = InstalledIndex(DB_PATH + INSTALLED_SUFFIX)
+        return _default
@@ -0,0 +1,249 @@
+"""Watch launcher manifest folders and report installs/uninstalls.
+
+On Linux the folders are watched with inotify (through ``ctypes``, no extra
+dependency) and the callback receives the exact manifest paths that were
+created, rewritten, moved or deleted. Elsewhere, or if inotify cannot be
+set up, a polling thread compares the folders' mtimes every *interval*
+seconds (creating, deleting or renaming an entry updates it) and asks for a
+rescan of the affected launcher, which the incremental
+:class:`~infrastructure.installed_index.InstalledIndex` keeps cheap.
+
+Callbacks run on the watcher thread as ``on_change(launcher, paths)``;
+``paths`` is ``None`` when the whole launcher has to be rescanned.
+
+With a *discover* callable the folder list is not fixed at start: it is
+called again after every rescan event and every *rediscover_interval*
+seconds, so a library added during the session, a recreated ``steamapps``
+folder or a launcher installed after start gets watched (and rescanned)
+without a restart. :meth:`LibraryWatcher.watching` tells whether a launcher
+currently has any folder under watch.
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+POLL_INTERVAL = 2.0
+# Steam reescribe un manifiesto varias veces seguidas al instalar
+DEBOUNCE = 0.3
+REDISCOVER_INTERVAL = 30.0
+
+# inotify(7)
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_RESCAN_MASK = _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED
+_EVENT = struct.Struct("iIII")
+
+OnChange = Callable[[str, set[str] | None], None]
+Discover = Callable[[], dict[str, Iterable[Path]]]
+
+
+def _inotify():
+    """``(libc, fd)`` for a fresh non-blocking inotify instance, or ``None``."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes
+    import ctypes.util
+
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    return (libc, fd) if fd >= 0 else None
+
+
+class LibraryWatcher:
+    """Background watcher for ``{launcher: [directories]}``."""
+
+    def __init__(
+        self,
+        directories: dict[str, Iterable[Path]],
+        on_change: OnChange,
+        interval: float = POLL_INTERVAL,
+        debounce: float = DEBOUNCE,
+        use_inotify: bool = True,
+        discover: Discover | None = None,
+        rediscover_interval: float = REDISCOVER_INTERVAL,
+    ):
+        self.directories = {
+            launcher: [str(path) for path in paths] for launcher, paths in directories.items()
+        }
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self.discover = discover
+        self.rediscover_interval = rediscover_interval
+        # launcher -> tiene alguna carpeta vigilada; lo reemplaza el hilo del vigilante
+        self._active: dict[str, bool] = {}
+        self._inotify = _inotify() if use_inotify else None
+        self.backend = "inotify" if self._inotify else "polling"
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_inotify if self._inotify else self._run_polling,
+            name="hobbypicker-library-watcher",
+            daemon=True,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def watching(self, launcher: str) -> bool:
+        """Whether *launcher* has at least one folder under watch right now."""
+        return self.running and self._active.get(launcher, False)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _dispatch(self, launcher: str, paths: set[str] | None) -> None:
+        try:
+            self.on_change(launcher, paths)
+        except Exception:
+            # Un fallo al procesar un evento no debe parar la vigilancia
+            pass
+
+    def _rediscover(self) -> set[str]:
+        """Refresh the folder lists; returns the launchers whose list changed."""
+        if self.discover is None:
+            return set()
+        try:
+            found = self.discover()
+        except Exception:
+            return set()
+        changed: set[str] = set()
+        for launcher, paths in found.items():
+            paths = [str(path) for path in paths]
+            if paths != self.directories.get(launcher):
+                self.directories[launcher] = paths
+                changed.add(launcher)
+        return changed
+
+    # --- inotify -----------------------------------------------------------
+
+    def _run_inotify(self) -> None:
+        libc, fd = self._inotify
+        watches: dict[int, tuple[str, str]] = {}
+        try:
+            self._sync_watches(libc, fd, watches)
+            next_discovery = time.monotonic() + self.rediscover_interval
+            while not self._stop.is_set():
+                pending: dict[str, set[str] | None] = {}
+                if select.select([fd], [], [], self.interval)[0]:
+                    self._collect(fd, watches, pending)
+                    # Se agrupan las ráfagas de eventos en una sola notificación
+                    while select.select([fd], [], [], self.debounce)[0]:
+                        self._collect(fd, watches, pending)
+                # Una carpeta perdida o el plazo cumplido: se buscan de nuevo
+                # las carpetas y se vigilan las nuevas o recreadas
+                if None in pending.values() or time.monotonic() >= next_discovery:
+                    next_discovery = time.monotonic() + self.rediscover_interval
+                    for launcher in self._rediscover() | self._sync_watches(libc, fd, watches):
+                        pending[launcher] = None
+                for launcher, paths in pending.items():
+                    self._dispatch(launcher, paths)
+        finally:
+            os.close(fd)
+
+    def _sync_watches(self, libc, fd: int, watches: dict) -> set[str]:
+        """Match *watches* to ``self.directories``; returns launchers that gained one.
+
+        Folders that could not be watched (missing, deleted) are retried on
+        every call.
+        """
+        wanted = {
+            (launcher, directory)
+            for launcher, paths in self.directories.items()
+            for directory in paths
+        }
+        for wd, key in list(watches.items()):
+            if key not in wanted:
+                libc.inotify_rm_watch(fd, wd)
+                del watches[wd]
+        added: set[str] = set()
+        for launcher, directory in wanted - set(watches.values()):
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                watches[wd] = (launcher, directory)
+                added.add(launcher)
+        active = {launcher for launcher, _ in watches.values()}
+        self._active = {launcher: launcher in active for launcher in self.directories}
+        return added
+
+    def _collect(self, fd: int, watches: dict, pending: dict) -> None:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & _IN_Q_OVERFLOW:
+                # Se perdieron eventos: hay que volver a escanear todo
+                for launcher in self.directories:
+                    pending[launcher] = None
+                continue
+            if wd not in watches:
+                continue
+            launcher, directory = watches[wd]
+            if mask & _RESCAN_MASK:
+                watches.pop(wd, None)
+                pending[launcher] = None
+            elif name and pending.get(launcher, set()) is not None:
+                pending.setdefault(launcher, set()).add(
+                    os.path.join(directory, os.fsdecode(name))
+                )
+
+    # --- polling -----------------------------------------------------------
+
+    def _mtimes(self) -> dict[str, int | None]:
+        mtimes: dict[str, int | None] = {}
+        for paths in self.directories.values():
+            for directory in paths:
+                try:
+                    mtimes[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    mtimes[directory] = None
+        self._active = {
+            launcher: any(mtimes[d] is not None for d in paths)
+            for launcher, paths in self.directories.items()
+        }
+        return mtimes
+
+    def _run_polling(self) -> None:
+        last = self._mtimes()
+        next_discovery = time.monotonic() + self.rediscover_interval
+        while not self._stop.wait(self.interval):
+            rescan: set[str] = set()
+            if time.monotonic() >= next_discovery:
+                next_discovery = time.monotonic() + self.rediscover_interval
+                rescan = self._rediscover()
+            current = self._mtimes()
+            for launcher, paths in self.directories.items():
+                # Una carpeta que aparece pasa de None a su fecha y también cuenta
+                if launcher in rescan or any(current[d] != last.get(d) for d in paths):
+                    self._dispatch(launcher, None)
+            last = current
@@ -0,0 +1,165 @@
+"""Persistent cache for store lookups (appids, app types…).
+
+Entries live in ``<db>.lookups``, a small SQLite file next to the main
+database, so they survive restarts and never lock the hobby tables. Each
+entry has its own expiry; ``None`` results are cached too (negative caching)
+with a shorter TTL, so a game the store does not know is not looked up on
+every popup. The file is bounded to *max_entries*: expired entries go first,
+then the least recently used ones.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+from infrastructure.metrics import Metrics, metrics as default_metrics
+
+LOOKUP_SUFFIX = ".lookups"
+DEFAULT_TTL = 30 * 24 * 3600  # 30 días
+NEGATIVE_TTL = 24 * 3600  # un día para los "no encontrado"
+MAX_ENTRIES = 20000
+
+_MISSING = object()
+
+
+class LookupCache:
+    """Namespaced key/value cache with per-entry TTL and LRU eviction.
+
+    Thread-safe: the connection is shared by the resolver threads behind a
+    lock. Exceptions raised by the fetch function are never cached.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        max_entries: int = MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+        metrics: Metrics | None = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.metrics = metrics or default_metrics
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        # Autocommit: cada entrada se guarda al momento
+        self.conn = sqlite3.connect(
+            path, timeout=5.0, check_same_thread=False, isolation_level=None
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lookups (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_lookups_accessed ON lookups(accessed)"
+        )
+
+    def get(self, namespace: str, key: Any, default: Any = _MISSING) -> Any:
+        """Cached value (possibly ``None``), or *default* when absent or expired."""
+        now = self._clock()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expires FROM lookups WHERE namespace = ? AND key = ?",
+                (namespace, str(key)),
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                self.metrics.incr(f"lookup_cache.{namespace}.misses")
+                return default
+            self.conn.execute(
+                "UPDATE lookups SET accessed = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, str(key)),
+            )
+            self.hits += 1
+            self.metrics.incr(f"lookup_cache.{namespace}.hits")
+        return json.loads(row[0])
+
+    def put(self, namespace: str, key: Any, value: Any, ttl: float | None = None) -> None:
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        now = self._clock()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?)",
+                (namespace, str(key), json.dumps(value), now + ttl, now),
+            )
+            self._evict(now)
+
+    def delete(self, namespace: str, key: Any) -> None:
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM lookups WHERE namespace = ? AND key = ?", (namespace, str(key))
+            )
+
+    def _evict(self, now: float) -> None:
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM lookups").fetchone()
+        if count <= self.max_entries:
+            return
+        removed = self.conn.execute(
+            "DELETE FROM lookups WHERE expires <= ?", (now,)
+        ).rowcount
+        excess = count - removed - self.max_entries
+        if excess > 0:
+            removed += self.conn.execute(
+                "DELETE FROM lookups WHERE rowid IN "
+                "(SELECT rowid FROM lookups ORDER BY accessed LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self.evictions += removed
+        self.metrics.incr("lookup_cache.evictions", removed)
+
+    def get_or_fetch(self, namespace: str, key: Any, fetch: Callable[[Any], Any]) -> Any:
+        value = self.get(namespace, key)
+        if value is _MISSING:
+            value = fetch(key)
+            self.put(namespace, key, value)
+        return value
+
+    def wrap(self, namespace: str, fetch: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """*fetch* with its results cached under *namespace*."""
+        return lambda key: self.get_or_fetch(namespace, key, fetch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (entries,) = self.conn.execute("SELECT COUNT(*) FROM lookups").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+
+_default: LookupCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> LookupCache:
+    """Process-wide cache next to the application database."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from data.activity_dao import DB_PATH
+
+            _default = LookupCache(DB_PATH + LOOKUP_SUFFIX)
+        return _default
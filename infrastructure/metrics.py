@@ -0,0 +1,76 @@
+"""In-process metrics: counters, value observations and a startup timeline."""
+
+import threading
+import time
+
+
+class Metrics:
+    """Thread-safe registry of named counters and observations."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        # name -> [count, total, max]; aggregates only, so memory stays flat
+        self._observations: dict[str, list[float]] = {}
+        # name -> seconds since the origin (process start when known)
+        self._origin = time.perf_counter()
+        self._marks: dict[str, float] = {}
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            agg = self._observations.get(name)
+            if agg is None:
+                self._observations[name] = [1, value, value]
+            else:
+                agg[0] += 1
+                agg[1] += value
+                agg[2] = max(agg[2], value)
+
+    def set_origin(self, origin: float) -> None:
+        """Measure timeline marks from *origin*, a ``time.perf_counter()`` value."""
+        with self._lock:
+            self._origin = origin
+
+    def mark(self, name: str) -> float:
+        """Record that *name* happened now; returns seconds since the origin."""
+        elapsed = time.perf_counter() - self._origin
+        with self._lock:
+            self._marks[name] = elapsed
+        return elapsed
+
+    def timeline(self) -> dict[str, float]:
+        """Recorded marks in the order they happened."""
+        with self._lock:
+            return dict(sorted(self._marks.items(), key=lambda mark: mark[1]))
+
+    def counter(self, name: str) -> int:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """Counters plus ``count/mean/max`` summaries of every observation."""
+        with self._lock:
+            summary = {
+                name: {"count": count, "mean": total / count, "max": peak}
+                for name, (count, total, peak) in self._observations.items()
+            }
+            timeline = dict(sorted(self._marks.items(), key=lambda mark: mark[1]))
+            return {
+                "counters": dict(self._counters),
+                "observations": summary,
+                "timeline": timeline,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+            self._marks.clear()
+
+
+# Registro compartido por toda la aplicación
+metrics = Metrics()
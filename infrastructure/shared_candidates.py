@@ -0,0 +1,123 @@
+"""Publish packed candidate buffers to other processes via shared memory.
+
+A small *control* segment holds a seqlock-protected ``(generation, name)``
+pair pointing at the current *data* segment. The coordinator writes a new
+data segment for every generation and then flips the control block; workers
+check the generation on each request and re-attach when it moves. The
+previous generation is kept alive until the next swap so readers that are
+mid-attach never lose their segment.
+"""
+
+import os
+import struct
+import time
+import uuid
+from multiprocessing import shared_memory
+
+from domain.packed_candidates import PackedCandidates
+
+# seq (odd while writing), generation, segment name
+_CONTROL = struct.Struct("=QQ64s")
+# Intentos de enganche antes de quedarse con la última generación buena
+ATTACH_ATTEMPTS = 5
+
+
+class SharedCandidatePublisher:
+    """Coordinator side: owns the control block and every data segment."""
+
+    def __init__(self, prefix: str | None = None):
+        self.prefix = prefix or f"hp{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.control = shared_memory.SharedMemory(
+            name=f"{self.prefix}_ctl", create=True, size=_CONTROL.size
+        )
+        self.control.buf[:_CONTROL.size] = _CONTROL.pack(0, 0, b"")
+        self.generation = 0
+        self._segments: list[shared_memory.SharedMemory] = []
+
+    @property
+    def control_name(self) -> str:
+        return self.control.name
+
+    def publish(self, payload: bytes) -> int:
+        """Copy *payload* into a fresh segment and make it current."""
+        self.generation += 1
+        segment = shared_memory.SharedMemory(
+            name=f"{self.prefix}_{self.generation}", create=True, size=max(len(payload), 1)
+        )
+        segment.buf[:len(payload)] = payload
+        seq = _CONTROL.unpack_from(self.control.buf, 0)[0]
+        struct.pack_into("=Q", self.control.buf, 0, seq + 1)
+        struct.pack_into(
+            "=Q64s", self.control.buf, 8, self.generation, segment.name.encode("ascii")
+        )
+        struct.pack_into("=Q", self.control.buf, 0, seq + 2)
+        self._segments.append(segment)
+        while len(self._segments) > 2:
+            old = self._segments.pop(0)
+            old.close()
+            old.unlink()
+        return self.generation
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments.clear()
+        self.control.close()
+        self.control.unlink()
+
+
+class SharedCandidateReader:
+    """Worker side: attaches to the current generation without copying it."""
+
+    def __init__(self, control_name: str):
+        self.control = shared_memory.SharedMemory(name=control_name)
+        self.generation = 0
+        self.candidates: PackedCandidates | None = None
+        self._segment: shared_memory.SharedMemory | None = None
+
+    def _read_control(self) -> tuple[int, str]:
+        while True:
+            seq, generation, name = _CONTROL.unpack_from(self.control.buf, 0)
+            if seq % 2 == 0 and _CONTROL.unpack_from(self.control.buf, 0)[0] == seq:
+                return generation, name.rstrip(b"\0").decode("ascii")
+            time.sleep(0)
+
+    def current(self) -> PackedCandidates | None:
+        """Return the live view, re-attaching first if a new generation exists.
+
+        If the segment keeps disappearing before it can be attached (the
+        coordinator died or is swapping faster than we attach), gives up
+        after :data:`ATTACH_ATTEMPTS` and returns the last good view, which
+        may be ``None``.
+        """
+        for _ in range(ATTACH_ATTEMPTS):
+            generation, name = self._read_control()
+            if generation == self.generation or not name:
+                return self.candidates
+            try:
+                segment = shared_memory.SharedMemory(name=name)
+            except FileNotFoundError:
+                # superseded between reading the control block and attaching
+                time.sleep(0)
+                continue
+            break
+        else:
+            return self.candidates
+        self._detach()
+        self._segment = segment
+        self.candidates = PackedCandidates(segment.buf)
+        self.generation = generation
+        return self.candidates
+
+    def _detach(self) -> None:
+        if self.candidates is not None:
+            self.candidates.release()
+            self.candidates = None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def close(self) -> None:
+        self._detach()
+        self.control.close()
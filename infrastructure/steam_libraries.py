@@ -0,0 +1,203 @@
+"""Discovery of Steam library folders (``.../steamapps``).
+
+Probing every candidate root can hang on Windows when a drive letter maps to
+a disconnected network share, so candidates are grouped by drive and each
+drive is probed on its own daemon thread; a drive that does not answer
+within *timeout* seconds is treated as absent (and its thread is left
+behind rather than blocking exit; while it is still stuck, later probes skip
+that drive instead of piling up threads). Extra libraries listed in
+``libraryfolders.vdf`` are probed the same way.
+
+The result is persisted in the lookup cache together with the mtime of
+every ``libraryfolders.vdf`` it was built from. Later calls only stat those
+files and reuse the stored list; the candidates are probed again when a vdf
+changed, when the entry expired, or when ``refresh=True`` is passed. An
+empty result has no vdf to watch, so it is only kept for a few minutes.
+"""
+
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable
+
+from infrastructure.metrics import metrics
+
+PROBE_TIMEOUT = 1.0
+NAMESPACE = "steam_libraries"
+FOUND_TTL = 30 * 24 * 3600
+# Sin Steam no hay vdf que vigilar: se vuelve a sondear pasados unos minutos
+NOT_FOUND_TTL = 5 * 60
+VDF_NAME = "libraryfolders.vdf"
+
+_VDF_PATH = re.compile(r'"path"\s*"([^"]+)"')
+
+# Unidad -> hilo de sondeo que no respondió a tiempo
+_stuck: dict[str, threading.Thread] = {}
+_stuck_lock = threading.Lock()
+
+
+def candidate_roots() -> list[Path]:
+    """Usual Steam install locations for this platform."""
+    roots: list[Path] = []
+    if os.name == "nt":
+        for var in ("PROGRAMFILES(X86)", "PROGRAMFILES"):
+            base = os.environ.get(var)
+            if base:
+                roots.append(Path(base) / "Steam")
+        for letter in "CDEFGHIJKLMNOPQRSTUVWXYZ":
+            drive = Path(f"{letter}:/")
+            roots.extend(
+                [
+                    drive / "Steam",
+                    drive / "SteamLibrary",
+                    drive / "Program Files/Steam",
+                    drive / "Program Files (x86)/Steam",
+                ]
+            )
+    else:
+        roots.extend(
+            [
+                Path.home() / ".steam/steam",
+                Path.home() / ".local/share/Steam",
+                Path.home() / "Library/Application Support/Steam",
+            ]
+        )
+    return roots
+
+
+def probe_steamapps(
+    roots: Iterable[Path],
+    timeout: float = PROBE_TIMEOUT,
+    exists: Callable[[Path], bool] = os.path.isdir,
+) -> list[Path]:
+    """``root/steamapps`` for every root that has one, in input order.
+
+    Roots on the same Windows drive share one probe thread (a dead network
+    drive hangs every path on it); elsewhere each root gets its own. All
+    threads start at once and are waited for at most *timeout* seconds in
+    total.
+    """
+    roots = list(roots)
+    by_drive: dict[str, list[int]] = {}
+    for i, root in enumerate(roots):
+        by_drive.setdefault(root.drive or str(root), []).append(i)
+    found: dict[int, bool] = {}
+
+    def probe(indexes: list[int]) -> None:
+        for i in indexes:
+            try:
+                found[i] = exists(roots[i] / "steamapps")
+            except OSError:
+                found[i] = False
+
+    threads: dict[str, threading.Thread] = {}
+    with _stuck_lock:
+        for drive, indexes in by_drive.items():
+            stuck = _stuck.pop(drive, None)
+            if stuck is not None and stuck.is_alive():
+                # Sigue colgada desde el último sondeo: cuenta como ausente
+                _stuck[drive] = stuck
+                metrics.incr("steam_libraries.probe_skipped")
+                continue
+            threads[drive] = threading.Thread(target=probe, args=(indexes,), daemon=True)
+    for thread in threads.values():
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for drive, thread in threads.items():
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            metrics.incr("steam_libraries.probe_timeouts")
+            with _stuck_lock:
+                _stuck[drive] = thread
+    return [roots[i] / "steamapps" for i in range(len(roots)) if found.get(i)]
+
+
+def _vdf_mtimes(steamapps: Iterable[Path]) -> dict[str, int | None]:
+    mtimes: dict[str, int | None] = {}
+    for path in steamapps:
+        try:
+            mtimes[str(path / VDF_NAME)] = os.stat(path / VDF_NAME).st_mtime_ns
+        except OSError:
+            mtimes[str(path / VDF_NAME)] = None
+    return mtimes
+
+
+def _vdf_libraries(vdf: Path) -> list[Path]:
+    try:
+        text = vdf.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return []
+    return [Path(folder).expanduser() for folder in _VDF_PATH.findall(text)]
+
+
+def _unique_resolved(paths: Iterable[Path]) -> list[Path]:
+    unique: list[Path] = []
+    for path in paths:
+        try:
+            resolved = path.resolve()
+        except OSError:
+            resolved = path
+        if resolved not in unique:
+            unique.append(resolved)
+    return unique
+
+
+class SteamLibraryDiscovery:
+    """Probe-once, validate-by-mtime discovery of Steam library folders.
+
+    *store* is a :class:`~infrastructure.lookup_cache.LookupCache` (the
+    application default when omitted); *roots* and *exists* can be replaced
+    to run against temporary directories.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        roots: Callable[[], list[Path]] = candidate_roots,
+        timeout: float = PROBE_TIMEOUT,
+        exists: Callable[[Path], bool] = os.path.isdir,
+    ):
+        if store is None:
+            from infrastructure.lookup_cache import default_cache
+
+            store = default_cache()
+        self.store = store
+        self.roots = roots
+        self.timeout = timeout
+        self.exists = exists
+        self._roots = roots()
+        # Otra lista de candidatos (otro equipo, pruebas) no reutiliza la entrada
+        self._key = "|".join(str(root) for root in self._roots)
+
+    def libraries(self, refresh: bool = False) -> list[Path]:
+        if not refresh:
+            cached = self.store.get(NAMESPACE, self._key, None)
+            if cached is not None and _vdf_mtimes(map(Path, cached["roots"])) == cached["vdf"]:
+                metrics.incr("steam_libraries.reused")
+                return [Path(path) for path in cached["libraries"]]
+        return self._discover()
+
+    def _discover(self) -> list[Path]:
+        metrics.incr("steam_libraries.probed")
+        main = probe_steamapps(self._roots, self.timeout, self.exists)
+        extra_roots = [lib for steamapps in main for lib in _vdf_libraries(steamapps / VDF_NAME)]
+        extra = probe_steamapps(extra_roots, self.timeout, self.exists)
+        libraries = _unique_resolved(main + extra)
+        self.store.put(
+            NAMESPACE,
+            self._key,
+            {
+                "roots": [str(path) for path in main],
+                "vdf": _vdf_mtimes(main),
+                "libraries": [str(path) for path in libraries],
+            },
+            ttl=FOUND_TTL if libraries else NOT_FOUND_TTL,
+        )
+        return libraries
+
+
+def discover_libraries(refresh: bool = False) -> list[Path]:
+    """Steam library folders on this machine (see :class:`SteamLibraryDiscovery`)."""
+    return SteamLibraryDiscovery().libraries(refresh)
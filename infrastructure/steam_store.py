@@ -0,0 +1,237 @@
+"""Steam store lookups used by the library import.
+
+:func:`stream_owned_games` parses a profile's library while it downloads
+and :func:`iter_app_types` classifies the appids concurrently (to drop DLC)
+with a bounded thread pool, a shared :class:`TokenBucket`, retries with
+exponential backoff on throttling/server errors and a progress callback.
+Requests go through the pooled :mod:`infrastructure.http_client` session.
+Every function takes the endpoint as a parameter, so it can be pointed at a
+local stub server (see ``benchmarks/steam_resolver_bench.py``).
+"""
+
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from infrastructure import http_client
+from infrastructure.rate_limit import TokenBucket
+
+PROFILE_GAMES_URL = "https://steamcommunity.com/profiles/{steam_id}/games?tab=all&xml=1"
+APPDETAILS_URL = "https://store.steampowered.com/api/appdetails"
+SEARCH_APPS_URL = "https://steamcommunity.com/actions/SearchApps/"
+
+# La tienda limita por IP; estos valores evitan la mayoría de los 429.
+# Más hilos que http_client.POOL_MAXSIZE no reutilizarían conexiones
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+# Consultas en vuelo por hilo cuando la entrada llega en streaming
+INFLIGHT_PER_WORKER = 4
+XML_CHUNK_SIZE = 64 * 1024
+APP_TYPE_NAMESPACE = "steam_app_type"
+
+_MISS = object()
+
+
+class TransientError(Exception):
+    """A lookup failed in a way worth retrying (timeout, 429, 5xx)."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(resp) -> float | None:
+    try:
+        return float(resp.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_app_type(
+    appid: int, url: str = APPDETAILS_URL, timeout: float = 5.0
+) -> str | None:
+    """``"game"``, ``"dlc"``… for *appid*, or ``None`` if the store has no data.
+
+    Raises :class:`TransientError` when the request should be retried.
+    """
+    import requests
+
+    try:
+        resp = http_client.get(
+            url, params={"appids": appid, "filters": "basic"}, timeout=timeout
+        )
+    except requests.RequestException as exc:
+        raise TransientError(str(exc)) from exc
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise TransientError(f"HTTP {resp.status_code}", _retry_after(resp))
+    try:
+        info = resp.json().get(str(appid)) or {}
+    except (ValueError, AttributeError):
+        return None
+    if info.get("success"):
+        return info.get("data", {}).get("type")
+    return None
+
+
+def fetch_appid(name: str, url: str = SEARCH_APPS_URL, timeout: float = 5.0) -> int | None:
+    """Best-match appid for a game *name* from the community search.
+
+    ``None`` means the search found nothing; network errors raise
+    :class:`TransientError` so they are not cached as misses.
+    """
+    import requests
+    from urllib.parse import quote
+
+    try:
+        resp = http_client.get(url + quote(name), timeout=timeout)
+    except requests.RequestException as exc:
+        raise TransientError(str(exc)) from exc
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise TransientError(f"HTTP {resp.status_code}", _retry_after(resp))
+    try:
+        data = resp.json()
+        return int(data[0]["appid"]) if data else None
+    except (ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def parse_owned_games(chunks: Iterable[bytes]) -> Iterator[tuple[int, str]]:
+    """Yield ``(appid, name)`` from a profile games XML fed in *chunks*.
+
+    Each ``<game>`` is yielded as soon as its end tag is parsed and is then
+    detached from the tree, so memory stays flat however large the library.
+    """
+    import xml.etree.ElementTree as ET
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    games = None
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if elem.tag == "games":
+                    games = elem
+                continue
+            if elem.tag != "game":
+                continue
+            appid, name = elem.findtext("appID"), elem.findtext("name")
+            if games is not None:
+                games.remove(elem)
+            if appid and name:
+                yield int(appid), name
+    parser.close()
+
+
+def stream_owned_games(
+    steam_id: str, url: str = PROFILE_GAMES_URL, chunk_size: int = XML_CHUNK_SIZE
+) -> Iterator[tuple[int, str]]:
+    """Download a profile's game list and parse it while it arrives."""
+    with http_client.get(url.format(steam_id=steam_id), timeout=10, stream=True) as resp:
+        resp.raise_for_status()
+        yield from parse_owned_games(resp.iter_content(chunk_size))
+
+
+def iter_app_types(
+    appids: Iterable[int],
+    fetch: Callable[[int], str | None] = fetch_app_type,
+    workers: int = DEFAULT_WORKERS,
+    limiter: TokenBucket | None = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+    cache=None,
+    namespace: str = APP_TYPE_NAMESPACE,
+) -> Iterator[tuple[int, str | None]]:
+    """Lazily resolve *appids*, yielding ``(appid, type)`` in input order.
+
+    *appids* is consumed only as slots free up (at most
+    ``workers * INFLIGHT_PER_WORKER`` lookups in flight), so a streaming
+    source keeps downloading while earlier ids are resolved. Repeated ids
+    are skipped. Each attempt takes a token from *limiter* first; transient
+    failures are retried up to *retries* times, waiting ``Retry-After`` when
+    given or ``backoff * 2**attempt`` with jitter, and an id that still
+    fails maps to ``None``.
+
+    With a *cache* (a :class:`~infrastructure.lookup_cache.LookupCache`),
+    ids already stored under *namespace* are answered before reaching the
+    pool, so they spend no rate-limit tokens; fetched types are stored.
+    """
+    limiter = limiter or TokenBucket(DEFAULT_RATE, DEFAULT_BURST)
+
+    def resolve(appid: int) -> str | None:
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            try:
+                app_type = fetch(appid)
+            except TransientError as exc:
+                if attempt == retries:
+                    return None
+                delay = exc.retry_after
+                if delay is None:
+                    delay = backoff * 2 ** attempt * (1 + random.random())
+                sleep(delay)
+            else:
+                if cache is not None:
+                    cache.put(namespace, appid, app_type)
+                return app_type
+        return None
+
+    window = max(1, workers) * INFLIGHT_PER_WORKER
+    seen: set[int] = set()
+    pending: deque = deque()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for appid in appids:
+            if appid in seen:
+                continue
+            seen.add(appid)
+            cached = _MISS if cache is None else cache.get(namespace, appid, _MISS)
+            if cached is _MISS:
+                future = pool.submit(resolve, appid)
+            else:
+                # Ya resuelto: ocupa su puesto en el orden sin pasar por el límite
+                future = Future()
+                future.set_result(cached)
+            pending.append((appid, future))
+            if len(pending) >= window:
+                appid, future = pending.popleft()
+                yield appid, future.result()
+        while pending:
+            appid, future = pending.popleft()
+            yield appid, future.result()
+    finally:
+        # Si el consumidor abandona, no se lanzan las consultas que faltan
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def resolve_app_types(
+    appids: Iterable[int],
+    fetch: Callable[[int], str | None] = fetch_app_type,
+    workers: int = DEFAULT_WORKERS,
+    limiter: TokenBucket | None = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+    progress: Callable[[int, int], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    cache=None,
+) -> dict[int, str | None]:
+    """Resolve the app type of every distinct appid concurrently.
+
+    Same retry, rate-limit and cache rules as :func:`iter_app_types`.
+    *progress* is called as ``progress(done, total)`` from the calling
+    thread after each id completes.
+    """
+    unique = list(dict.fromkeys(appids))
+    results: dict[int, str | None] = {}
+    resolved = iter_app_types(
+        unique, fetch, max(1, min(workers, len(unique))), limiter, retries, backoff, sleep,
+        cache,
+    )
+    for done, (appid, app_type) in enumerate(resolved, 1):
+        results[appid] = app_type
+        if progress:
+            progress(done, len(unique))
+    return results
@@ -1,56 +1,96 @@
 import subprocess, sys, os
 
-def _sh(*args, check=True, text=True):
-    return subprocess.run(args, check=check, text=text, capture_output=True).stdout.strip()
+from infrastructure import git_state
 
-def check_and_launch():
-    # Asegura que estamos en la raíz del repo (no en una subcarpeta)
-    repo_root = _sh("git", "rev-parse", "--show-toplevel")
-    os.chdir(repo_root)
+UPDATE_AVAILABLE = "available"
+UP_TO_DATE = "up_to_date"
+NOT_TRACKING = "not_tracking"
+DIRTY = "dirty"
+CHECK_FAILED = "failed"
 
-    # Rama actual (si estás en detached HEAD, esto fallará → tratamos como "no main")
-    try:
-        branch = _sh("git", "symbolic-ref", "--short", "HEAD")
-    except subprocess.CalledProcessError:
-        branch = "HEAD"  # detached
 
-    # Upstream de la rama (puede no existir)
-    try:
-        upstream = _sh("git", "rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}")
-    except subprocess.CalledProcessError:
-        upstream = ""
+def find_repo_root(cwd=None) -> str | None:
+    """Top-level directory of the git checkout, or ``None`` outside git."""
+    found = git_state.find_git_dir(cwd or os.getcwd())
+    return str(found[0]) if found else None
+
+
+def check_for_update(repo_root: str, fetch: bool = True) -> str:
+    """Compare ``HEAD`` with ``origin/main`` without touching the work tree.
+
+    Returns one of ``UPDATE_AVAILABLE``, ``UP_TO_DATE``, ``NOT_TRACKING``,
+    ``DIRTY`` or ``CHECK_FAILED``. Branch, upstream and SHAs are read from
+    ``.git`` directly; only the dirty check and the network ``git fetch``
+    spawn processes, so it is meant to be called off the UI thread.
+    """
+    state = git_state.read_git_state(repo_root)
+    if state is None:
+        return CHECK_FAILED
+    # Rama actual (detached HEAD → tratamos como "no main")
+    branch = state["branch"] or "HEAD"
+    upstream = state["upstream"]
 
     # Si NO es main o NO trackea origin/main → no hacemos pull
     if not (branch == "main" and upstream == "origin/main"):
         print(f"⚠️ Estás en '{branch}' (upstream: '{upstream or '—'}'), no se hace pull automático.")
-        from presentation.app import start_app
-        start_app()
-        return
-
-    # Evita sobrescribir cambios locales
-    dirty_wc = subprocess.run(["git", "diff", "--quiet"]).returncode != 0
-    dirty_index = subprocess.run(["git", "diff", "--cached", "--quiet"]).returncode != 0
-    if dirty_wc or dirty_index:
-        print("⚠️ Tienes cambios locales. No hago pull para no pisarlos.")
-        from presentation.app import start_app
-        start_app()
-        return
+        return NOT_TRACKING
 
-    subprocess.run(["git", "fetch", "origin"], stdout=subprocess.DEVNULL)
+    try:
+        # Evita sobrescribir cambios locales
+        if git_state.is_dirty(repo_root):
+            print("⚠️ Tienes cambios locales. No hago pull para no pisarlos.")
+            return DIRTY
 
-    local = _sh("git", "rev-parse", "HEAD")
-    remote = _sh("git", "rev-parse", "origin/main")
+        if fetch:
+            subprocess.run(
+                ["git", "fetch", "origin"], cwd=repo_root,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            state = git_state.read_git_state(repo_root)
+    except (OSError, subprocess.CalledProcessError):
+        return CHECK_FAILED
 
+    local, remote = state["head"], state["remote_head"]
+    if not local or not remote:
+        return CHECK_FAILED
     if local != remote:
-        print("🔄 Actualizando desde origin/main…")
-        subprocess.run(["git", "pull", "--ff-only", "origin", "main"], check=True)
-        print("✅ Actualizado. Reiniciando…")
-        python = sys.executable
-        script = os.path.join(repo_root, "main.pyw")
-        os.execv(python, [python, script])
+        print("🔄 Hay una actualización disponible en origin/main.")
+        return UPDATE_AVAILABLE
+    print("✅ Ya estás en la última versión.")
+    return UP_TO_DATE
+
+
+def apply_update(repo_root: str) -> None:
+    """Fast-forward to ``origin/main``; raises ``CalledProcessError`` on failure."""
+    print("🔄 Actualizando desde origin/main…")
+    subprocess.run(["git", "pull", "--ff-only", "origin", "main"], cwd=repo_root, check=True)
+
+
+def restart(repo_root: str) -> None:
+    print("✅ Actualizado. Reiniciando…")
+    python = sys.executable
+    script = os.path.join(repo_root, "main.pyw")
+    os.execv(python, [python, script])
+
+
+def check_and_launch():
+    """Open the window right away; the update check runs in the background."""
+    repo_root = find_repo_root()
+    if repo_root:
+        # Asegura que estamos en la raíz del repo (no en una subcarpeta)
+        os.chdir(repo_root)
+
+    def update_and_restart() -> None:
+        apply_update(repo_root)
+        restart(repo_root)
+
+    from presentation.app import start_app
+    if repo_root:
+        start_app(
+            update_check=lambda: check_for_update(repo_root) == UPDATE_AVAILABLE,
+            on_update=update_and_restart,
+        )
     else:
-        print("✅ Ya estás en la última versión.")
-        from presentation.app import start_app
         start_app()
 
 if __name__ == "__main__":
@@ -1,30 +1,130 @@
+import time
+
+# Origen de la línea temporal de arranque (ver infrastructure.metrics)
+PROCESS_START = time.perf_counter()
+
+import hashlib
+import json
 import os
+import re
 import sys
 import subprocess
 
+FINGERPRINT_PATH = os.path.join(os.path.dirname(__file__), ".requirements_fingerprint.json")
+
+
+def _read_requirements(req_path: str) -> list[str]:
+    with open(req_path, "r") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("tk")]
+
+
+def requirements_fingerprint(lines: list[str]) -> str:
+    """Hash of the requirement lines and the interpreter that will use them."""
+    digest = hashlib.sha256()
+    digest.update(sys.executable.encode("utf-8"))
+    digest.update(sys.version.encode("utf-8"))
+    digest.update("\n".join(lines).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _requirement_name(line: str) -> str:
+    return re.split(r"[\s<>=!~;\[]", line, maxsplit=1)[0]
+
+
+def installed_versions(lines: list[str]) -> dict[str, str | None]:
+    """Installed distribution version for each requirement (``None`` if missing)."""
+    from importlib import metadata
+
+    versions: dict[str, str | None] = {}
+    for line in lines:
+        name = _requirement_name(line)
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def _load_fingerprint() -> dict:
+    try:
+        with open(FINGERPRINT_PATH, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
 
-def install_requirements():
+
+def _save_fingerprint(fingerprint: str, versions: dict[str, str | None]) -> None:
+    try:
+        with open(FINGERPRINT_PATH, "w", encoding="utf-8") as fh:
+            json.dump({"fingerprint": fingerprint, "versions": versions}, fh)
+    except OSError:
+        pass
+
+
+def install_requirements(force: bool = False) -> bool:
+    """Run ``pip install`` only when the requirements or interpreter changed.
+
+    The fast path compares a fingerprint of ``requirements.txt`` and
+    ``sys.executable`` plus the installed versions recorded after the last
+    successful install. Returns ``True`` when pip was actually invoked.
+    """
     req_path = os.path.join(os.path.dirname(__file__), "requirements.txt")
     if not os.path.exists(req_path):
-        return
+        return False
 
-    with open(req_path, "r") as f:
-        lines = [line.strip() for line in f if line.strip() and not line.startswith("tk")]
+    lines = _read_requirements(req_path)
 
     if not lines:
-        return
+        return False
+
+    fingerprint = requirements_fingerprint(lines)
+    if not force:
+        stored = _load_fingerprint()
+        if stored.get("fingerprint") == fingerprint:
+            versions = installed_versions(lines)
+            if None not in versions.values() and versions == stored.get("versions"):
+                return False
 
     temp_path = os.path.join(os.path.dirname(__file__), "temp_requirements.txt")
     with open(temp_path, "w") as temp:
         temp.write("\n".join(lines))
 
-    subprocess.run([sys.executable, "-m", "pip", "install", "-r", temp_path])
+    result = subprocess.run([sys.executable, "-m", "pip", "install", "-r", temp_path])
     os.remove(temp_path)
+    if result.returncode == 0:
+        versions = installed_versions(lines)
+        if None not in versions.values():
+            _save_fingerprint(fingerprint, versions)
+    return True
+
+
+def missing_modules() -> list[str]:
+    """Top-level modules of ``requirements.txt`` that cannot be imported.
+
+    Uses ``find_spec``, so nothing is actually imported.
+    """
+    import importlib.util
+
+    req_path = os.path.join(os.path.dirname(__file__), "requirements.txt")
+    if not os.path.exists(req_path):
+        return []
+    modules = [_requirement_name(line).replace("-", "_") for line in _read_requirements(req_path)]
+    return [module for module in modules if importlib.util.find_spec(module) is None]
 
 
 def main():
-    install_requirements()
+    from infrastructure.metrics import metrics
+
+    metrics.set_origin(PROCESS_START)
+    installed = install_requirements()
+    # El entorno cambió por fuera (huella al día pero falta un módulo): se
+    # fuerza la instalación antes de arrancar. Un error durante la sesión
+    # no reinstala nada ni vuelve a abrir la aplicación
+    if not installed and missing_modules():
+        install_requirements(force=True)
+    metrics.mark("startup.requirements")
     from launcher import check_and_launch
+
     check_and_launch()
 
 
@@ -1,31 +1,52 @@
-import json
 import os
 import random
 import threading
-import webbrowser
+import time
 import re
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlencode, urlparse, parse_qs, quote
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import requests
 import tkinter as tk
 from tkinter import messagebox, ttk
 from functools import partial, lru_cache
+from typing import Callable, Iterable
 
+from data.activity_dao import DB_PATH
+from data.maintenance import MaintenanceWorker, optimize
 from domain import use_cases
+from domain.caches import (
+    DB_CANDIDATES, EPIC_INSTALLED, PROBABILITIES, STEAM_INSTALLED, caches,
+)
+from domain.change_tracking import CandidateIndex, DataVersionWatcher
+from domain.suggestion_controller import SuggestionController, item_key
 from presentation.widgets.styles import apply_style, get_color, add_button_hover
 from presentation.utils.window_utils import WindowUtils
 from presentation.utils.config_utils import load_settings, save_settings
 from presentation.widgets.simple_entry_dialog import SimpleEntryDialog
 from presentation.widgets.toggle_switch import ToggleSwitch
 from presentation.utils import i18n
+from infrastructure.metrics import metrics
 
+CHANGE_POLL_MS = 2000  # cada cuánto se mira PRAGMA data_version
+IDLE_CHECK_MS = 30000  # cada cuánto se comprueba si la ventana está inactiva
+IDLE_AFTER_S = 60  # sin teclado ni ratón durante este tiempo → mantenimiento
+IMPORT_BATCH = 200  # juegos por transacción al importar bibliotecas
+EPIC_RESUME_TTL = 3600  # los cursores de Epic caducan; no se reanuda pasado esto
 
+# requests, xml.etree, http.server, webbrowser y urllib sólo hacen falta para
+# las acciones de Steam/Epic, así que se importan dentro de cada función para
+# no pagar su coste al arrancar.
 
 
-def start_app() -> None:
-    """Launch the main HobbyPicker window."""
+
+
+def start_app(
+    update_check: Callable[[], bool] | None = None,
+    on_update: Callable[[], None] | None = None,
+) -> None:
+    """Launch the main HobbyPicker window.
+
+    *update_check* runs on a background thread once the window is up; when it
+    returns ``True`` a non-modal banner offers to run *on_update*.
+    """
     root = tk.Tk()
     root.state("zoomed")
     WindowUtils.center_window(root, 1240, 600)
@@ -45,6 +66,7 @@ def start_app() -> None:
     include_games_label = None
     games_only_label = None
     filter_label = None
+    update_banner = None  # aviso de actualización, creado bajo demanda
 
     refresh_probabilities = None  # placeholder, defined after table creation
 
@@ -74,6 +96,10 @@ def start_app() -> None:
         return epic_token
 
     def login_steam_id() -> str | None:
+        import webbrowser
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+        from urllib.parse import urlencode, urlparse, parse_qs
+
         result = {"id": None}
 
         class Handler(BaseHTTPRequestHandler):
@@ -112,6 +138,112 @@ def start_app() -> None:
         httpd.server_close()
         return result["id"]
 
+    def run_library_import(
+        title: str,
+        hobby_name: str,
+        progress_key: str,
+        success_key: str,
+        error_key: str,
+        names: Callable[[dict], Iterable[str]],
+    ) -> None:
+        """Import games from a library without blocking the window.
+
+        ``names(state)`` runs on a worker thread and yields game names as it
+        finds them, updating ``state["done"]``/``state["total"]`` (a total of
+        0 means unknown). They are sent in batches of IMPORT_BATCH and each
+        batch is inserted here, on the Tk thread, in a single transaction.
+        """
+        import queue
+
+        dlg = tk.Toplevel(root)
+        apply_style(dlg)
+        dlg.title(title)
+        dlg.transient(root)
+        dlg.grab_set()
+        WindowUtils.center_window(dlg, 420, 110)
+        status = ttk.Label(dlg, text=tr(progress_key).format(done=0, total="?"))
+        status.pack(padx=20, pady=(15, 5))
+        bar = ttk.Progressbar(dlg, mode="indeterminate", length=360)
+        bar.pack(padx=20, pady=5)
+        bar.start(50)
+        dlg.protocol("WM_DELETE_WINDOW", lambda: None)  # se cierra al terminar
+
+        # Contadores que escribe el hilo de trabajo y lee poll()
+        state: dict = {"done": 0, "total": 0, "games": 0, "imported": 0, "hobby_id": None}
+        batches: queue.Queue = queue.Queue()
+
+        def worker() -> None:
+            try:
+                batch: list[str] = []
+                for name in names(state):
+                    batch.append(name)
+                    if len(batch) >= IMPORT_BATCH:
+                        batches.put(batch)
+                        batch = []
+                batches.put(batch)
+            except Exception as exc:
+                state["error"] = exc
+            finally:
+                batches.put(None)
+
+        def insert(batch: list[str]) -> None:
+            if state["hobby_id"] is None:
+                state["hobby_id"] = use_cases.create_hobby(hobby_name)
+                state["existing"] = {
+                    s[2]
+                    for hid, _ in use_cases.get_all_hobbies()
+                    for s in use_cases.get_subitems_for_hobby(hid)
+                }
+            new_games = [g for g in dict.fromkeys(batch) if g not in state["existing"]]
+            state["existing"].update(new_games)
+            use_cases.add_subitems_to_hobby(state["hobby_id"], new_games)
+            state["games"] += len(batch)
+            state["imported"] += len(new_games)
+
+        def poll() -> None:
+            finished = False
+            try:
+                while not finished:
+                    batch = batches.get_nowait()
+                    if batch is None:
+                        finished = True
+                    elif batch:
+                        insert(batch)
+            except queue.Empty:
+                pass
+            except Exception as exc:
+                state["error"] = exc
+                finished = True
+            if state["total"] and str(bar.cget("mode")) != "determinate":
+                bar.stop()
+                bar.config(mode="determinate")
+            if state["total"]:
+                bar.config(maximum=state["total"], value=state["done"])
+            status.config(
+                text=tr(progress_key).format(done=state["done"], total=state["total"] or "?")
+            )
+            if not finished:
+                root.after(100, poll)
+                return
+            dlg.destroy()
+            if state["imported"]:
+                maintenance.after_import(state["imported"])
+                sync_views()
+                refresh_listbox()
+            if "error" in state or not state["games"]:
+                messagebox.showerror(tr("error"), tr(error_key))
+            elif state.get("partial"):
+                # "partial": clave del aviso cuando una fuente se cortó a medias
+                messagebox.showwarning(
+                    title,
+                    tr(success_key).format(count=state["imported"]) + "\n\n" + tr(state["partial"]),
+                )
+            else:
+                messagebox.showinfo(title, tr(success_key).format(count=state["imported"]))
+
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(100, poll)
+
     def import_steam_games() -> None:
         if not messagebox.askyesno("Steam", tr("steam_import_confirm")):
             return
@@ -119,85 +251,94 @@ def start_app() -> None:
         if not steam_id:
             messagebox.showerror("Steam", tr("steam_import_error"))
             return
-        try:
-            url = f"https://steamcommunity.com/profiles/{steam_id}/games?tab=all&xml=1"
-            data = requests.get(url, timeout=10).content
-            root_xml = ET.fromstring(data)
-            games = []
-            for g in root_xml.findall("./games/game"):
-                name = g.findtext("name")
-                appid = g.findtext("appID")
-                if not name or not appid:
-                    continue
-                if get_steam_app_type(int(appid)) == "dlc":
-                    continue
-                games.append(name)
-            games = list(dict.fromkeys(games))  # eliminate duplicates while preserving order
-            if not games:
-                raise ValueError
-            hobby_id = use_cases.create_hobby(tr("steam_hobby_name"))
-            all_existing = {
-                s[2]
-                for hid, _ in use_cases.get_all_hobbies()
-                for s in use_cases.get_subitems_for_hobby(hid)
-            }
-            new_games = [g for g in games if g not in all_existing]
-            for name in new_games:
-                use_cases.add_subitem_to_hobby(hobby_id, name)
-            build_activity_caches()
-            refresh_listbox()
-            messagebox.showinfo("Steam", tr("steam_import_success").format(count=len(new_games)))
-        except Exception:
-            messagebox.showerror(tr("error"), tr("steam_import_error"))
+
+        def steam_names(state: dict):
+            from infrastructure.lookup_cache import default_cache
+            from infrastructure.steam_store import (
+                fetch_app_type,
+                iter_app_types,
+                stream_owned_games,
+            )
+
+            names: dict[int, str] = {}
+
+            def owned():
+                # El XML se analiza mientras se descarga; cada juego sale en
+                # cuanto se cierra su etiqueta
+                for appid, name in stream_owned_games(steam_id):
+                    if appid not in names:
+                        names[appid] = name
+                        state["total"] += 1
+                    yield appid
+
+            # Los tipos se consultan en paralelo, con límite de peticiones
+            # (los ya guardados en la caché no consumen cupo)
+            for appid, app_type in iter_app_types(
+                owned(), fetch=fetch_app_type, cache=default_cache()
+            ):
+                state["done"] += 1
+                if app_type != "dlc":
+                    yield names[appid]
+
+        run_library_import(
+            "Steam",
+            tr("steam_hobby_name"),
+            "steam_import_progress",
+            "steam_import_success",
+            "steam_import_error",
+            steam_names,
+        )
 
     def import_epic_games() -> None:
         if not messagebox.askyesno("Epic Games", tr("epic_import_confirm")):
             return
-        try:
-            games: list[str] = []
-            token = login_epic_token()
-            if not token:
-                messagebox.showerror("Epic Games", tr("epic_login_error"))
-                return
-            games.extend(fetch_epic_library(token))
-            for path in discover_epic_manifests():
-                for manifest in path.glob("*.item"):
-                    try:
-                        data = json.loads(manifest.read_text(encoding="utf-8", errors="ignore"))
-                        name = data.get("DisplayName")
-                        if name:
-                            games.append(name)
-                    except Exception:
-                        pass
-            for path in discover_epic_catalogs():
-                for cache in path.glob("*.json"):
-                    try:
-                        data = json.loads(cache.read_text(encoding="utf-8", errors="ignore"))
-                        name = data.get("displayName") or data.get("DisplayName") or data.get("title")
-                        if name:
-                            games.append(name)
-                    except Exception:
-                        pass
-            games = list(dict.fromkeys(games))
-            if not games:
-                raise ValueError
-            hobby_id = use_cases.create_hobby(tr("epic_hobby_name"))
-            all_existing = {
-                s[2]
-                for hid, _ in use_cases.get_all_hobbies()
-                for s in use_cases.get_subitems_for_hobby(hid)
-            }
-            new_games = [g for g in games if g not in all_existing]
-            for name in new_games:
-                use_cases.add_subitem_to_hobby(hobby_id, name)
-            build_activity_caches()
-            refresh_listbox()
-            messagebox.showinfo(
-                "Epic Games",
-                tr("epic_import_success").format(count=len(new_games)),
-            )
-        except Exception:
-            messagebox.showerror(tr("error"), tr("epic_import_error"))
+        token = login_epic_token()
+        if not token:
+            messagebox.showerror("Epic Games", tr("epic_login_error"))
+            return
+
+        def epic_names(state: dict):
+            import hashlib
+            from infrastructure.epic_catalog import scan_catalog_names
+            from infrastructure.epic_store import LibraryPageError, iter_library_pages
+            from infrastructure.installed_index import default_index
+            from infrastructure.lookup_cache import default_cache
+
+            # Si la importación anterior se cortó, se sigue desde su cursor:
+            # las páginas previas ya están en la base de datos
+            resume = default_cache()
+            key = hashlib.sha256(token.encode()).hexdigest()
+            cursor = resume.get("epic_resume_cursor", key, None)
+            try:
+                for titles, _ in iter_library_pages(token, cursor):
+                    state["done"] += len(titles)
+                    yield from titles
+                resume.delete("epic_resume_cursor", key)
+            except LibraryPageError as exc:
+                # Se sigue con lo local, pero el aviso final dirá que faltan páginas
+                if exc.cursor == cursor:
+                    # El cursor guardado ya no sirve: la próxima vez, desde el principio
+                    resume.delete("epic_resume_cursor", key)
+                    state["partial"] = "epic_import_partial_restart"
+                else:
+                    resume.put("epic_resume_cursor", key, exc.cursor, ttl=EPIC_RESUME_TTL)
+                    state["partial"] = "epic_import_partial"
+            for name, _ in default_index().scan("epic", discover_epic_manifests()):
+                state["done"] += 1
+                yield name
+            # Las cachés del catálogo pueden ser miles de JSON: se leen en paralelo
+            for name in scan_catalog_names(discover_epic_catalogs()):
+                state["done"] += 1
+                yield name
+
+        run_library_import(
+            "Epic Games",
+            tr("epic_hobby_name"),
+            "epic_import_progress",
+            "epic_import_success",
+            "epic_import_error",
+            epic_names,
+        )
 
     def reset_counts() -> None:
         if not messagebox.askyesno(
@@ -205,112 +346,56 @@ def start_app() -> None:
         ):
             return
         use_cases.reset_counts()
-        build_activity_caches()
+        sync_views()
         refresh_listbox()
         messagebox.showinfo(
             tr("btn_reset_counts"), tr("reset_counts_success")
         )
 
-    @lru_cache(maxsize=None)
     def get_steam_appid(game_name: str) -> int | None:
+        from infrastructure.app_catalog import default_catalog
+        from infrastructure.lookup_cache import default_cache
+        from infrastructure.steam_store import TransientError, fetch_appid
+
+        # Primero el catálogo local importado (si lo hay); la red sólo para lo que no esté
+        appid = default_catalog().lookup(game_name)
+        if appid is not None:
+            return appid
+        # Caché persistente con TTL: sobrevive al reinicio y guarda también los fallos
         try:
-            resp = requests.get(
-                "https://steamcommunity.com/actions/SearchApps/" + quote(game_name),
-                timeout=5,
-            )
-            data = resp.json()
-            return int(data[0]["appid"]) if data else None
-        except Exception:
+            return default_cache().get_or_fetch("steam_appid", game_name, fetch_appid)
+        except TransientError:
             return None
 
-    @lru_cache(maxsize=None)
-    def get_steam_app_type(appid: int) -> str | None:
-        try:
-            resp = requests.get(
-                f"https://store.steampowered.com/api/appdetails?appids={appid}&filters=basic",
-                timeout=5,
-            )
-            data = resp.json()
-            info = data.get(str(appid), {})
-            if info.get("success"):
-                return info.get("data", {}).get("type")
-        except Exception:
-            pass
-        return None
-
     @lru_cache(maxsize=1)
     def discover_steam_libraries() -> list[Path]:
-        paths: list[Path] = []
-        candidate_roots: list[Path] = []
-        if os.name == "nt":
-            pf_x86 = os.environ.get("PROGRAMFILES(X86)")
-            pf = os.environ.get("PROGRAMFILES")
-            if pf_x86:
-                candidate_roots.append(Path(pf_x86) / "Steam")
-            if pf:
-                candidate_roots.append(Path(pf) / "Steam")
-            for letter in "CDEFGHIJKLMNOPQRSTUVWXYZ":
-                base = Path(f"{letter}:/")
-                candidate_roots.extend(
-                    [
-                        base / "Steam",
-                        base / "SteamLibrary",
-                        base / "Program Files/Steam",
-                        base / "Program Files (x86)/Steam",
-                    ]
-                )
-        else:
-            candidate_roots.extend(
-                [
-                    Path.home() / ".steam/steam",
-                    Path.home() / ".local/share/Steam",
-                    Path.home() / "Library/Application Support/Steam",
-                ]
-            )
-        for root in candidate_roots:
-            steamapps = root / "steamapps"
-            if steamapps.exists():
-                paths.append(steamapps)
-                vdf = steamapps / "libraryfolders.vdf"
-                if vdf.exists():
-                    try:
-                        text = vdf.read_text(encoding="utf-8", errors="ignore")
-                        for folder in re.findall(r'"path"\s*"([^"]+)"', text):
-                            lib_path = Path(folder).expanduser()
-                            candidate = lib_path / "steamapps"
-                            if candidate.exists():
-                                paths.append(candidate)
-                    except Exception:
-                        pass
-        unique: list[Path] = []
-        for p in paths:
-            resolved = p.resolve()
-            if resolved not in unique:
-                unique.append(resolved)
-        return unique
+        from infrastructure.steam_libraries import discover_libraries
+
+        # Sondeo concurrente con límite de tiempo; el resultado persiste entre
+        # sesiones y sólo se repite si cambia algún libraryfolders.vdf
+        return discover_libraries()
 
     def _normalize_game_name(name: str) -> str:
         return re.sub(r"[^a-z0-9]+", "", name.lower())
 
-    @lru_cache(maxsize=1)
+    def installed_map(launcher: str, pairs) -> dict:
+        """``{nombre normalizado: appid/AppName}`` a partir de las filas del índice.
+
+        Las filas sin referencia (sólo sirven para importar el nombre) no cuentan
+        como instaladas: no hay con qué lanzarlas.
+        """
+        if launcher == "steam":
+            return {_normalize_game_name(name): int(ref) for name, ref in pairs if ref}
+        return {_normalize_game_name(name): ref for name, ref in pairs if ref}
+
     def load_installed_games() -> dict[str, int]:
-        games: dict[str, int] = {}
-        for path in discover_steam_libraries():
-            for manifest in path.glob("appmanifest_*.acf"):
-                try:
-                    text = manifest.read_text(encoding="utf-8", errors="ignore")
-                    appid_match = re.search(r'"appid"\s*"(\d+)"', text)
-                    name_match = re.search(r'"name"\s*"([^\"]+)"', text)
-                    if appid_match and name_match:
-                        games[_normalize_game_name(name_match.group(1))] = int(
-                            appid_match.group(1)
-                        )
-                except Exception:
-                    pass
-        return games
+        from infrastructure.installed_index import default_index
+
+        # Sólo se releen los manifiestos nuevos o modificados desde el último escaneo
+        return installed_map("steam", default_index().scan("steam", discover_steam_libraries()))
 
     def get_local_appid(game_name: str) -> int | None:
-        return load_installed_games().get(_normalize_game_name(game_name))
+        return caches.get(STEAM_INSTALLED).get(_normalize_game_name(game_name))
 
     @lru_cache(maxsize=1)
     def discover_epic_manifests() -> list[Path]:
@@ -352,54 +437,17 @@ def start_app() -> None:
                 paths.append(root)
         return paths
 
-    @lru_cache(maxsize=1)
-    def fetch_epic_library(token: str) -> list[str]:
-        if not token:
-            return []
-        records: list[str] = []
-        cursor: str | None = None
-        try:
-            while True:
-                params = {"includeMetadata": "true"}
-                if cursor:
-                    params["cursor"] = cursor
-                resp = requests.get(
-                    "https://library-service.live.use1a.on.epicgames.com/library/api/public/items",
-                    headers={"Authorization": f"Bearer {token}"},
-                    params=params,
-                    timeout=5,
-                )
-                data = resp.json()
-                records.extend(
-                    e.get("title") for e in data.get("records", []) if e.get("title")
-                )
-                cursor = data.get("responseMetadata", {}).get("nextCursor")
-                if not cursor:
-                    break
-            return records
-        except Exception:
-            return []
-
-    @lru_cache(maxsize=1)
     def load_epic_installed_games() -> dict[str, str]:
-        games: dict[str, str] = {}
-        for path in discover_epic_manifests():
-            for manifest in path.glob("*.item"):
-                try:
-                    data = json.loads(manifest.read_text(encoding="utf-8", errors="ignore"))
-                    display = data.get("DisplayName")
-                    appname = data.get("AppName")
-                    if display and appname:
-                        games[_normalize_game_name(display)] = appname
-                except Exception:
-                    pass
-        return games
+        from infrastructure.installed_index import default_index
+
+        return installed_map("epic", default_index().scan("epic", discover_epic_manifests()))
 
     def get_epic_appname(game_name: str) -> str | None:
-        return load_epic_installed_games().get(_normalize_game_name(game_name))
+        return caches.get(EPIC_INSTALLED).get(_normalize_game_name(game_name))
 
     def show_epic_game_popup(game_name: str) -> None:
-        load_epic_installed_games.cache_clear()
+        if not installed_is_watched("epic"):
+            caches.invalidate(EPIC_INSTALLED)  # puede haberse instalado hace un momento
         installed = get_epic_appname(game_name) is not None
         dlg = tk.Toplevel(root)
         apply_style(dlg)
@@ -416,6 +464,9 @@ def start_app() -> None:
         ).pack(padx=20, pady=15)
 
         def act() -> None:
+            import webbrowser
+            from urllib.parse import quote
+
             local_app = get_epic_appname(game_name)
             if local_app:
                 webbrowser.open(
@@ -437,7 +488,8 @@ def start_app() -> None:
         add_button_hover(btn)
 
     def show_game_popup(game_name: str) -> None:
-        load_installed_games.cache_clear()
+        if not installed_is_watched("steam"):
+            caches.invalidate(STEAM_INSTALLED)  # puede haberse instalado hace un momento
         appid = get_local_appid(game_name)
         installed = appid is not None
         if not installed:
@@ -460,6 +512,8 @@ def start_app() -> None:
         ).pack(padx=20, pady=15)
 
         def act() -> None:
+            import webbrowser
+
             local_id = get_local_appid(game_name)
             if local_id:
                 webbrowser.open(f"steam://rungameid/{local_id}")
@@ -476,45 +530,86 @@ def start_app() -> None:
         )
         btn.pack(pady=(0, 15))
         add_button_hover(btn)
-    activity_lists = {}
+    controller = SuggestionController(
+        is_game_label=lambda label: is_steam_game_label(label)
+        or is_epic_game_label(label)
+    )
 
-    def build_activity_caches() -> None:
-        """Cache weighted activity lists for quick toggle switches."""
+    caches_ready = False  # False mientras la carga inicial sigue en segundo plano
+    library_watcher = None  # vigila las carpetas de manifiestos una vez cargado todo
+    # ANALYZE y vacuum incremental en su propio hilo y conexión
+    maintenance = MaintenanceWorker(DB_PATH)
+
+    def on_library_change(launcher: str, paths: set[str] | None) -> None:
+        """Apply a watcher event to the index and the installed-games domain.
+
+        Runs on the watcher thread; ``CacheRegistry.put`` is thread-safe and
+        refuses the value if the domain changed meanwhile.
+        """
+        from infrastructure.installed_index import default_index
+
+        name = STEAM_INSTALLED if launcher == "steam" else EPIC_INSTALLED
+        epoch = caches.epoch(name)
+        index = default_index()
+        if paths is None:
+            discover = discover_steam_libraries if launcher == "steam" else discover_epic_manifests
+            pairs = index.scan(launcher, discover())
+        elif index.refresh_paths(launcher, paths):
+            pairs = index.games(launcher)
+        else:
+            return
+        caches.put(name, installed_map(launcher, pairs), epoch)
+
+    def rediscover_libraries() -> dict[str, list[Path]]:
+        # En el hilo del vigilante: bibliotecas nuevas, carpetas recreadas o
+        # un lanzador instalado después de abrir la aplicación
         discover_steam_libraries.cache_clear()
-        load_installed_games.cache_clear()
         discover_epic_manifests.cache_clear()
-        load_epic_installed_games.cache_clear()
-        discover_steam_libraries()
-        load_installed_games()
-        discover_epic_manifests()
-        load_epic_installed_games()
-        def filter_no_games(item):
-            _, label, is_sub, _ = item
-            return not (
-                is_sub
-                and (is_steam_game_label(label) or is_epic_game_label(label))
-            )
+        return {"steam": discover_steam_libraries(), "epic": discover_epic_manifests()}
 
-        activity_lists["all"] = use_cases.build_weighted_items()
-        activity_lists["no_games"] = use_cases.build_weighted_items(filter_no_games)
-        def filter_games(item):
-            _, label, is_sub, _ = item
-            return is_sub and (
-                is_steam_game_label(label) or is_epic_game_label(label)
-            )
+    def start_library_watcher() -> None:
+        nonlocal library_watcher
+        from infrastructure.library_watcher import LibraryWatcher
 
-        activity_lists["games"] = use_cases.build_weighted_items(filter_games)
-        if refresh_probabilities:
-            refresh_probabilities()
+        library_watcher = LibraryWatcher(
+            {"steam": discover_steam_libraries(), "epic": discover_epic_manifests()},
+            on_library_change,
+            discover=rediscover_libraries,
+        )
+        library_watcher.start()
+
+    def installed_is_watched(launcher: str) -> bool:
+        return library_watcher is not None and library_watcher.watching(launcher)
 
-    build_activity_caches()
+    def scan_steam_installed() -> dict[str, int]:
+        from infrastructure.steam_libraries import discover_libraries
 
-    def current_items_weights():
-        if not include_games_var.get():
-            return activity_lists["no_games"]
-        if games_only_var.get():
-            return activity_lists["games"]
-        return activity_lists["all"]
+        discover_steam_libraries.cache_clear()
+        if not discover_steam_libraries():
+            # Nada guardado: Steam puede haberse instalado hace un momento
+            discover_libraries(refresh=True)
+            discover_steam_libraries.cache_clear()
+        return load_installed_games()
+
+    def scan_epic_installed() -> dict[str, str]:
+        discover_epic_manifests.cache_clear()
+        return load_epic_installed_games()
+
+    # Tras el primer volcado completo sólo se releen los hobbies modificados
+    candidate_index = CandidateIndex()
+
+    def load_db_candidates():
+        candidate_index.refresh(use_cases.get_dao())
+        controller.load(*candidate_index.weighted_items())
+        return controller.activity_lists
+
+    # Cada dominio se reconstruye sólo cuando se pide estando obsoleto; las
+    # mutaciones de use_cases declaran qué invalidan (ver domain.caches)
+    caches.register(STEAM_INSTALLED, scan_steam_installed)
+    caches.register(EPIC_INSTALLED, scan_epic_installed)
+    caches.register(DB_CANDIDATES, load_db_candidates)
+
+    current_items_weights = controller.current_items_weights
 
     canvas = None  # se asigna más tarde
     separator = None  # línea divisoria asignada después
@@ -548,7 +643,7 @@ def start_app() -> None:
         if games_only_label is not None:
             games_only_label.config(foreground=get_color("contrast"))
         if refresh_probabilities:
-            refresh_probabilities()
+            refresh_probabilities(force=True)
         save_current_settings()
 
     menubar = tk.Menu(root)
@@ -593,7 +688,7 @@ def start_app() -> None:
     def update_texts() -> None:
         notebook.tab(0, text=tr("tab_today"))
         notebook.tab(1, text=tr("tab_config"))
-        suggestion_label.config(text=tr("prompt"))
+        suggestion_label.config(text=tr("prompt") if caches_ready else tr("loading"))
         suggest_btn.config(text=tr("suggest_button"))
         add_hobby_btn.config(text=tr("add_hobby"))
         prob_table.heading("activity", text=tr("col_activity"))
@@ -612,6 +707,9 @@ def start_app() -> None:
             )
         if filter_label is not None:
             filter_label.config(text=tr("filter"), foreground=get_color("contrast"))
+        if update_banner is not None:
+            update_banner.label.config(text=tr("update_available"))
+            update_banner.button.config(text=tr("update_restart"))
         if final_canvas is not None and overlay_buttons:
             final_canvas.itemconfigure(
                 "final_text", text=tr("what_about").format(current_activity["name"])
@@ -680,7 +778,25 @@ def start_app() -> None:
     prob_table.grid(row=1, column=0, sticky="nsew")
     v_scroll.grid(row=1, column=1, sticky="ns")
 
-    def refresh_probabilities():
+    def probability_rows() -> list[tuple[str, str, float, bool]]:
+        """``(key, name, probability, is_game)`` for the current partition.
+
+        Builder of the ``PROBABILITIES`` cache: no Tk calls, so it can run
+        under the registry lock on any thread.
+        """
+        items, weights = current_items_weights()
+        total_weight = sum(weights)
+        return [
+            (
+                item_key(item_id, is_sub),
+                name,
+                weight / total_weight,
+                bool(is_sub) and (is_steam_game_label(name) or is_epic_game_label(name)),
+            )
+            for (item_id, name, is_sub), weight in zip(items, weights)
+        ]
+
+    def render_probabilities(rows) -> None:
         for row in prob_table.get_children():
             prob_table.delete(row)
         prob_table.tag_configure(
@@ -689,48 +805,57 @@ def start_app() -> None:
         prob_table.tag_configure(
             "odd", background=get_color("light"), foreground=get_color("text")
         )
-        items, weights = current_items_weights()
-        if not items:
-            return
-        total_weight = sum(weights)
         filter_text = filter_var.get().lower()
         i = 0
-        for (item_id, name, is_sub), weight in zip(items, weights):
+        for iid, name, prob, is_game in rows:
             if filter_text and filter_text not in name.lower():
                 continue
             tag = "even" if i % 2 == 0 else "odd"
-            prob = weight / total_weight
-            iid = f"{'s' if is_sub else 'h'}{item_id}"
-            game_icon = (
-                "🎮"
-                if is_sub
-                and (is_steam_game_label(name) or is_epic_game_label(name))
-                else ""
-            )
             prob_table.insert(
                 "",
                 "end",
                 iid=iid,
-                values=(name, f"{prob*100:.1f}%", "ⓘ", game_icon, "🗑"),
+                values=(name, f"{prob*100:.1f}%", "ⓘ", "🎮" if is_game else "", "🗑"),
                 tags=(tag,),
             )
             i += 1
 
-    refresh_probabilities()
+    drawn_probabilities = None  # filas dibujadas por última vez
+
+    def refresh_probabilities(force: bool = False) -> None:
+        """Draw the probability rows, rebuilding them first if they are stale.
+
+        Without *force* the table is only redrawn when the cached rows
+        changed. During the background start-up load nothing happens: the
+        loader draws the table when it finishes.
+        """
+        nonlocal drawn_probabilities
+        if not caches_ready:
+            return
+        rows = caches.get(PROBABILITIES)
+        if force or rows is not drawn_probabilities:
+            render_probabilities(rows)
+            drawn_probabilities = rows
+
+    caches.register(PROBABILITIES, probability_rows, depends_on=(DB_CANDIDATES,))
 
-    filter_var.trace_add("write", lambda *_: refresh_probabilities())
+    filter_var.trace_add("write", lambda *_: refresh_probabilities(force=True))
 
     def on_toggle_update():
         nonlocal games_only_switch
-        if games_only_var.get():
-            include_games_var.set(True)
-        if not include_games_var.get():
-            games_only_var.set(False)
+        include_games, games_only = controller.set_toggles(
+            include_games_var.get(), games_only_var.get()
+        )
+        include_games_var.set(include_games)
+        games_only_var.set(games_only)
+        if not include_games:
             if games_only_switch is not None:
                 games_only_switch.state(["disabled"])
         else:
             if games_only_switch is not None:
                 games_only_switch.state(["!disabled"])
+        # Otra partición: las filas guardadas ya no valen
+        caches.invalidate(PROBABILITIES)
         refresh_probabilities()
 
     toggle_container = ttk.Frame(content_frame, style="Surface.TFrame")
@@ -768,7 +893,7 @@ def start_app() -> None:
 
     suggestion_label = ttk.Label(
         content_frame,
-        text=tr("prompt"),
+        text=tr("loading"),
         font=("Segoe UI", 28, "bold"),
         wraplength=500,
         justify="center",
@@ -784,7 +909,7 @@ def start_app() -> None:
         highlightthickness=0,
     )
 
-    current_activity = {"id": None, "name": None, "is_subitem": False}
+    current_activity = controller.current
 
     def revert_to_idle() -> None:
         nonlocal final_canvas, final_timeout_id
@@ -903,8 +1028,8 @@ def start_app() -> None:
             if table_frame is not None:
                 table_frame.grid()
             button_container.pack(side="bottom", fill="x", pady=20)
-        items, weights = current_items_weights()
-        result = random.choices(items, weights=weights, k=1)[0] if items else None
+        caches.get(DB_CANDIDATES)
+        result = controller.suggest()
         if not result:
             suggestion_label.config(
                 text=tr("no_hobbies")
@@ -913,16 +1038,8 @@ def start_app() -> None:
             toggle_container.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=10)
             return
 
-        final_id, final_text, is_sub = result
-        current_activity["id"] = final_id
-        current_activity["name"] = final_text
-        current_activity["is_subitem"] = is_sub
-
-        options = []
-        for _ in range(20):
-            if items:
-                alt = random.choices(items, weights=weights, k=1)[0]
-                options.append(alt[1])
+        final_text = result[1]
+        options = [alt[1] for alt in controller.sample(20)]
         options += [final_text, ""]
 
         animation_canvas.delete("all")
@@ -1005,18 +1122,12 @@ def start_app() -> None:
                 if is_game
                 else ""
             )
-            use_cases.mark_activity_as_done(
-                current_activity["id"], current_activity["is_subitem"]
-            )
-            build_activity_caches()
+            controller.accept()
             if is_game:
                 if is_steam_game:
                     show_game_popup(game_name)
                 else:
                     show_epic_game_popup(game_name)
-            current_activity["id"] = None
-            current_activity["name"] = None
-            current_activity["is_subitem"] = False
             suggestion_label.config(text=tr("prompt"))
             suggestion_label.pack(pady=20, expand=True)
             toggle_container.place(relx=1.0, rely=0.0, anchor="ne", x=-10, y=10)
@@ -1067,11 +1178,20 @@ def start_app() -> None:
     )
     suggest_btn.pack(pady=10)
     add_button_hover(suggest_btn)
+    suggest_btn.state(["disabled"])  # se habilita cuando las cachés están listas
 
-    def on_tab_change(event):
-        if notebook.index("current") == 0:
+    def sync_views() -> None:
+        """Re-render what a mutation left stale, only if it is on screen.
+
+        During the background start-up load nothing is rebuilt here: the
+        loader notices the invalidation and rebuilds when it finishes.
+        """
+        if caches_ready and notebook.index("current") == 0:
             refresh_probabilities()
 
+    def on_tab_change(event):
+        sync_views()
+
     notebook.bind("<<NotebookTabChanged>>", on_tab_change)
 
     # --- Pestaña: Configurar hobbies ---
@@ -1154,7 +1274,7 @@ def start_app() -> None:
         ):
             use_cases.delete_hobby(hobby_id)
             refresh_listbox()
-            build_activity_caches()
+            sync_views()
             messagebox.showinfo(tr("deleted"), tr("hobby_deleted").format(name=hobby_name))
 
     def on_prob_table_click(event):
@@ -1174,8 +1294,7 @@ def start_app() -> None:
                     tr("delete"), tr("delete_subitem_confirm").format(name=name)
                 ):
                     use_cases.delete_subitem(int(row_id[1:]))
-                    build_activity_caches()
-                    refresh_probabilities()
+                    sync_views()
         elif column == "#3":
             if row_id.startswith("h"):
                 open_edit_hobby_window(int(row_id[1:]), name)
@@ -1188,8 +1307,7 @@ def start_app() -> None:
                 )
                 if new_name:
                     use_cases.update_subitem(int(row_id[1:]), new_name.strip())
-                    build_activity_caches()
-                    refresh_probabilities()
+                    sync_views()
         elif column == "#4":
             if row_id.startswith("s"):
                 game_name = name.split(" + ", 1)[1]
@@ -1211,6 +1329,9 @@ def start_app() -> None:
         if not row_id:
             return
         name = prob_table.item(row_id, "values")[0]
+        import webbrowser
+        from urllib.parse import quote
+
         if row_id.startswith("s") and is_steam_game_label(name):
             game_name = name.split(" + ", 1)[1]
             appid = get_local_appid(game_name)
@@ -1275,7 +1396,7 @@ def start_app() -> None:
                     if new_name and new_name.strip() != current_name:
                         use_cases.update_subitem(subitem_id, new_name.strip())
                         refresh_items()
-                        build_activity_caches()
+                        sync_views()
 
                 ttk.Button(
                     row,
@@ -1293,7 +1414,7 @@ def start_app() -> None:
             ):
                 use_cases.delete_subitem(item_id)
                 refresh_items()
-                build_activity_caches()
+                sync_views()
 
         def add_subitem():
             new_item = SimpleEntryDialog.ask(
@@ -1304,7 +1425,7 @@ def start_app() -> None:
             if new_item:
                 use_cases.add_subitem_to_hobby(hobby_id, new_item.strip())
                 refresh_items()
-                build_activity_caches()
+                sync_views()
 
         btn_add_sub = ttk.Button(
             edit_window, text=tr("add_subitem_btn"), command=add_subitem
@@ -1380,7 +1501,7 @@ def start_app() -> None:
                 sub = entry.get().strip()
                 if sub:
                     use_cases.add_subitem_to_hobby(hobby_id, sub)
-            build_activity_caches()
+            sync_views()
             add_window.destroy()
             refresh_listbox()
 
@@ -1395,4 +1516,187 @@ def start_app() -> None:
         add_window.maxsize(500, 400)
 
     refresh_listbox()
+
+    # --- Comprobación de actualizaciones en segundo plano ---
+    def show_update_banner() -> None:
+        nonlocal update_banner
+        if update_banner is not None:
+            return
+        update_banner = ttk.Frame(root, style="Surface.TFrame", padding=6)
+        update_banner.label = ttk.Label(
+            update_banner, text=tr("update_available"), style="Surface.TLabel"
+        )
+        update_banner.label.pack(side="left", padx=(10, 10))
+
+        def restart_to_update() -> None:
+            try:
+                on_update()
+            except Exception:
+                messagebox.showerror(tr("error"), tr("update_error"))
+
+        def dismiss() -> None:
+            nonlocal update_banner
+            update_banner.destroy()
+            update_banner = None
+
+        update_banner.button = ttk.Button(
+            update_banner, text=tr("update_restart"), command=restart_to_update
+        )
+        update_banner.button.pack(side="left")
+        add_button_hover(update_banner.button)
+        ttk.Button(update_banner, text="✕", width=3, command=dismiss).pack(
+            side="right", padx=(0, 10)
+        )
+        update_banner.pack(fill="x", before=notebook)
+
+    def start_update_check() -> None:
+        result: dict[str, bool | None] = {"available": None}
+
+        def worker() -> None:
+            try:
+                result["available"] = bool(update_check())
+            except Exception:
+                result["available"] = False
+
+        # Tk no es thread-safe: el hilo sólo deja el resultado y el bucle lo recoge
+        def poll() -> None:
+            if result["available"] is None:
+                root.after(500, poll)
+            elif result["available"] and on_update is not None:
+                show_update_banner()
+
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(500, poll)
+
+    if update_check is not None:
+        start_update_check()
+
+    # --- Arranque progresivo ---
+    def load_caches_in_background() -> None:
+        """Scan game libraries and build the weighted lists off the UI thread.
+
+        The window is shown first in a skeleton state (empty table, "Sugerir"
+        disabled); the Tk loop polls for the result and installs it.
+        """
+        result: dict = {}
+        # Si algo invalida un dominio durante la carga, su resultado se descarta
+        epochs = {
+            name: caches.epoch(name)
+            for name in (STEAM_INSTALLED, EPIC_INSTALLED, DB_CANDIDATES)
+        }
+
+        def worker() -> None:
+            from data.activity_dao import DB_PATH, ActivityDAO
+            from domain.suggestion_controller import lists_from_packed
+            from infrastructure import candidate_snapshot
+
+            def rows():
+                active = use_cases.get_dao()
+                if active.in_memory:
+                    # Modo memoria: los datos vivos están en RAM; su DAO es
+                    # seguro entre hilos y el fichero es sólo la copia
+                    return use_cases.collect_candidates(dao=active)
+                # Conexión propia: la compartida pertenece al hilo de Tk
+                dao = ActivityDAO()
+                try:
+                    return use_cases.collect_candidates(dao=dao)
+                finally:
+                    dao.conn.close()
+
+            try:
+                result[STEAM_INSTALLED] = load_installed_games()
+                result[EPIC_INSTALLED] = load_epic_installed_games()
+                # Arranque en caliente: el snapshot en disco evita consultar SQLite
+                with candidate_snapshot.load_or_build(
+                    DB_PATH, rows, controller.is_game_label
+                ) as snapshot:
+                    result[DB_CANDIDATES] = lists_from_packed(snapshot.packed)
+            except Exception as exc:
+                result["error"] = exc
+            metrics.mark("startup.caches_built")
+
+        def poll() -> None:
+            nonlocal caches_ready
+            if not result:
+                root.after(50, poll)
+                return
+            for name in (STEAM_INSTALLED, EPIC_INSTALLED):
+                if name in result:
+                    caches.put(name, result[name], epochs[name])
+            if DB_CANDIDATES in result and caches.epoch(DB_CANDIDATES) == epochs[DB_CANDIDATES]:
+                controller.load(*result[DB_CANDIDATES])
+                caches.put(DB_CANDIDATES, controller.activity_lists)
+            caches_ready = True
+            # Con error o con datos ya obsoletos se reconstruye aquí mismo
+            refresh_probabilities()
+            start_change_polling()
+            # Desde aquí las instalaciones llegan como eventos: los popups ya no reescanean
+            start_library_watcher()
+            # En modo memoria el fichero es sólo la copia de seguridad: el
+            # mantenimiento (ANALYZE) va por la conexión en RAM y no se compacta
+            active_dao = use_cases.get_dao()
+            maintenance.start(active_dao if active_dao.in_memory else None)
+            root.after(IDLE_CHECK_MS, idle_maintenance)
+            suggestion_label.config(text=tr("prompt"))
+            suggest_btn.state(["!disabled"])
+            metrics.mark("startup.interactive")
+            if os.environ.get("HOBBYPICKER_DEBUG"):
+                print("⏱️ Arranque:", {k: f"{v:.3f}s" for k, v in metrics.timeline().items()})
+
+        threading.Thread(target=worker, daemon=True).start()
+        root.after(50, poll)
+
+    # --- Cambios hechos por otros procesos (CLI, otra ventana, servidor) ---
+    def start_change_polling() -> None:
+        watcher = DataVersionWatcher(use_cases.get_dao())
+
+        def poll() -> None:
+            if watcher.changed():
+                caches.invalidate(DB_CANDIDATES)
+                sync_views()
+            root.after(CHANGE_POLL_MS, poll)
+
+        root.after(CHANGE_POLL_MS, poll)
+
+    # --- Mantenimiento de la base de datos cuando nadie usa la ventana ---
+    last_input = time.monotonic()
+
+    def mark_input(_event=None) -> None:
+        nonlocal last_input
+        last_input = time.monotonic()
+
+    root.bind_all("<Any-KeyPress>", mark_input, add="+")
+    root.bind_all("<Any-ButtonPress>", mark_input, add="+")
+
+    def idle_maintenance() -> None:
+        if time.monotonic() - last_input >= IDLE_AFTER_S:
+            maintenance.request_prune_tombstones()
+            if not use_cases.get_dao().in_memory:
+                maintenance.request_vacuum_step()
+        root.after(IDLE_CHECK_MS, idle_maintenance)
+
+    metrics.mark("startup.window_built")
+    root.after_idle(lambda: metrics.mark("startup.first_frame"))
+    load_caches_in_background()
+
     root.mainloop()
+
+    # La ventana ya está cerrada: aquí sí se puede esperar a la base de datos
+    maintenance.stop()
+    if library_watcher is not None:
+        library_watcher.stop(timeout=1.0)
+    dao = use_cases.get_dao()
+    if not dao.in_memory:
+        optimize(dao.conn)
+
+    # Deja el snapshot al día para que el próximo arranque no consulte SQLite
+    if caches_ready:
+        from infrastructure import candidate_snapshot
+
+        if dao.in_memory:
+            dao.flush()  # modo en memoria: el fichero debe estar al día antes
+        candidate_snapshot.refresh_snapshot(
+            dao.db_path,
+            use_cases.collect_candidates,
+            controller.is_game_label,
+        )
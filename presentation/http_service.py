@@ -0,0 +1,471 @@
+"""Local HTTP suggestion service.
+
+Keeps the candidate lists and the sampler in memory and answers over
+localhost so other tools (stream decks, dashboards…) can ask for ideas::
+
+    GET  /suggest[?k=5&games=0&games_only=1]
+    POST /accept            body: {"key": "s12"}  (or POST /accept?key=s12)
+    GET  /probabilities[?games=0&games_only=1]
+    GET  /health
+
+Every endpoint accepts ``profile=<name>`` to use a per-profile database;
+open profiles are kept warm in a bounded LRU (:class:`ProfileCache`). Only
+existing profiles are served (404 otherwise): they are created from the CLI
+(``--profile``) or by ``serve --profile``, never by a request.
+
+With ``workers > 1`` a coordinator process publishes the packed candidate
+arrays through shared memory and N worker processes, sharing one listening
+socket, sample from that buffer without copying it (see
+:class:`SharedMemoryServer`).
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from data.activity_dao import DEFAULT_PROFILE, ActivityDAO, profile_db_path
+from domain import use_cases
+from domain.change_tracking import CandidateIndex
+from domain.profiles import ProfileCache, UnknownProfileError
+from domain.packed_candidates import pack_candidates
+from domain.suggestion_controller import (
+    SuggestionController,
+    item_key,
+    parse_item_key,
+    partition_name,
+)
+from infrastructure.shared_candidates import SharedCandidatePublisher, SharedCandidateReader
+from presentation.utils import i18n
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_K = 100
+# El cuerpo de POST /accept es un objeto JSON pequeño ({"key", "profile"})
+MAX_BODY = 4096
+
+
+def _is_game_label(label: str) -> bool:
+    return i18n.is_steam_game_label(label) or i18n.is_epic_game_label(label)
+
+
+class SuggestionService:
+    """Thread-safe front for the per-profile :class:`SuggestionController` s.
+
+    Each profile's weighted lists are rebuilt only when ``PRAGMA data_version``
+    reports a commit from another connection (GUI, CLI, ``reset_db.py``);
+    accepts made through the service update the cached weights in place.
+    """
+
+    def __init__(self, db_path: str | None = None, max_profiles: int = 32):
+        def path_for(name: str) -> str:
+            if db_path and name == DEFAULT_PROFILE:
+                return db_path
+            return profile_db_path(name)
+
+        self.profiles = ProfileCache(max_profiles, _is_game_label, path_for=path_for)
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def _controller_locked(self, profile: str | None) -> SuggestionController:
+        entry = self.profiles.get(profile)
+        if entry.refresh():
+            self.rebuilds += 1
+        return entry.controller
+
+    def suggest(
+        self,
+        k: int = 1,
+        include_games: bool = True,
+        games_only: bool = False,
+        profile: str | None = None,
+    ):
+        with self._lock:
+            controller = self._controller_locked(profile)
+            return controller.sample(k, partition_name(include_games, games_only))
+
+    def accept(self, key: str, profile: str | None = None):
+        item_id, is_sub = parse_item_key(key)
+        with self._lock:
+            controller = self._controller_locked(profile)
+            if controller.select(item_id, is_sub) is None:
+                return None
+            return controller.accept()
+
+    def probabilities(
+        self, include_games: bool = True, games_only: bool = False,
+        profile: str | None = None,
+    ):
+        with self._lock:
+            controller = self._controller_locked(profile)
+            return controller.probabilities(partition_name(include_games, games_only))
+
+    def health(self, profile: str | None = None) -> dict:
+        with self._lock:
+            controller = self._controller_locked(profile)
+            return {
+                "status": "ok",
+                "candidates": len(controller.activity_lists["all"][0]),
+                "rebuilds": self.rebuilds,
+                "profiles": self.profiles.stats(),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.profiles.close()
+
+
+class SharedSnapshotService:
+    """Worker-process service that samples from the shared-memory snapshot.
+
+    Accepts are written straight to the database; the coordinator notices the
+    commit through ``PRAGMA data_version`` and publishes a new generation.
+    """
+
+    def __init__(
+        self, control_name: str, db_path: str | None = None, profile: str | None = None
+    ):
+        self.reader = SharedCandidateReader(control_name)
+        self.db_path = db_path
+        self.profile = profile or DEFAULT_PROFILE
+        self._dao: ActivityDAO | None = None
+        self._lock = threading.Lock()
+
+    def _check_profile(self, profile: str | None) -> None:
+        # Como en modo de un proceso, "default" es la base que se sirve
+        if profile and profile not in (self.profile, DEFAULT_PROFILE):
+            raise ValueError(f"only profile {self.profile!r} is served in multi-worker mode")
+
+    def suggest(
+        self,
+        k: int = 1,
+        include_games: bool = True,
+        games_only: bool = False,
+        profile: str | None = None,
+    ):
+        self._check_profile(profile)
+        with self._lock:
+            candidates = self.reader.current()
+            if candidates is None:
+                return []
+            return candidates.sample(k, partition_name(include_games, games_only))
+
+    def accept(self, key: str, profile: str | None = None):
+        self._check_profile(profile)
+        item_id, is_sub = parse_item_key(key)
+        with self._lock:
+            candidates = self.reader.current()
+            index = candidates.find(item_id, is_sub) if candidates else None
+            if index is None:
+                return None
+            item = candidates.item(index)
+            if self._dao is None:
+                self._dao = ActivityDAO(self.db_path)
+            use_cases.mark_activity_as_done(item_id, is_sub, dao=self._dao)
+            return item
+
+    def probabilities(
+        self, include_games: bool = True, games_only: bool = False,
+        profile: str | None = None,
+    ):
+        self._check_profile(profile)
+        with self._lock:
+            candidates = self.reader.current()
+            if candidates is None:
+                return []
+            return candidates.probabilities(partition_name(include_games, games_only))
+
+    def health(self, profile: str | None = None) -> dict:
+        self._check_profile(profile)
+        with self._lock:
+            candidates = self.reader.current()
+            return {
+                "status": "ok",
+                "candidates": len(candidates) if candidates else 0,
+                "generation": self.reader.generation,
+                "pid": os.getpid(),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self.reader.close()
+            if self._dao is not None:
+                self._dao.conn.close()
+
+
+def _item_json(item, probability: float | None = None) -> dict:
+    item_id, label, is_sub = item
+    data = {"key": item_key(item_id, is_sub), "id": item_id, "label": label,
+            "is_subitem": is_sub}
+    if probability is not None:
+        data["probability"] = probability
+    return data
+
+
+def _flag(params: dict, name: str, default: bool) -> bool:
+    values = params.get(name)
+    if not values:
+        return default
+    return values[0].lower() not in ("0", "false", "no", "off")
+
+
+class SuggestionRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps client connections alive between requests
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    service: SuggestionService  # set by make_server
+
+    def _send_json(self, status: int, payload, headers: dict | None = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _toggles(self, params: dict) -> tuple[bool, bool]:
+        return _flag(params, "games", True), _flag(params, "games_only", False)
+
+    def _profile(self, params: dict) -> str | None:
+        return params.get("profile", [None])[0]
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == "/suggest":
+                k = min(max(int(params.get("k", ["1"])[0]), 1), MAX_K)
+                picked = self.service.suggest(
+                    k, *self._toggles(params), profile=self._profile(params)
+                )
+                if not picked:
+                    self._send_json(404, {"error": "no activities available"})
+                elif "k" in params:
+                    self._send_json(200, [_item_json(item) for item in picked])
+                else:
+                    self._send_json(200, _item_json(picked[0]))
+            elif url.path == "/probabilities":
+                rows = self.service.probabilities(
+                    *self._toggles(params), profile=self._profile(params)
+                )
+                self._send_json(200, [_item_json(item, p) for item, p in rows])
+            elif url.path == "/health":
+                self._send_json(200, self.service.health(self._profile(params)))
+            elif url.path == "/accept":
+                # Cambia el estado: sólo por POST, para que una precarga o un
+                # rastreador que siga un enlace no acepte nada
+                self._send_json(405, {"error": "use POST /accept"}, {"Allow": "POST"})
+            else:
+                self._send_json(404, {"error": "not found"})
+        except UnknownProfileError as exc:
+            self._send_json(404, {"error": str(exc)})
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+
+    def _read_body(self) -> bytes:
+        """Request body; ``ValueError`` when Content-Length is bad or too large."""
+        raw = self.headers.get("Content-Length") or "0"
+        try:
+            length = int(raw)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY:
+            # El cuerpo se queda sin leer: no puede reutilizarse la conexión
+            self.close_connection = True
+            if length < 0:
+                raise ValueError(f"invalid Content-Length: {raw!r}")
+            raise ValueError(f"request body larger than {MAX_BODY} bytes")
+        return self.rfile.read(length) if length else b""
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        try:
+            body = self._read_body()
+            if url.path != "/accept":
+                self._send_json(404, {"error": "not found"})
+                return
+            if body:
+                data = json.loads(body)
+                if not isinstance(data, dict):
+                    raise ValueError("request body must be a JSON object")
+                for name in ("key", "profile"):
+                    if data.get(name):
+                        params[name] = [str(data[name])]
+            self._handle_accept(params)
+        except UnknownProfileError as exc:
+            self._send_json(404, {"error": str(exc)})
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+
+    def _handle_accept(self, params: dict) -> None:
+        key = params.get("key", [None])[0]
+        if not key:
+            raise ValueError("missing item key")
+        accepted = self.service.accept(key, profile=self._profile(params))
+        if accepted is None:
+            self._send_json(404, {"error": f"unknown item: {key}"})
+        else:
+            self._send_json(200, _item_json(accepted))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    service: SuggestionService | None = None,
+) -> ThreadingHTTPServer:
+    """Create (but do not start) a threaded server bound to *host*:*port*."""
+    handler = type(
+        "BoundSuggestionRequestHandler",
+        (SuggestionRequestHandler,),
+        {"service": service or SuggestionService()},
+    )
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def _worker_main(
+    sock: socket.socket, control_name: str, db_path: str | None, profile: str | None
+) -> None:
+    service = SharedSnapshotService(control_name, db_path, profile)
+    handler = type(
+        "SharedSuggestionRequestHandler",
+        (SuggestionRequestHandler,),
+        {"service": service},
+    )
+    httpd = ThreadingHTTPServer(sock.getsockname(), handler, bind_and_activate=False)
+    httpd.socket.close()
+    httpd.socket = sock
+    httpd.daemon_threads = True
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+class SharedMemoryServer:
+    """Coordinator for the multi-process mode.
+
+    Builds the candidate arrays once per database change, publishes them as a
+    new shared-memory generation and keeps ``workers`` processes accepting on
+    the same listening socket.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: int = 2,
+        db_path: str | None = None,
+        poll_interval: float = 0.5,
+        profile: str | None = None,
+    ):
+        # multi-worker mode serves a single database (pass profile_db_path(…)
+        # and the profile name, which requests may then ask for)
+        self.dao = ActivityDAO(db_path, check_same_thread=False)
+        self.db_path = self.dao.db_path
+        self.profile = profile
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.publisher = SharedCandidatePublisher()
+        self.sock = socket.create_server((host, port))
+        self.port = self.sock.getsockname()[1]
+        self._data_version: int | None = None
+        self._index = CandidateIndex()
+        self._processes: list[multiprocessing.Process] = []
+        self._stop = threading.Event()
+
+    def refresh(self) -> bool:
+        """Publish a new generation if the database changed since the last one."""
+        version = self.dao.get_data_version()
+        if version == self._data_version:
+            return False
+        # Sólo se releen los hobbies tocados desde la última generación
+        self._index.refresh(self.dao)
+        payload = pack_candidates(
+            self._index.rows(),
+            _is_game_label,
+            generation=self.publisher.generation + 1,
+        )
+        self.publisher.publish(payload)
+        self._data_version = version
+        return True
+
+    def start(self) -> None:
+        self.refresh()
+        for _ in range(self.workers):
+            proc = multiprocessing.Process(
+                target=_worker_main,
+                args=(self.sock, self.publisher.control_name, self.db_path, self.profile),
+                daemon=True,
+            )
+            proc.start()
+            self._processes.append(proc)
+
+    def serve_forever(self) -> None:
+        """Watch the database from the calling thread until :meth:`stop`."""
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for proc in self._processes:
+            proc.terminate()
+        for proc in self._processes:
+            proc.join()
+        self._processes.clear()
+        self.sock.close()
+        self.publisher.close()
+        self.dao.conn.close()
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = 1,
+    profile: str | None = None,
+    max_profiles: int = 32,
+) -> None:
+    if workers > 1:
+        server = SharedMemoryServer(
+            host, port, workers, profile_db_path(profile), profile=profile
+        )
+        server.start()
+        print(
+            f"HobbyPicker escuchando en http://{host}:{server.port}/ "
+            f"con {workers} procesos"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+        return
+    service = SuggestionService(profile_db_path(profile), max_profiles)
+    # La base servida se crea aquí, al arrancar; las peticiones sólo abren
+    # perfiles que ya existen (ver ProfileCache.get)
+    service.profiles.get()
+    httpd = make_server(host, port, service)
+    print(f"HobbyPicker escuchando en http://{host}:{httpd.server_address[1]}/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        httpd.RequestHandlerClass.service.close()
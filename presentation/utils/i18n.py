@@ -5,6 +5,7 @@ LANG_TEXT = {
         "tab_today": "¿Qué hago hoy?",
         "tab_config": "⚙️ Configurar hobbies",
         "prompt": "¿Qué tal?",
+        "loading": "Cargando tus hobbies…",
         "suggest_button": "🎲 Sugerir hobby",
         "accept_button": "✅ ¡Me gusta!",
         "another_button": "🎲 Otra sugerencia",
@@ -46,6 +47,7 @@ LANG_TEXT = {
         "steam_import_confirm": "¿Importar juegos de Steam?",
         "steam_import_success": "Se importaron {count} juegos.",
         "steam_import_error": "No se pudo importar los juegos.",
+        "steam_import_progress": "Comprobando juegos de Steam… {done}/{total}",
         "steam_hobby_name": "Jugar desde Steam",
         "steam_action_prompt": "¿Qué quieres hacer con '{name}'?",
         "steam_play": "Jugar desde Steam",
@@ -54,6 +56,9 @@ LANG_TEXT = {
         "epic_import_confirm": "¿Importar juegos de Epic Games?",
         "epic_import_success": "Se importaron {count} juegos de Epic.",
         "epic_import_error": "No se pudo importar los juegos de Epic.",
+        "epic_import_progress": "Leyendo la biblioteca de Epic… {done} juegos",
+        "epic_import_partial": "La biblioteca en línea de Epic se interrumpió a medias. La próxima importación (durante la próxima hora) seguirá desde ese punto.",
+        "epic_import_partial_restart": "La biblioteca en línea de Epic se interrumpió a medias. La próxima importación la leerá desde el principio.",
         "epic_hobby_name": "Jugar desde Epic Games",
         "epic_action_prompt": "¿Qué quieres hacer con '{name}'?",
         "epic_play": "Jugar desde Epic Games",
@@ -69,11 +74,15 @@ LANG_TEXT = {
         "include_games": "Incluir juegos",
         "games_only": "Solo juegos",
         "filter": "Filtrar",
+        "update_available": "Hay una nueva versión disponible.",
+        "update_restart": "Reiniciar para actualizar",
+        "update_error": "No se pudo actualizar. Revisa tu copia local de git.",
     },
     "en": {
         "tab_today": "What should I do today?",
         "tab_config": "⚙️ Configure hobbies",
         "prompt": "How about?",
+        "loading": "Loading your hobbies…",
         "suggest_button": "🎲 Suggest hobby",
         "accept_button": "✅ I like it!",
         "another_button": "🎲 Another suggestion",
@@ -115,6 +124,7 @@ LANG_TEXT = {
         "steam_import_confirm": "Import Steam games?",
         "steam_import_success": "Imported {count} games.",
         "steam_import_error": "Could not import games.",
+        "steam_import_progress": "Checking Steam games… {done}/{total}",
         "steam_hobby_name": "Play from Steam",
         "steam_action_prompt": "What do you want to do with '{name}'?",
         "steam_play": "Play from Steam",
@@ -123,6 +133,9 @@ LANG_TEXT = {
         "epic_import_confirm": "Import Epic Games library?",
         "epic_import_success": "Imported {count} Epic games.",
         "epic_import_error": "Could not import Epic games.",
+        "epic_import_progress": "Reading the Epic library… {done} games",
+        "epic_import_partial": "The online Epic library stopped partway. The next import (within the next hour) will resume from that point.",
+        "epic_import_partial_restart": "The online Epic library stopped partway. The next import will read it from the beginning.",
         "epic_hobby_name": "Play from Epic Games",
         "epic_action_prompt": "What do you want to do with '{name}'?",
         "epic_play": "Play from Epic Games",
@@ -138,6 +151,9 @@ LANG_TEXT = {
         "include_games": "Include games",
         "games_only": "Games only",
         "filter": "Filter",
+        "update_available": "A new version is available.",
+        "update_restart": "Restart to update",
+        "update_error": "Could not update. Check your local git checkout.",
     },
 }
 